@@ -0,0 +1,125 @@
+"""Compare per-row cost of the model layer before and after the slotted models.
+
+Usage:
+    python3 bench/bench_models.py [--rows 100000] [--output models.json]
+
+"before" replays the original path: a `sqlite3.Row`, converted with `dict()`,
+parsed by `from_row` into a `@dataclass` with a per-instance `__dict__`.
+"after" uses the slotted `TodoItem` built by `TodoItem.row_factory`.
+Memory is what the materialised list retains, measured with tracemalloc.
+"""
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(BENCH), "src")
+for p in (SRC, BENCH):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from datasets import DatasetSpec, generate_rows, project_titles
+from harness import environment, write_json
+
+from Models.TodoItem import TodoItem
+
+
+@dataclass
+class DataclassTodoItem:
+    """The TodoItem model as it was before it was slotted."""
+    todo_id: Optional[int]
+    description: str
+    priority: int
+    title: str
+    completed: bool = False
+    project_id: Optional[int] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "DataclassTodoItem":
+        return cls(
+            todo_id=row.get("todo_id"),
+            title=row.get("title") or "",
+            description=row.get("description") or "",
+            priority=int(row.get("priority") or 3),
+            completed=(row.get("completed") == "yes" or bool(row.get("completed")) and str(row.get("completed")).lower() in ("1","true","yes")),
+            project_id=row.get("project_id"),
+        )
+
+
+SQL = (
+    "SELECT ti.todo_id, ti.description, ti.priority, ti.completed, ti.project_id, p.title "
+    "FROM Todo_Item ti JOIN Project p ON p.project_id = ti.project_id"
+)
+
+
+def load_before(conn):
+    conn.row_factory = sqlite3.Row
+    return [DataclassTodoItem.from_row(dict(r)) for r in conn.execute(SQL).fetchall()]
+
+
+def load_after(conn):
+    cur = conn.cursor()
+    cur.row_factory = TodoItem.row_factory
+    return cur.execute(SQL).fetchall()
+
+
+def measure_load(name, loader, conn, rows):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = loader(conn)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(items) == rows
+    del items
+    return {
+        "name": name,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed,
+        "retained_bytes_per_row": retained / rows,
+        "peak_bytes_per_row": peak / rows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(projects=50, todos=args.rows)
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY, title TEXT)")
+    conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY, description TEXT, priority INTEGER, completed INTEGER, project_id INTEGER)")
+    conn.executemany("INSERT INTO Project (project_id, title) VALUES (?, ?)", list(enumerate(project_titles(spec), start=1)))
+    conn.executemany("INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, ?, ?)",
+                     generate_rows(spec))
+
+    results = [
+        measure_load("before: Row -> dict -> dataclass", load_before, conn, args.rows),
+        measure_load("after: row_factory -> slotted", load_after, conn, args.rows),
+    ]
+    conn.close()
+
+    scale = 100000 / args.rows
+    print(f"{'path':<36} {'rows/sec':>12} {'MiB per 100k (retained)':>24} {'MiB per 100k (peak)':>20}")
+    for r in results:
+        print(f"{r['name']:<36} {r['rows_per_sec']:>12.0f} "
+              f"{r['retained_bytes_per_row'] * args.rows * scale / 2**20:>24.1f} "
+              f"{r['peak_bytes_per_row'] * args.rows * scale / 2**20:>20.1f}")
+    if args.output:
+        write_json(args.output, {"environment": environment(), "results": results})
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
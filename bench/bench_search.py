@@ -0,0 +1,104 @@
+"""Compare FTS5 search against a LIKE scan over todo descriptions.
+
+Usage:
+    python3 bench/bench_search.py [--todos 1000000] [--iterations 50] [--output search.json]
+
+A synthetic database is generated in a temporary directory and each query
+shape is run through `TodoItemDAO.searchTodoItems` (FTS5, ranked) and through
+the equivalent `description LIKE '%term%'` scan. The LIKE scan stops at the
+first `--limit` matches and does no ranking, so for common terms it is an
+optimistic baseline; for rare terms it has to read every row.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(BENCH), "src")
+for p in (SRC, BENCH):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from datasets import WORDS, DatasetSpec, build_database
+from harness import environment, measure, print_table, write_json
+
+from DAO.TodoItemDAO import TodoItemDAO
+from Models.TodoItem import TodoItem
+from Utils.db_connection import _execute_as, _get_conn, close_pool, configure_pool, get_storage_profile
+
+LIKE_SQL = (
+    "SELECT ti.todo_id, ti.description, ti.priority, ti.completed, ti.project_id, p.title "
+    "FROM Todo_Item ti JOIN Project p ON p.project_id = ti.project_id WHERE {where} LIMIT ?"
+)
+
+
+def like_search(terms, limit):
+    sql = LIKE_SQL.format(where=" AND ".join("ti.description LIKE ?" for _ in terms))
+    params = [f"%{t}%" for t in terms] + [limit]
+    with _get_conn() as conn:
+        return _execute_as(conn, TodoItem.row_factory, sql, params).fetchall()
+
+
+def run(args) -> dict:
+    spec = DatasetSpec(projects=args.projects, todos=args.todos, seed=args.seed)
+    tmpdir = tempfile.TemporaryDirectory()
+    db_path = Path(tmpdir.name) / "search.db"
+    build_database(db_path, spec)
+    configure_pool(db_path, profile=get_storage_profile(args.profile))
+
+    rng = random.Random(spec.seed)
+    dao = TodoItemDAO()
+    # descriptions end in "#<n>", so a number is a rare term and a word from
+    # the vocabulary is a common one
+    shapes = {
+        "rare": lambda: [str(rng.randrange(spec.todos))],
+        "common": lambda: [rng.choice(WORDS)],
+        "two-terms": lambda: rng.sample(WORDS, 2),
+    }
+    results = []
+    for shape, make_terms in shapes.items():
+        results.append(measure(
+            f"fts.searchTodoItems[{shape}]",
+            lambda i: dao.searchTodoItems(" ".join(make_terms()), limit=args.limit),
+            args.iterations,
+        ))
+        results.append(measure(
+            f"like.scan[{shape}]",
+            lambda i: like_search(make_terms(), args.limit),
+            args.iterations,
+        ))
+
+    close_pool()
+    tmpdir.cleanup()
+    return {
+        "environment": environment(),
+        "dataset": spec.to_dict(),
+        "profile": args.profile,
+        "limit": args.limit,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--todos", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--iterations", type=int, default=50, help="timed runs per query shape")
+    parser.add_argument("--limit", type=int, default=20, help="results requested per query")
+    parser.add_argument("--profile", default="default", help="storage profile from Utils.db_connection.STORAGE_PROFILES")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_table(report["results"])
+    if args.output:
+        write_json(args.output, report)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Compare two JSON reports written by the benchmark scripts.
+
+Usage:
+    python3 bench/compare.py baseline.json candidate.json
+"""
+import json
+import sys
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return report.get("environment", {}), {r["name"]: r for r in report["results"]}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print(__doc__)
+        return 2
+    (env_a, a), (env_b, b) = load(argv[0]), load(argv[1])
+    print(f"baseline:  {argv[0]} (commit {env_a.get('commit')})")
+    print(f"candidate: {argv[1]} (commit {env_b.get('commit')})\n")
+    print(f"{'benchmark':<40} {'ops/sec':>22} {'speedup':>8} {'p99 ms':>20}")
+    for name in [n for n in a if n in b]:
+        ra, rb = a[name], b[name]
+        speedup = rb["ops_per_sec"] / ra["ops_per_sec"] if ra["ops_per_sec"] else float("nan")
+        print(f"{name:<40} {ra['ops_per_sec']:>10.1f} -> {rb['ops_per_sec']:>8.1f} {speedup:>7.2f}x "
+              f"{ra['p99_ms']:>8.3f} -> {rb['p99_ms']:>8.3f}")
+    for name in sorted(set(a) ^ set(b)):
+        print(f"{name:<40} only in {'baseline' if name in a else 'candidate'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Reproducible synthetic datasets for the benchmark suite."""
+import random
+import sqlite3
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_FILE = ROOT / "src" / "Resources" / "TodoListSetup.sql"
+
+WORDS = (
+    "review report invoice draft email call plan fix deploy test refactor update write "
+    "clean book order pay schedule meeting budget design migrate release backup audit"
+).split()
+
+
+@dataclass
+class DatasetSpec:
+    """Shape of a generated dataset.
+
+    Attributes:
+        projects (int): number of projects.
+        todos (int): number of todo items spread over the projects.
+        seed (int): random seed; the same spec always produces the same rows.
+        priority_weights (List[float]): relative frequency of priorities 1..5.
+        completed_ratio (float): fraction of todos marked completed.
+        project_skew (float): 0 spreads todos evenly, larger values concentrate
+            them in the first projects (Zipf-like).
+    """
+    projects: int = 20
+    todos: int = 20000
+    seed: int = 1234
+    priority_weights: List[float] = field(default_factory=lambda: [1, 2, 4, 2, 1])
+    completed_ratio: float = 0.3
+    project_skew: float = 1.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def project_titles(spec: DatasetSpec) -> List[str]:
+    return [f"Project {i:05d}" for i in range(1, spec.projects + 1)]
+
+
+def generate_rows(spec: DatasetSpec) -> List[Sequence[Any]]:
+    """Return `(description, priority, completed, project_id)` tuples for `spec`."""
+    rng = random.Random(spec.seed)
+    project_weights = [1.0 / (i + 1) ** spec.project_skew for i in range(spec.projects)]
+    project_ids = rng.choices(range(1, spec.projects + 1), weights=project_weights, k=spec.todos)
+    priorities = rng.choices(range(1, 6), weights=spec.priority_weights, k=spec.todos)
+    rows = []
+    for n, (project_id, priority) in enumerate(zip(project_ids, priorities)):
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))) + f" #{n}"
+        completed = 1 if rng.random() < spec.completed_ratio else 0
+        rows.append((description, priority, completed, project_id))
+    return rows
+
+
+def build_database(path: Path, spec: DatasetSpec) -> None:
+    """Create a fresh database at `path` from the application schema and fill it per `spec`."""
+    path = Path(path)
+    for suffix in ("", "-wal", "-shm"):
+        Path(str(path) + suffix).unlink(missing_ok=True)
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.executescript(SCHEMA_FILE.read_text())
+        # drop the seed rows shipped with the schema
+        conn.execute("DELETE FROM Todo_Item")
+        conn.execute("DELETE FROM Project")
+        conn.execute("DELETE FROM sqlite_sequence")
+        conn.executemany("INSERT INTO Project (project_id, title) VALUES (?, ?)",
+                         list(enumerate(project_titles(spec), start=1)))
+        conn.executemany(
+            "INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, ?, ?)",
+            generate_rows(spec),
+        )
+        conn.commit()
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
@@ -0,0 +1,106 @@
+"""Timing and memory measurement helpers shared by the benchmark scripts."""
+import gc
+import json
+import platform
+import sqlite3
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the `pct` percentile (0-100) of `samples` using nearest rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def measure(name: str, op: Callable[[int], Any], iterations: int,
+            setup: Optional[Callable[[int], None]] = None, warmup: int = 3,
+            memory_iterations: int = 3) -> Dict[str, Any]:
+    """Time `op(i)` for `iterations` runs and measure its peak traced memory.
+
+    Parameters:
+        name (str): label stored in the result.
+        op (Callable[[int], Any]): operation under test, called with the iteration number.
+        iterations (int): timed runs.
+        setup (Optional[Callable[[int], None]]): untimed preparation run before each call.
+        warmup (int): untimed runs before measuring.
+        memory_iterations (int): extra runs made under tracemalloc for `peak_kib`.
+
+    Returns:
+        Dict[str, Any]: ops/sec, mean/p50/p99/max latency in milliseconds and peak KiB.
+    """
+    n = 0
+    for _ in range(warmup):
+        if setup:
+            setup(n)
+        op(n)
+        n += 1
+
+    samples = []
+    gc.collect()
+    for _ in range(iterations):
+        if setup:
+            setup(n)
+        start = time.perf_counter()
+        op(n)
+        samples.append(time.perf_counter() - start)
+        n += 1
+
+    peak = 0
+    for _ in range(memory_iterations):
+        if setup:
+            setup(n)
+        gc.collect()
+        tracemalloc.start()
+        op(n)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        n += 1
+
+    total = sum(samples)
+    return {
+        "name": name,
+        "iterations": iterations,
+        "ops_per_sec": iterations / total if total else 0.0,
+        "mean_ms": 1000.0 * total / iterations if iterations else 0.0,
+        "p50_ms": 1000.0 * percentile(samples, 50),
+        "p99_ms": 1000.0 * percentile(samples, 99),
+        "max_ms": 1000.0 * max(samples) if samples else 0.0,
+        "peak_kib": peak / 1024.0,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and source revision a run was made on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'benchmark':<40} {'ops/sec':>12} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10}")
+    for r in results:
+        print(f"{r['name']:<40} {r['ops_per_sec']:>12.1f} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} {r['peak_kib']:>10.1f}")
+
+
+def write_json(path: str, payload: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
@@ -0,0 +1,149 @@
+"""Load-test the HTTP/JSON server at increasing client concurrency.
+
+Usage:
+    python3 bench/load_test.py [--concurrency 1,2,4,8,16,32] [--duration 5] [--workers 8] [--output load.json]
+    python3 bench/load_test.py --url http://127.0.0.1:8080 ...
+
+Without `--url` a server is started in-process on a generated database in a
+temporary directory. Each client thread keeps one HTTP/1.1 connection open
+and issues a mix of requests (`--write-ratio` of them POST /todos, the rest
+split between GET /todos/{id} and a page of GET /todos?project_id=...) for
+`--duration` seconds per concurrency level. Throughput, p50/p99/max latency
+and error counts are reported per level.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(BENCH), "src")
+for p in (SRC, BENCH):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from datasets import DatasetSpec, build_database
+from harness import environment, percentile, write_json
+
+
+def client(host, port, spec, args, seed, stop, samples, errors):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        while not stop.is_set():
+            roll = rng.random()
+            body = None
+            if roll < args.write_ratio:
+                method, path = "POST", "/todos"
+                body = json.dumps({"project_id": rng.randint(1, spec.projects),
+                                   "description": f"load test {seed}", "priority": rng.randint(1, 5)})
+            elif roll < args.write_ratio + (1 - args.write_ratio) * 0.8:
+                method, path = "GET", f"/todos/{rng.randint(1, spec.todos)}"
+            else:
+                method, path = "GET", f"/todos?project_id={rng.randint(1, spec.projects)}&limit=20"
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers={"Content-Type": "application/json"} if body else {})
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 500:
+                    errors.append(response.status)
+            except (OSError, http.client.HTTPException) as e:
+                errors.append(type(e).__name__)
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=30)
+                continue
+            samples.append(time.perf_counter() - started)
+    finally:
+        conn.close()
+
+
+def run_level(host, port, spec, args, concurrency):
+    stop = threading.Event()
+    samples, errors = [], []
+    threads = [
+        threading.Thread(target=client, args=(host, port, spec, args, args.seed + n, stop, samples, errors))
+        for n in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "requests": len(samples),
+        "errors": len(errors),
+        "requests_per_sec": len(samples) / elapsed,
+        "p50_ms": 1000.0 * percentile(samples, 50),
+        "p99_ms": 1000.0 * percentile(samples, 99),
+        "max_ms": 1000.0 * max(samples) if samples else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--workers", type=int, default=8, help="server worker threads (in-process server only)")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32", help="comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per concurrency level")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="fraction of requests that create a todo")
+    parser.add_argument("--group-commit", action="store_true",
+                        help="commit the server's single-todo writes in groups (in-process server only)")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    spec = DatasetSpec(projects=args.projects, todos=args.todos, seed=args.seed)
+    server = tmpdir = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from Server.TodoListServer import create_server, start_in_thread
+
+        tmpdir = tempfile.TemporaryDirectory()
+        db_path = Path(tmpdir.name) / "load.db"
+        build_database(db_path, spec)
+        server = create_server("127.0.0.1", 0, args.workers, db_path, args.group_commit)
+        start_in_thread(server)
+        host, port = server.server_address
+
+    results = []
+    print(f"{'clients':>8} {'req/sec':>12} {'p50 ms':>10} {'p99 ms':>10} {'max ms':>10} {'errors':>8}")
+    for level in (int(c) for c in args.concurrency.split(",")):
+        r = run_level(host, port, spec, args, level)
+        results.append(r)
+        print(f"{r['concurrency']:>8} {r['requests_per_sec']:>12.1f} {r['p50_ms']:>10.3f} {r['p99_ms']:>10.3f} "
+              f"{r['max_ms']:>10.3f} {r['errors']:>8}")
+
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        tmpdir.cleanup()
+    if args.output:
+        write_json(args.output, {
+            "environment": environment(),
+            "dataset": spec.to_dict(),
+            "workers": None if args.url else args.workers,
+            "group_commit": args.group_commit,
+            "write_ratio": args.write_ratio,
+            "results": results,
+        })
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Benchmark the hot paths of the DAO, Service and Controller layers.
+
+Usage:
+    python3 bench/run_benchmarks.py [--projects N] [--todos N] [--iterations N] [--output results.json]
+
+A synthetic database is generated in a temporary directory (the real
+`Databases/TodoList.db` is never touched), each operation is timed, and a
+table plus optional JSON report are produced. Compare two JSON reports with
+`bench/compare.py`.
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+BENCH = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(os.path.dirname(BENCH), "src")
+for p in (SRC, BENCH):
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+from datasets import DatasetSpec, build_database
+from harness import environment, measure, print_table, write_json
+
+from Controller.TodoListController import TodoListController
+from DAO.ProjectDAO import ProjectDAO
+from DAO.TodoItemDAO import TodoItemDAO
+from Models.TodoItem import TodoItem
+from Service.ProjectService import ProjectService
+from Service.TodoItemService import TodoItemService
+from Utils.db_connection import close_pool, configure_pool, get_storage_profile
+
+
+def run(args) -> dict:
+    spec = DatasetSpec(projects=args.projects, todos=args.todos, seed=args.seed,
+                       completed_ratio=args.completed_ratio)
+    tmpdir = tempfile.TemporaryDirectory()
+    db_path = Path(tmpdir.name) / "bench.db"
+    build_database(db_path, spec)
+    configure_pool(db_path, profile=get_storage_profile(args.profile), in_memory=args.in_memory)
+
+    rng = random.Random(spec.seed)
+    todo_dao = TodoItemDAO()
+    project_service = ProjectService()
+    todo_service = TodoItemService()
+    controller = TodoListController()
+    titles = [p.title for p in project_service.getAllProjects()]
+    heavy = max(5, args.iterations // 20)
+    results = []
+
+    results.append(measure(
+        "dao.getTodoItemById",
+        lambda i: todo_dao.getTodoItemById(rng.randint(1, spec.todos)),
+        args.iterations,
+    ))
+    results.append(measure(
+        "dao.getAllTodoItemsByProjectId",
+        lambda i: todo_dao.getAllTodoItemsByProjectId(rng.randint(1, spec.projects)),
+        heavy,
+    ))
+    results.append(measure("dao.getAllTodoItems", lambda i: todo_dao.getAllTodoItems(), max(3, heavy // 5)))
+    results.append(measure(
+        "service.nextTodos[10]",
+        lambda i: todo_service.nextTodos(10, rng.choice([None, rng.randint(1, spec.projects)])),
+        args.iterations,
+    ))
+    results.append(measure(
+        "service.createTodoItem",
+        lambda i: todo_service.createTodoItem(titles[i % len(titles)], f"bench todo {i}", 1 + i % 5, 1 + i % len(titles)),
+        args.iterations,
+    ))
+    results.append(measure(
+        "service.getAllTodoItemsByProjectTitle",
+        lambda i: todo_service.getAllTodoItemsByProjectTitle(rng.choice(titles)),
+        heavy,
+    ))
+
+    def make_doomed_project(i):
+        project = project_service.createProject(f"Doomed {i}")
+        todo_dao.createTodoItems(
+            TodoItem(todo_id=None, title=project.title, description=f"doomed {n}", priority=1 + n % 5,
+                     completed=False, project_id=project.project_id)
+            for n in range(args.cascade_size)
+        )
+
+    results.append(measure(
+        f"service.deleteProjectByTitle[{args.cascade_size} todos]",
+        lambda i: project_service.deleteProjectByTitle(f"Doomed {i}"),
+        heavy, setup=make_doomed_project,
+    ))
+
+    def list_project(i):
+        # non-tty stdin makes the controller print every page without prompting
+        with contextlib.redirect_stdout(io.StringIO()), _stdin(io.StringIO()):
+            controller._list_todos(rng.choice(titles))
+
+    results.append(measure("controller.todos_list[project]", list_project, heavy))
+
+    close_pool()
+    tmpdir.cleanup()
+    return {
+        "environment": environment(),
+        "dataset": spec.to_dict(),
+        "profile": args.profile,
+        "in_memory": args.in_memory,
+        "project_cache": ProjectDAO().cacheStats(),
+        "results": results,
+    }
+
+
+@contextlib.contextmanager
+def _stdin(stream):
+    old, sys.stdin = sys.stdin, stream
+    try:
+        yield
+    finally:
+        sys.stdin = old
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--completed-ratio", type=float, default=0.3)
+    parser.add_argument("--iterations", type=int, default=500, help="timed runs for point operations")
+    parser.add_argument("--cascade-size", type=int, default=1000, help="todos per project in the cascade delete benchmark")
+    parser.add_argument("--profile", default="default", help="storage profile from Utils.db_connection.STORAGE_PROFILES")
+    parser.add_argument("--in-memory", action="store_true", help="load the dataset into an in-memory database")
+    parser.add_argument("--output", help="write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    print_table(report["results"])
+    if args.output:
+        write_json(args.output, report)
+        print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
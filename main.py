@@ -1,5 +1,10 @@
+import time
+
+_STARTED = time.perf_counter()
+
 import sys
 import os
+import argparse
 
 # ensure `src` is on the import path so Controller/Service packages resolve
 ROOT = os.path.dirname(__file__)
@@ -7,12 +12,95 @@ SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
-from Controller.TodoListController import TodoListController
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Todo List application")
+    parser.add_argument("--serve", action="store_true", help="run the HTTP/JSON API instead of the interactive prompt")
+    parser.add_argument("--host", default="127.0.0.1", help="interface for --serve to bind")
+    parser.add_argument("--port", type=int, default=8080, help="port for --serve to listen on")
+    parser.add_argument("--workers", type=int, default=8, help="request worker threads for --serve")
+    parser.add_argument("--group-commit", action="store_true",
+                        help="with --serve, commit concurrent single-todo writes in groups")
+    parser.add_argument("--script", metavar="FILE", help="run the commands in FILE ('-' for stdin) without prompts, printing JSON lines")
+    parser.add_argument("--group-size", type=int, default=None, help="commands committed per transaction for --script")
+    parser.add_argument("--db", metavar="PATH", help="database file, or ':memory:' for a throwaway in-memory database")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="load the database into memory and save it back on exit")
+    parser.add_argument("--snapshot-interval", type=float, metavar="SECONDS",
+                        help="with --in-memory, also save the database every SECONDS if it changed")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="spread projects over several database files in DIR (created if missing)")
+    parser.add_argument("--shard-count", type=int, metavar="N",
+                        help="with --shards, number of shard files (default 4; an existing layout only grows)")
+    parser.add_argument("--vacuum", action="store_true",
+                        help="rebuild the database file, returning free space and enabling incremental vacuum, then exit")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="report import and initialisation times on stderr when the application exits")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    # the flags override the environment variables Utils.db_connection reads,
+    # so the pool is still created lazily, on first use
+    if args.db:
+        os.environ["TODOLIST_DB"] = args.db
+    if args.in_memory:
+        os.environ["TODOLIST_DB_MEMORY"] = "1"
+    if args.snapshot_interval is not None:
+        os.environ["TODOLIST_DB_SNAPSHOT_INTERVAL"] = str(args.snapshot_interval)
+    if args.shards:
+        os.environ["TODOLIST_SHARDS"] = args.shards
+    if args.shard_count is not None:
+        os.environ["TODOLIST_SHARD_COUNT"] = str(args.shard_count)
+    if args.vacuum:
+        from Utils.db_connection import vacuum
+        from Utils.sharding import get_router
+
+        router = get_router()
+        if router is None:
+            vacuum()
+        else:
+            # every shard file, then the directory
+            router.fan_out(lambda k: vacuum())
+            with router.use_directory():
+                vacuum()
+        return
+    if args.serve:
+        from Server.TodoListServer import serve
+        serve(args.host, args.port, args.workers, group_commit=args.group_commit)
+        return
 
-def main():
-    print("Python Path:", sys.path)
-    app = TodoListController()
-    app.run()
+    # imports are deferred to here so --serve and --help do not load the controller
+    started = time.perf_counter()
+    from Controller.AppContext import AppContext
+    # deleted projects too large to remove at once are purged while the prompt or script runs
+    context = AppContext(background_purge=True)
+    context.timings["main.py startup"] = started - _STARTED
+    status = 0
+    try:
+        if args.script:
+            with context.timed("imports"):
+                from Controller.BatchRunner import GROUP_SIZE, BatchRunner
+            runner = BatchRunner(context.project_service, context.todo_service,
+                                 group_size=args.group_size or GROUP_SIZE)
+            if args.script == "-":
+                summary = runner.run(sys.stdin)
+            else:
+                with open(args.script, encoding="utf-8") as f:
+                    summary = runner.run(f)
+            status = 1 if summary["failed"] else 0
+        else:
+            with context.timed("imports"):
+                from Controller.TodoListController import TodoListController
+            app = TodoListController(context)
+            context.timings["until first prompt"] = time.perf_counter() - _STARTED
+            app.run()
+    finally:
+        # before the atexit handlers close the pool (and snapshot an in-memory database)
+        context.close()
+        if args.profile_startup:
+            print(context.report(), file=sys.stderr)
+    if status:
+        sys.exit(status)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,83 @@
+import time
+from contextlib import contextmanager
+from functools import cached_property
+from typing import Dict, Iterator
+
+
+class AppContext:
+    """Creates the application's services on first use and shares them.
+
+    Nothing is imported, constructed or opened until a command needs it, so
+    starting the prompt or a short script does not pay for the DAOs, the
+    connection pool or schema migration up front. Every consumer gets the
+    same `ProjectService`, so its DAO and lookup cache exist once.
+
+    The time spent creating each component is recorded in `timings`
+    (seconds, by component name) for `main.py --profile-startup`.
+
+    With `background_purge`, the `ProjectService` starts its purge worker
+    (see `ProjectService.startPurgeWorker`) when it is created.
+    """
+
+    def __init__(self, background_purge: bool = False):
+        self.timings: Dict[str, float] = {}
+        self.background_purge = background_purge
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Record the time spent in the block under `name` in `timings`."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - started
+
+    @cached_property
+    def database(self):
+        """The process-wide connection pool, with its first connection opened and the schema migrated."""
+        with self.timed("database"):
+            from Utils.db_connection import get_pool
+
+            pool = get_pool()
+            with pool.connection():
+                pass
+            return pool
+
+    @cached_property
+    def project_service(self):
+        self.database  # opened first so its cost is timed on its own
+        with self.timed("project_service"):
+            from Service.ProjectService import ProjectService
+
+            service = ProjectService()
+            if self.background_purge:
+                service.startPurgeWorker()
+            return service
+
+    @cached_property
+    def todo_service(self):
+        project_service = self.project_service
+        with self.timed("todo_service"):
+            from Service.TodoItemService import TodoItemService
+
+            return TodoItemService(project_service)
+
+    @cached_property
+    def transfer_service(self):
+        project_service, todo_service = self.project_service, self.todo_service
+        with self.timed("transfer_service"):
+            from Service.TransferService import TransferService
+
+            return TransferService(project_service, todo_service)
+
+    def close(self) -> None:
+        """Stop the purge worker, if the `ProjectService` was created, so no chunk is cut off at exit."""
+        if "project_service" in self.__dict__:
+            self.project_service.stopPurgeWorker()
+
+    def report(self) -> str:
+        """Format `timings` as one line per component, in the order they were created."""
+        lines = ["Startup profile (ms):"]
+        for name, seconds in self.timings.items():
+            lines.append(f"  {name:<20} {seconds * 1000:>9.2f}")
+        return "\n".join(lines)
@@ -0,0 +1,113 @@
+import json
+import sys
+import time
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+
+from Controller.TodoListController import CommandError, CommandFailed, CommandHandlers, parse_command
+from Service.ProjectService import ProjectService
+from Service.TodoItemService import TodoItemService
+from Utils.db_connection import transaction
+
+# commands committed together; one fsync per group instead of one per command
+GROUP_SIZE = 500
+
+
+class BatchRunner(CommandHandlers):
+    """Runs controller commands from a script without prompts.
+
+    Each command produces one JSON object per output line:
+    `{"line": n, "command": "todos add", "ok": true, "result": {...}}` or
+    `{"line": n, "command": ..., "ok": false, "error": "..."}`, followed by a
+    final `{"summary": {...}}` line.
+
+    Commands are committed in groups of `group_size` inside one
+    `transaction()`, and every command runs in its own savepoint, so a failing
+    command is rolled back on its own and the rest of its group still commits.
+    Results of a group are written once the group has committed. The commands
+    themselves are the `CommandHandlers` shared with the interactive prompt.
+    """
+
+    def __init__(self, project_service: Optional[ProjectService] = None,
+                 todo_service: Optional[TodoItemService] = None,
+                 group_size: int = GROUP_SIZE, out: TextIO = sys.stdout):
+        if group_size < 1:
+            raise ValueError("group_size must be at least 1")
+        self.projectService = project_service or ProjectService()
+        self.todoItemService = todo_service or TodoItemService(self.projectService)
+        self._transferService = None
+        self.group_size = group_size
+        self.out = out
+        self._handlers = self.handlers()
+
+    def run(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """Run every command in `lines`; blank lines and `#` comments are skipped, `quit` stops.
+
+        Parameters:
+            lines (Iterable[str]): script lines, e.g. an open file or sys.stdin.
+
+        Returns:
+            Dict[str, Any]: the summary: `commands`, `ok`, `failed` and `seconds`.
+        """
+        started = time.perf_counter()
+        counts = {"commands": 0, "ok": 0, "failed": 0}
+        group: List[tuple] = []
+        for lineno, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                name, args = parse_command(line)
+            except CommandError as e:
+                group.append((lineno, None, e))
+            else:
+                if name == "quit":
+                    break
+                group.append((lineno, name, args))
+            if len(group) >= self.group_size:
+                self._run_group(group, counts)
+                group = []
+        if group:
+            self._run_group(group, counts)
+        summary = dict(counts, seconds=round(time.perf_counter() - started, 6))
+        self._emit({"summary": summary})
+        return summary
+
+    def _run_group(self, group: List[tuple], counts: Dict[str, int]) -> None:
+        records = []
+        try:
+            with transaction():
+                for lineno, name, args in group:
+                    records.append(self._run_one(lineno, name, args))
+        except Exception as e:
+            # the commit itself failed: nothing in the group was kept
+            for record in records:
+                if record["ok"]:
+                    record.update(ok=False, error=f"transaction failed: {e}")
+                    record.pop("result", None)
+        for record in records:
+            counts["commands"] += 1
+            counts["ok" if record["ok"] else "failed"] += 1
+            self._emit(record)
+
+    def _run_one(self, lineno: int, name: Optional[str], args) -> Dict[str, Any]:
+        if name is None:
+            return {"line": lineno, "command": None, "ok": False, "error": str(args)}
+        try:
+            with transaction():
+                result = self._handlers[name](*args)
+        except CommandFailed as e:
+            return {"line": lineno, "command": name, "ok": False, "error": str(e)}
+        except Exception as e:
+            return {"line": lineno, "command": name, "ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"line": lineno, "command": name, "ok": True, "result": result}
+
+    def _emit(self, record: Dict[str, Any]) -> None:
+        self.out.write(json.dumps(record) + "\n")
+
+    @property
+    def transferService(self):
+        if self._transferService is None:
+            # only scripts that import or export pay for loading it
+            from Service.TransferService import TransferService
+            self._transferService = TransferService(self.projectService, self.todoItemService)
+        return self._transferService
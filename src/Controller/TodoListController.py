@@ -1,30 +1,411 @@
-from typing import Optional
+import shlex
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from Service.ProjectService import ProjectService
-from Service.TodoItemService import TodoItemService
+from Controller.AppContext import AppContext
 
+# number of todos printed per page by `todos list`
+PAGE_SIZE = 20
 
-class TodoListController:
-    def __init__(self):
-        self.projectService = ProjectService()
-        self.todoItemService = TodoItemService()
+# open todos shown by `todos next` when no count is given
+NEXT_COUNT = 10
+
+# change log entries read by `todos changes` when no limit is given
+CHANGES_COUNT = 100
+
+# most ids a single range such as `todos complete 1-500` may expand to
+MAX_ID_RANGE = 10000
+
+# command grammar shared by the interactive prompt and batch mode: name -> usage
+COMMANDS = {
+    "projects list": "projects list",
+    "projects create": "projects create <project_title>",
+    "projects delete": "projects delete <project_title>",
+    "projects stats": "projects stats [project_title]",
+    "projects verify": "projects verify",
+    "projects shards": "projects shards",
+    "projects rebalance": "projects rebalance <shard> <project_title>",
+    "projects purge": "projects purge",
+    "todos list": "todos list [project_title]",
+    "todos add": "todos add [<project_title> <priority> <description>]",
+    "todos search": "todos search <terms>",
+    "todos next": "todos next [k] [project_title]",
+    "todos complete": "todos complete <ids>",
+    "todos priority": "todos priority <ids> <priority>",
+    "todos move": "todos move <ids> <project_title>",
+    "todos delete": "todos delete <todo_id>",
+    "todos changes": "todos changes [seq] [limit]",
+    "todos compact-log": "todos compact-log [retention_days]",
+    "export projects": "export projects <file.csv|file.jsonl>",
+    "export todos": "export todos <file.csv|file.jsonl> [project_title]",
+    "import projects": "import projects <file.csv|file.jsonl>",
+    "import todos": "import todos <file.csv|file.jsonl>",
+}
+
+# one-word commands and their aliases
+SIMPLE_COMMANDS = {"help": "help", "h": "help", "?": "help", "stats": "stats", "quit": "quit", "exit": "quit"}
+
+
+class CommandError(ValueError):
+    """A command line that does not fit the command grammar."""
+
+
+class CommandFailed(Exception):
+    """A well-formed command that could not be carried out (unknown project, invalid input, ...)."""
+
+
+def parse_id_list(spec: str) -> List[int]:
+    """Parse todo ids written as `3`, `1,4,7`, `2-6` or a mix such as `1-3,8 10`.
+
+    Parameters:
+        spec (str): ids and inclusive ranges separated by commas or spaces.
+
+    Returns:
+        List[int]: the ids in the order given, without duplicates.
+
+    Raises:
+        CommandError: if a part is not a number or range, or a range is too large.
+    """
+    ids: List[int] = []
+    for part in spec.replace(",", " ").split():
+        low, sep, high = part.partition("-")
+        if not low.isdigit() or (sep and not high.isdigit()):
+            raise CommandError(f"todo ids must be numbers or ranges like 2-6, not '{part}'")
+        low_id, high_id = int(low), int(high) if sep else int(low)
+        if high_id < low_id:
+            raise CommandError(f"empty range '{part}'")
+        if high_id - low_id >= MAX_ID_RANGE:
+            raise CommandError(f"range '{part}' is larger than {MAX_ID_RANGE} ids")
+        ids.extend(range(low_id, high_id + 1))
+    if not ids:
+        raise CommandError("no todo ids given")
+    return list(dict.fromkeys(ids))
+
+
+def parse_command(line: str) -> Tuple[str, List[Any]]:
+    """Split a command line into a command name and its arguments.
+
+    Arguments may be quoted (`projects create "Home Office"`); unquoted
+    trailing words of a title or description are joined with spaces.
+
+    Parameters:
+        line (str): one command, e.g. `todos complete 3`.
+
+    Returns:
+        Tuple[str, List[Any]]: a key of `COMMANDS` or a value of `SIMPLE_COMMANDS`, and its
+        arguments; id lists are already parsed into `List[int]`.
+
+    Raises:
+        CommandError: if the line is not a valid command; the message is meant for the user.
+    """
+    try:
+        parts = shlex.split(line)
+    except ValueError as e:
+        raise CommandError(f"Could not parse command: {e}")
+    if not parts:
+        raise CommandError("Empty command")
+    group = parts[0].lower()
+    if group in SIMPLE_COMMANDS:
+        return SIMPLE_COMMANDS[group], []
+    if group not in ("projects", "todos", "export", "import"):
+        raise CommandError("Unknown command. Type 'help' for available commands")
+    name = f"{group} {parts[1]}" if len(parts) >= 2 else group
+    rest = parts[2:]
+    if name not in COMMANDS:
+        if group == "projects":
+            raise CommandError("Unknown projects command. Use 'projects list', 'projects create <title>', 'projects delete <title>', 'projects stats [title]', 'projects verify', 'projects shards', 'projects rebalance <shard> <title>' or 'projects purge'")
+        if group in ("export", "import"):
+            raise CommandError(f"Unknown {group} command. Use '{group} projects <file>' or '{group} todos <file>'")
+        raise CommandError("Unknown todos command. Use 'todos list [project_title]', 'todos add', 'todos search <terms>', 'todos next [k]', 'todos complete <ids>', 'todos priority <ids> <priority>', 'todos move <ids> <project_title>', 'todos delete <id>', 'todos changes [seq]' or 'todos compact-log [days]'")
+    if name in ("projects create", "projects delete"):
+        if not rest:
+            raise CommandError("Error: No project title provided.")
+        return name, [" ".join(rest)]
+    if name == "projects stats":
+        return name, [" ".join(rest)] if rest else []
+    if name == "projects rebalance":
+        if len(rest) < 2 or not rest[0].isdigit():
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, [int(rest[0]), " ".join(rest[1:])]
+    if name in ("todos list", "todos search"):
+        if name == "todos search" and not rest:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, [" ".join(rest)] if rest else []
+    if name == "todos next":
+        if rest and rest[0].isdigit():
+            if int(rest[0]) < 1:
+                raise CommandError("k must be at least 1")
+            return name, [int(rest[0])] + ([" ".join(rest[1:])] if rest[1:] else [])
+        return name, [None, " ".join(rest)] if rest else []
+    if name == "todos add":
+        if rest and len(rest) < 3:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, rest[:2] + [" ".join(rest[2:])] if rest else []
+    if name == "todos complete":
+        if not rest:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, [parse_id_list(" ".join(rest))]
+    if name in ("todos priority", "todos move"):
+        if len(rest) < 2:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, [parse_id_list(rest[0]), " ".join(rest[1:])]
+    if name == "todos delete":
+        if not rest:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        if not rest[0].isdigit():
+            raise CommandError("todo id must be numeric")
+        return name, [rest[0]]
+    if name == "todos changes":
+        if len(rest) > 2 or not all(r.isdigit() for r in rest):
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, [int(r) for r in rest]
+    if name == "todos compact-log":
+        if rest:
+            try:
+                return name, [float(rest[0])]
+            except ValueError:
+                raise CommandError(f"Usage: {COMMANDS[name]}")
+        return name, []
+    if name.startswith(("export ", "import ")):
+        if not rest:
+            raise CommandError(f"Usage: {COMMANDS[name]}")
+        if name == "export todos" and len(rest) > 1:
+            return name, [rest[0], " ".join(rest[1:])]
+        return name, rest[:1]
+    return name, []
+
+
+class CommandHandlers:
+    """What each command does, shared by the interactive prompt and batch mode.
+
+    Every method takes the arguments produced by `parse_command` and returns a
+    JSON-ready dict, or raises `CommandFailed` with a message for the user.
+    Subclasses only decide how results are shown and provide the
+    `projectService`, `todoItemService` and `transferService` attributes.
+    """
+
+    def handlers(self) -> Dict[str, Callable[..., Dict[str, Any]]]:
+        """Map every command name (except `quit`) to the method that carries it out."""
+        return {
+            "help": self.help,
+            "stats": self.stats,
+            "projects list": self.list_projects,
+            "projects create": self.create_project,
+            "projects delete": self.delete_project,
+            "projects stats": self.project_stats,
+            "projects verify": self.verify_stats,
+            "projects shards": self.show_shards,
+            "projects rebalance": self.rebalance,
+            "projects purge": self.show_purges,
+            "todos list": self.list_todos,
+            "todos add": self.add_todo,
+            "todos search": self.search_todos,
+            "todos next": self.next_todos,
+            "todos complete": self.complete_todos,
+            "todos priority": self.set_priority,
+            "todos move": self.move_todos,
+            "todos delete": self.delete_todo,
+            "todos changes": self.show_changes,
+            "todos compact-log": self.compact_log,
+            "export projects": lambda path: self.export("projects", path),
+            "export todos": lambda path, title=None: self.export("todos", path, title),
+            "import projects": lambda path: self.import_file("projects", path),
+            "import todos": lambda path: self.import_file("todos", path),
+        }
+
+    def _project(self, title: str):
+        project = self.projectService.getProjectByTitle(title)
+        if project is None:
+            raise CommandFailed(f"project not found: {title}")
+        return project
+
+    def _project_id(self, title: Optional[str]) -> Optional[int]:
+        return self._project(title).project_id if title is not None else None
+
+    def help(self):
+        return {"commands": list(COMMANDS.values())}
+
+    def stats(self):
+        from Utils.db_connection import pool_stats
+        return {"pool": pool_stats(), "project_cache": self.projectService.getCacheStats()}
+
+    def list_projects(self):
+        return {"projects": [p.to_dict() for p in self.projectService.getAllProjects()]}
+
+    def create_project(self, title: str):
+        project = self.projectService.createProject(title)
+        if project is None:
+            raise CommandFailed("invalid project title")
+        return project.to_dict()
+
+    def delete_project(self, title: str):
+        project = self._project(title)
+        if not self.projectService.deleteProjectById(project.project_id):
+            raise CommandFailed(f"failed to delete project: {title}")
+        # large projects lose their todos in the background; see `projects purge`
+        purging = any(p.project_id == project.project_id for p in self.projectService.getPurgeProgress())
+        return {"project_id": project.project_id, "purging": purging}
+
+    def project_stats(self, title: Optional[str] = None):
+        return {"stats": [s.to_dict() for s in self.projectService.getProjectStats(self._project_id(title))]}
+
+    def verify_stats(self):
+        diffs = self.projectService.checkProjectStats(repair=True)
+        return {"consistent": not diffs, "repaired": diffs}
+
+    def show_shards(self):
+        shards = self.projectService.getShardStats()
+        if shards is None:
+            raise CommandFailed("the database is not sharded")
+        return {"shards": [{k: s[k] for k in ("shard", "projects", "todos")} for s in shards]}
+
+    def rebalance(self, shard: int, title: str):
+        project = self._project(title)
+        moved = self.projectService.moveProjectToShard(project.project_id, shard)
+        if moved is None:
+            raise CommandFailed(f"cannot move {title} to shard {shard}")
+        return {"project_id": project.project_id, "title": project.title, "shard": shard, "todo_ids": moved}
+
+    def show_purges(self):
+        return {"purges": [p.to_dict() for p in self.projectService.getPurgeProgress()]}
+
+    def list_todos(self, title: Optional[str] = None, after: Optional[Tuple[int, int]] = None,
+                   limit: Optional[int] = None):
+        """List todos, all at once or one page of `limit`; `next` is the `after` key of the following page."""
+        project_id = self._project_id(title)
+        if limit is None:
+            if project_id is None:
+                todos = self.todoItemService.getAllTodoItems()
+            else:
+                todos = self.todoItemService.getAllTodoItemsByProjectId(project_id)
+        else:
+            todos = self.todoItemService.getTodoItemsPage(project_id, after=after, limit=limit)
+        last = todos[-1] if limit is not None and len(todos) == limit else None
+        return {"todos": [t.to_dict() for t in todos],
+                "next": [last.priority, last.todo_id] if last is not None else None}
+
+    def add_todo(self, title: str, priority: str, description: str):
+        project = self._project(title)
+        todo = self.todoItemService.createTodoItem(project.title, description, priority, project.project_id)
+        if todo is None:
+            raise CommandFailed("invalid todo: priority must be 1-5 and description non-empty")
+        return todo.to_dict()
+
+    def search_todos(self, query: str):
+        return {"results": [dict(r.item.to_dict(), snippet=r.snippet, score=r.score)
+                            for r in self.todoItemService.searchTodoItems(query)]}
+
+    def next_todos(self, k: Optional[int] = None, title: Optional[str] = None):
+        project_id = self._project_id(title)
+        if k is not None and k < 1:
+            raise CommandFailed("k must be at least 1")
+        todos = self.todoItemService.nextTodos(NEXT_COUNT if k is None else k, project_id)
+        return {"todos": [t.to_dict() for t in todos]}
+
+    def complete_todos(self, todo_ids: List[int]):
+        return {"todo_ids": todo_ids, "affected": self.todoItemService.completeTodoItems(todo_ids)}
+
+    def set_priority(self, todo_ids: List[int], priority: str):
+        affected = self.todoItemService.setPriority(todo_ids, priority)
+        if affected is None:
+            raise CommandFailed("priority must be 1-5")
+        return {"todo_ids": todo_ids, "affected": affected}
+
+    def move_todos(self, todo_ids: List[int], title: str):
+        project = self._project(title)
+        return {"todo_ids": todo_ids, "project_id": project.project_id, "title": project.title,
+                "affected": self.todoItemService.moveToProject(todo_ids, project.project_id)}
+
+    def delete_todo(self, todo_id: str):
+        if not self.todoItemService.deleteTodoItem(int(todo_id)):
+            raise CommandFailed(f"todo not found: {todo_id}")
+        return {"todo_id": int(todo_id)}
+
+    def show_changes(self, seq: int = 0, limit: Optional[int] = None):
+        changes = self.todoItemService.changesSince(seq, limit or CHANGES_COUNT)
+        if changes is None:
+            raise CommandFailed("the change log is not available on a sharded database")
+        return changes.to_dict()
+
+    def compact_log(self, retention_days: Optional[float] = None):
+        result = self.todoItemService.compactChangeLog(retention_days)
+        if result is None:
+            raise CommandFailed("the change log is not available on a sharded database")
+        return result
+
+    def export(self, kind: str, path: str, title: Optional[str] = None):
+        project_id = self._project_id(title)
+        try:
+            result = self.transferService.exportToFile(kind, path, project_id)
+        except (OSError, ValueError) as e:
+            raise CommandFailed(f"export failed: {e}")
+        return result.to_dict()
+
+    def import_file(self, kind: str, path: str):
+        try:
+            result = self.transferService.importFromFile(kind, path)
+        except (OSError, ValueError) as e:
+            raise CommandFailed(f"import failed: {e}")
+        return result.to_dict()
+
+
+class TodoListController(CommandHandlers):
+    """The interactive prompt: runs the shared command handlers and prints their results."""
+
+    def __init__(self, context: Optional[AppContext] = None):
+        # services are created by the context on the first command that needs them
+        self.context = context or AppContext()
+
+    @property
+    def projectService(self):
+        return self.context.project_service
+
+    @property
+    def todoItemService(self):
+        return self.context.todo_service
+
+    @property
+    def transferService(self):
+        return self.context.transfer_service
 
     def display_help(self):
         help_text = """
             Todo List Application Commands:
             help/h/?                 Display this help message
+            stats                    Show connection pool, cache and query statistics
             quit/exit                Exit the application
 
             Projects:
             projects list                     List all projects
             projects create <project_title>   Create a new project
             projects delete <project_title>   Delete a project by title
+            projects stats [project_title]    Show total, open, completed and per-priority todo counts
+            projects verify                   Check the counts against the todos and repair them
+            projects shards                   Show how projects and todos are spread over the shards
+            projects rebalance <shard> <project_title>
+                                     Move a project and its todos to another shard
+            projects purge                    Show deleted projects whose todos are still being removed
+            (quote titles that contain spaces: projects create "Home Office")
 
             Todos:
             todos list <project_title>  List todos (optionally for a project)
-            todos add                Add a todo (interactive prompts)
-            todos complete <todo_id>      Mark todo completed
+            todos add [<project_title> <priority> <description>]
+                                     Add a todo (prompts for any missing fields)
+            todos search <terms>          Search todo descriptions and project titles
+            todos next [k] [project_title]  Show the k (default 10) open todos to do next
+            todos complete <ids>          Mark todos completed, e.g. 3, 1,4,7 or 2-6
+            todos priority <ids> <1-5>    Set the priority of todos
+            todos move <ids> <project_title>  Move todos to another project
             todos delete <todo_id>        Delete a todo by id
+            todos changes [seq] [limit]   Show what changed since change log position seq
+            todos compact-log [retention_days]
+                                     Shrink the change log; drop deletes older than the retention
+
+            Import/Export (.csv or .jsonl, picked by the file extension):
+            export projects <file>                  Write all projects to a file
+            export todos <file> [project_title]     Write todos (optionally for a project) to a file
+            import projects <file>                  Create projects from a file; existing titles are skipped
+            import todos <file>                     Create todos from a file, e.g. an earlier export
             """
         print(help_text)
 
@@ -34,104 +415,230 @@ class TodoListController:
         v = input(f"{prompt} [{default}] ").strip()
         return v or default
 
+    @staticmethod
+    def _print_todo(t: Dict[str, Any], text: Optional[str] = None, prefix: str = ""):
+        status = "x" if t["completed"] == "yes" else " "
+        print(f"  {prefix}id: {t['todo_id']}: [{status}] (priority: {t['priority']}) "
+              f"{t['description'] if text is None else text} Project: {t['title'] or 'N/A'}")
+
     def _create_project_flow(self, project_title: str):
-        proj = self.projectService.createProject(project_title)
-        if proj:
-            print(f"Created: {proj}")
-        else:
-            print("Failed to create project. Title may be invalid.")
+        proj = self.create_project(project_title)
+        print(f"Created: Project(id={proj['project_id']}, title={proj['title']})")
 
     def _list_projects(self):
-        projects = self.projectService.getAllProjects()
+        projects = self.list_projects()["projects"]
         if not projects:
             print("No projects found")
             return
         print("Projects:")
         for p in projects:
-            print(f"  {p.project_id}: {p.title}")
+            print(f"  {p['project_id']}: {p['title']}")
 
-    def _add_todo_flow(self):
-        project_title = ""
-        while True:
-            project_title = self._prompt("Enter Project Title: ")
-            if project_title and isinstance(project_title, str) and project_title.strip():
-                project = self.projectService.getProjectByTitle(project_title)
-                if project:
+    def _project_stats(self, project_title: Optional[str] = None):
+        stats = self.project_stats(project_title)["stats"]
+        if not stats:
+            print("No projects found")
+            return
+        print(f"  {'id':>4}  {'project':<24} {'total':>6} {'open':>6} {'done':>6}   " + " ".join(f"p{n:<3}" for n in range(1, 6)))
+        for s in stats:
+            print(f"  {s['project_id']:>4}  {s['title'][:24]:<24} {s['total']:>6} {s['open']:>6} {s['completed']:>6}   "
+                  + " ".join(f"{c:<4}" for c in s["by_priority"].values()))
+
+    def _verify_stats(self):
+        diffs = self.verify_stats()["repaired"]
+        if not diffs:
+            print("Project stats are consistent")
+            return
+        print(f"Repaired stats for {len(diffs)} project(s):")
+        for d in diffs:
+            print(f"  project {d['project_id']}: stored {d['stored']}, actual {d['actual']}")
+
+    def _show_shards(self):
+        shards = self.show_shards()["shards"]
+        print(f"  {'shard':>5} {'projects':>9} {'todos':>9}")
+        for s in shards:
+            print(f"  {s['shard']:>5} {s['projects']:>9} {s['todos']:>9}")
+
+    def _rebalance(self, shard: int, project_title: str):
+        result = self.rebalance(shard, project_title)
+        print(f"Moved {result['title']} to shard {shard} ({len(result['todo_ids'])} todos renumbered)")
+
+    def _add_todo_flow(self, project_title: Optional[str] = None, priority: Optional[str] = None,
+                       description: Optional[str] = None):
+        if project_title is None:
+            # prompt for the fields missing from the command line
+            while True:
+                project_title = self._prompt("Enter Project Title: ")
+                if not project_title:
+                    print("Project title cannot be empty.")
+                elif self.projectService.getProjectByTitle(project_title):
                     break
                 else:
                     print("Project not found. Please enter a valid project title.")
-            else:
-                print("Project title cannot be empty.")
 
-        description = self._prompt("Description: ")
+            description = self._prompt("Description: ")
 
-        while True:
-            priority_raw = self._prompt("Priority (1-5, default 3): ", "3")
-            try:
-                priority = int(priority_raw)
-            except ValueError:
+            while True:
+                priority = self._prompt("Priority (1-5, default 3): ", "3")
+                if priority.isdigit() and 1 <= int(priority) <= 5:
+                    break
                 print("Priority must be an integer between 1 and 5.")
-                continue
-            if 1 <= priority <= 5:
-                break
-            print("Priority must be between 1 and 5.")
-
-        todo = self.todoItemService.createTodoItem(
-            title=project.title,
-            description=description,
-            priority=priority,
-            project_id=project.project_id
-        )
-        if todo:
-            print(f"Created todo: {todo}")
-        else:
-            print("Failed to create todo. Check inputs and try again.")
 
-    def _list_todos(self, project_title: Optional[str] = None):
-        if project_title:
-            project = self.projectService.getProjectByTitle(project_title)
-            if not project:
-                print("Project not found")
-                return
-            todos = self.todoItemService.getAllTodoItemsByProjectTitle(project.title)
-        else:
-            todos = self.todoItemService.getAllTodoItems()
+        todo = self.add_todo(project_title, priority, description)
+        print(f"Created todo: TodoItem(id={todo['todo_id']}, title={todo['title']}, priority={todo['priority']}, "
+              f"completed={todo['completed'] == 'yes'})")
 
-        if not todos:
+    def _list_todos(self, project_title: Optional[str] = None):
+        # page through the list instead of loading every todo up front
+        page = self.list_todos(project_title, limit=PAGE_SIZE)
+        if not page["todos"]:
             print("No todo items found")
             return
 
         print("Todos:")
         print("Todo id; [status] (priority) description Project: project_title")
         print()
+        while page["todos"]:
+            for t in page["todos"]:
+                self._print_todo(t)
+            if page["next"] is None:
+                break
+            if sys.stdin.isatty():
+                try:
+                    more = input("-- more (Enter to continue, q to stop) -- ").strip().lower()
+                except (EOFError, KeyboardInterrupt):
+                    break
+                if more.startswith("q"):
+                    break
+            page = self.list_todos(project_title, after=tuple(page["next"]), limit=PAGE_SIZE)
+
+    def _search_todos(self, query: str):
+        results = self.search_todos(query)["results"]
+        if not results:
+            print("No matching todos")
+            return
+        print(f"Todos matching '{query}':")
+        for r in results:
+            self._print_todo(r, r["snippet"])
+
+    def _next_todos(self, k: Optional[int] = None, project_title: Optional[str] = None):
+        todos = self.next_todos(k, project_title)["todos"]
+        if not todos:
+            print("Nothing left to do")
+            return
+        print("Next up:")
         for t in todos:
-            status = "x" if t.completed else " "
-            print(f"  id: {t.todo_id}: [{status}] (priority: {t.priority}) {t.description} Project: {t.title or 'N/A'}")
+            print(f"  id: {t['todo_id']}: (priority: {t['priority']}) {t['description']} Project: {t['title'] or 'N/A'}")
+
+    def _complete_todo(self, todo_ids: List[int]):
+        count = self.complete_todos(todo_ids)["affected"]
+        if len(todo_ids) == 1:
+            print("Marked completed" if count else "Todo not found or already completed")
+        else:
+            print(f"Marked {count} of {len(todo_ids)} todos completed")
+
+    def _set_priority(self, todo_ids: List[int], priority: str):
+        count = self.set_priority(todo_ids, priority)["affected"]
+        print(f"Updated priority of {count} of {len(todo_ids)} todos")
+
+    def _move_todos(self, todo_ids: List[int], project_title: str):
+        result = self.move_todos(todo_ids, project_title)
+        print(f"Moved {result['affected']} of {len(todo_ids)} todos to {result['title']}")
+
+    def _delete_todo(self, todo_id: str):
+        self.delete_todo(todo_id)
+        print("Deleted")
 
-    def _complete_todo(self, todo_id: int):
-        todo = self.todoItemService.getTodoItemById(todo_id)
-        if not todo:
-            print("Todo not found")
+    def _show_changes(self, seq: int = 0, limit: Optional[int] = None):
+        changes = self.show_changes(seq, limit)
+        if changes["reset"]:
+            print(f"Change log was pruned past {seq}: reload all todos, then continue from {changes['cursor']}")
             return
-        todo.completed = True
-        ok = self.todoItemService.updateTodoItem(todo)
-        print("Marked completed" if ok else "Failed to update todo")
+        for c in changes["changes"]:
+            if c["op"] == "delete":
+                print(f"  #{c['seq']} deleted todo {c['row_id']}")
+            else:
+                self._print_todo(c["data"], prefix=f"#{c['seq']} ")
+        more = " (more to read)" if changes["has_more"] else ""
+        print(f"{len(changes['changes'])} change(s); continue from {changes['cursor']}{more}")
+
+    def _compact_log(self, retention_days: Optional[float] = None):
+        result = self.compact_log(retention_days)
+        print(f"Removed {result['superseded']} superseded and {result['expired']} expired change log entries; "
+              f"cursors before {result['pruned_through']} must reload")
 
-    def _delete_todo(self, todo_id: int):
-        ok = self.todoItemService.deleteTodoItem(todo_id)
-        print("Deleted" if ok else "Not found or failed")
+    def _show_stats(self):
+        from Utils.instrumentation import report
+
+        result = self.stats()
+        pool, cache = result["pool"], result["project_cache"]
+        print(f"Connection pool: {pool['size']}/{pool['max_size']} open, {pool['idle']} idle, "
+              f"{pool['opens']} opened, {pool['checkouts']} checkouts, {pool['waits']} waits, "
+              f"{pool['discards']} discarded, {pool['checkpoints']} checkpoints")
+        print(f"Project cache: {cache['size']} entries, {cache['hits']} hits, {cache['misses']} misses, "
+              f"{cache['evictions']} evictions")
+        print()
+        print(report())
 
     def _delete_project(self, project_title: str):
-        project = self.projectService.getProjectByTitle(project_title)
-        if not project:
-            print("Project not found")
+        if self.delete_project(project_title)["purging"]:
+            print("Deleted project; its todos are being removed in the background (see 'projects purge')")
+        else:
+            print("Deleted project")
+
+    def _show_purges(self):
+        purges = self.show_purges()["purges"]
+        if not purges:
+            print("No deleted projects waiting to be purged")
             return
-        ok = self.projectService.deleteProjectByTitle(project_title)
-        print("Deleted project" if ok else "Failed to delete project")
+        for p in purges:
+            percent = 100 * p["purged"] // p["todos"] if p["todos"] else 100
+            print(f"  {p['project_id']}: {p['title']}  {p['purged']} of {p['todos']} todos removed ({percent}%)")
+
+    def _export(self, kind: str, path: str, project_title: Optional[str] = None):
+        result = self.export(kind, path, project_title)
+        print(f"Exported {result['rows']} {kind} to {path} in {result['seconds']:.2f}s ({result['rows_per_sec']:.0f} rows/sec)")
+
+    def _import(self, kind: str, path: str):
+        result = self.import_file(kind, path)
+        print(f"Imported {result['written']} of {result['rows']} {kind} from {path} in {result['seconds']:.2f}s "
+              f"({result['rows_per_sec']:.0f} rows/sec), {result['skipped']} skipped, {len(result['errors'])} rejected")
+        for line, reason in list(result["errors"].items())[:10]:
+            print(f"  line {line}: {reason}")
+
+    def _handlers(self):
+        # how each command's result is printed; the work itself is done by `handlers()`
+        return {
+            "help": self.display_help,
+            "stats": self._show_stats,
+            "projects list": self._list_projects,
+            "projects create": self._create_project_flow,
+            "projects delete": self._delete_project,
+            "projects stats": self._project_stats,
+            "projects verify": self._verify_stats,
+            "projects shards": self._show_shards,
+            "projects rebalance": self._rebalance,
+            "projects purge": self._show_purges,
+            "todos list": self._list_todos,
+            "todos add": self._add_todo_flow,
+            "todos search": self._search_todos,
+            "todos next": self._next_todos,
+            "todos complete": self._complete_todo,
+            "todos priority": self._set_priority,
+            "todos move": self._move_todos,
+            "todos delete": self._delete_todo,
+            "todos changes": self._show_changes,
+            "todos compact-log": self._compact_log,
+            "export projects": lambda path: self._export("projects", path),
+            "export todos": lambda path, title=None: self._export("todos", path, title),
+            "import projects": lambda path: self._import("projects", path),
+            "import todos": lambda path: self._import("todos", path),
+        }
 
     # main loop
     def run(self):
         print("Todo List Application started. Type 'help/h/?' for commands")
+        handlers = self._handlers()
 
         while True:
             try:
@@ -145,55 +652,16 @@ class TodoListController:
             if not command:
                 continue
 
-            parts = command.split()
-            cmd = parts[0].lower()
+            try:
+                name, args = parse_command(command)
+            except CommandError as e:
+                print(e)
+                continue
 
-            if cmd in ["quit", "exit"]:
+            if name == "quit":
                 print("Exiting the application.")
                 break
-            if cmd in ["help", "h", "?"]:
-                self.display_help()
-                continue
-
-            if cmd == "projects":
-                if len(parts) >= 2 and parts[1] == "list":
-                    self._list_projects()
-                elif len(parts) >= 2 and parts[1] == "create":
-                    if len(parts) >= 3:
-                        self._create_project_flow(parts[2])
-                    else:
-                        print("Error: No project title provided.")
-                elif len(parts) >= 3 and parts[1] == "delete":
-                    self._delete_project(parts[2])
-                else:
-                    print("Unknown projects command. Use 'projects list' or 'projects create' or 'projects delete <title>'")
-                continue
-
-            if cmd == "todos":
-                if len(parts) >= 2 and parts[1] == "list":
-                    if len(parts) == 3:
-                        self._list_todos(project_title=parts[2])
-                    else:
-                        self._list_todos()
-                elif len(parts) >= 2 and parts[1] == "add":
-                    self._add_todo_flow()
-                elif len(parts) >= 3 and parts[1] == "complete":
-                    try:
-                        tid = int(parts[2])
-                    except Exception:
-                        print("todo id must be numeric")
-                        continue
-                    self._complete_todo(tid)
-                elif len(parts) >= 3 and parts[1] == "delete":
-                    try:
-                        tid = int(parts[2])
-                    except Exception:
-                        print("todo id must be numeric")
-                        continue
-                    self._delete_todo(tid)
-                else:
-                    print("Unknown todos command. Use 'todos list [project_title]', 'todos add', 'todos complete <id>', or 'todos delete <id>'")
-                continue
-
-            print("Unknown command. Type 'help' for available commands")
-
+            try:
+                handlers[name](*args)
+            except CommandFailed as e:
+                print(e)
@@ -0,0 +1,64 @@
+from typing import Dict, Iterable, List, Optional
+
+from DAO.ProjectDAO import ProjectDAO
+from Models.BatchResult import BatchResult
+from Models.Project import Project
+from Utils.async_executor import DatabaseExecutor, get_executor
+from Utils.db_connection import BATCH_CHUNK_SIZE
+
+
+class AsyncProjectDAO:
+    """Asyncio counterpart of `ProjectDAO`.
+
+    Lookups run on the executor's reader threads and writes on its single
+    writer thread; the shared project cache is used exactly as by `ProjectDAO`.
+    Each method accepts a `timeout` in seconds (default: the executor's).
+    """
+
+    def __init__(self, dao: Optional[ProjectDAO] = None, executor: Optional[DatabaseExecutor] = None):
+        """Wrap a synchronous DAO.
+
+        Parameters:
+            dao (Optional[ProjectDAO]): DAO to delegate to; a new one by default.
+            executor (Optional[DatabaseExecutor]): executor to run calls on; the
+                process-wide one by default.
+        """
+        self.dao = dao or ProjectDAO()
+        self.executor = executor or get_executor()
+
+    def cacheStats(self) -> Dict[str, int]:
+        """Return hit/miss counters of the shared project cache (no I/O)."""
+        return self.dao.cacheStats()
+
+    async def createProject(self, title: str, timeout: Optional[float] = None) -> Optional[Project]:
+        """Insert a new project (see `ProjectDAO.createProject`)."""
+        return await self.executor.write(self.dao.createProject, title, timeout=timeout)
+
+    async def createProjects(self, projects: Iterable[Project], chunk_size: int = BATCH_CHUNK_SIZE,
+                             timeout: Optional[float] = None) -> BatchResult:
+        """Insert many projects in one transaction (see `ProjectDAO.createProjects`)."""
+        return await self.executor.write(self.dao.createProjects, list(projects), chunk_size, timeout=timeout)
+
+    async def getProjectById(self, project_id: int, timeout: Optional[float] = None) -> Optional[Project]:
+        """Retrieve a project by id (see `ProjectDAO.getProjectById`)."""
+        return await self.executor.read(self.dao.getProjectById, project_id, timeout=timeout)
+
+    async def getProjectByTitle(self, title: str, timeout: Optional[float] = None) -> Optional[Project]:
+        """Retrieve a project by title (see `ProjectDAO.getProjectByTitle`)."""
+        return await self.executor.read(self.dao.getProjectByTitle, title, timeout=timeout)
+
+    async def getAllProjects(self, timeout: Optional[float] = None) -> List[Project]:
+        """List all projects (see `ProjectDAO.getAllProjects`)."""
+        return await self.executor.read(self.dao.getAllProjects, timeout=timeout)
+
+    async def updateProjectTitleById(self, project: Project, timeout: Optional[float] = None) -> bool:
+        """Rename a project (see `ProjectDAO.updateProjectTitleById`)."""
+        return await self.executor.write(self.dao.updateProjectTitleById, project, timeout=timeout)
+
+    async def deleteProjectById(self, project_id: int, timeout: Optional[float] = None) -> bool:
+        """Delete a project and its todos by id (see `ProjectDAO.deleteProjectById`)."""
+        return await self.executor.write(self.dao.deleteProjectById, project_id, timeout=timeout)
+
+    async def deleteProjectByTitle(self, title: str, timeout: Optional[float] = None) -> bool:
+        """Delete a project and its todos by title (see `ProjectDAO.deleteProjectByTitle`)."""
+        return await self.executor.write(self.dao.deleteProjectByTitle, title, timeout=timeout)
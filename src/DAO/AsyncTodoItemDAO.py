@@ -0,0 +1,133 @@
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from DAO.TodoItemDAO import NEXT_LIMIT, SEARCH_LIMIT, TodoItemDAO
+from Models.BatchResult import BatchResult
+from Models.SearchResult import SearchResult
+from Models.TodoItem import TodoItem
+from Utils.async_executor import DatabaseExecutor, get_executor
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE
+
+
+class AsyncTodoItemDAO:
+    """Asyncio counterpart of `TodoItemDAO`.
+
+    Every method runs the matching `TodoItemDAO` call on a `DatabaseExecutor`:
+    lookups on its reader threads, so many coroutines can query concurrently,
+    and writes on its single writer thread. Each method accepts a `timeout` in
+    seconds (default: the executor's); a call that times out or is cancelled is
+    interrupted inside SQLite and its transaction rolled back.
+    """
+
+    def __init__(self, dao: Optional[TodoItemDAO] = None, executor: Optional[DatabaseExecutor] = None):
+        """Wrap a synchronous DAO.
+
+        Parameters:
+            dao (Optional[TodoItemDAO]): DAO to delegate to; a new one by default.
+            executor (Optional[DatabaseExecutor]): executor to run calls on; the
+                process-wide one by default.
+        """
+        self.dao = dao or TodoItemDAO()
+        self.executor = executor or get_executor()
+
+    async def createTodoItem(self, item: TodoItem, timeout: Optional[float] = None) -> Optional[TodoItem]:
+        """Insert a new todo item (see `TodoItemDAO.createTodoItem`)."""
+        return await self.executor.write(self.dao.createTodoItem, item, timeout=timeout)
+
+    async def getTodoItemById(self, todo_id: int, timeout: Optional[float] = None) -> Optional[TodoItem]:
+        """Fetch a todo item by its id (see `TodoItemDAO.getTodoItemById`)."""
+        return await self.executor.read(self.dao.getTodoItemById, todo_id, timeout=timeout)
+
+    async def getAllTodoItemsByProjectId(self, project_id: int, timeout: Optional[float] = None) -> List[TodoItem]:
+        """List the todo items of one project (see `TodoItemDAO.getAllTodoItemsByProjectId`)."""
+        return await self.executor.read(self.dao.getAllTodoItemsByProjectId, project_id, timeout=timeout)
+
+    async def getAllTodoItemsByProjectTitle(self, project_title: str, timeout: Optional[float] = None) -> List[TodoItem]:
+        """List the todo items of one project by title (see `TodoItemDAO.getAllTodoItemsByProjectTitle`)."""
+        return await self.executor.read(self.dao.getAllTodoItemsByProjectTitle, project_title, timeout=timeout)
+
+    async def getAllTodoItems(self, timeout: Optional[float] = None) -> List[TodoItem]:
+        """List all todo items (see `TodoItemDAO.getAllTodoItems`)."""
+        return await self.executor.read(self.dao.getAllTodoItems, timeout=timeout)
+
+    async def iterTodoItems(self, project_id: Optional[int] = None, batch_size: int = FETCH_BATCH_SIZE,
+                            timeout: Optional[float] = None) -> AsyncIterator[TodoItem]:
+        """Stream todo items ordered by (priority, todo_id).
+
+        Fetches one keyset page of `batch_size` items per executor call, so no
+        connection stays checked out while the consumer is suspended between
+        items. `timeout` applies to each page.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only todos for this project are yielded.
+            batch_size (int): items fetched per executor call.
+            timeout (Optional[float]): seconds allowed per page.
+
+        Returns:
+            AsyncIterator[TodoItem]: todo items ordered by (priority, todo_id).
+        """
+        after = None
+        while True:
+            page = await self.getTodoItemsPage(project_id, after, batch_size, timeout=timeout)
+            for item in page:
+                yield item
+            if len(page) < batch_size:
+                return
+            after = (page[-1].priority, page[-1].todo_id)
+
+    async def getTodoItemsPage(self, project_id: Optional[int] = None, after: Optional[Tuple[int, int]] = None,
+                               limit: int = 50, timeout: Optional[float] = None) -> List[TodoItem]:
+        """Return one keyset page of todo items (see `TodoItemDAO.getTodoItemsPage`)."""
+        return await self.executor.read(self.dao.getTodoItemsPage, project_id, after, limit, timeout=timeout)
+
+    async def nextTodoItems(self, k: int = NEXT_LIMIT, project_id: Optional[int] = None,
+                            include_completed: bool = False, timeout: Optional[float] = None) -> List[TodoItem]:
+        """Return the first `k` todos by priority (see `TodoItemDAO.nextTodoItems`)."""
+        return await self.executor.read(self.dao.nextTodoItems, k, project_id, include_completed, timeout=timeout)
+
+    async def searchTodoItems(self, query: str, project_id: Optional[int] = None, limit: int = SEARCH_LIMIT,
+                              timeout: Optional[float] = None) -> List[SearchResult]:
+        """Full-text search over todos (see `TodoItemDAO.searchTodoItems`)."""
+        return await self.executor.read(self.dao.searchTodoItems, query, project_id, limit, timeout=timeout)
+
+    async def updateTodoItemById(self, item: TodoItem, timeout: Optional[float] = None) -> bool:
+        """Update an existing todo item (see `TodoItemDAO.updateTodoItemById`)."""
+        return await self.executor.write(self.dao.updateTodoItemById, item, timeout=timeout)
+
+    async def deleteTodoItemById(self, todo_id: int, timeout: Optional[float] = None) -> bool:
+        """Delete a todo item by id (see `TodoItemDAO.deleteTodoItemById`)."""
+        return await self.executor.write(self.dao.deleteTodoItemById, todo_id, timeout=timeout)
+
+    async def createTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE,
+                              timeout: Optional[float] = None) -> BatchResult:
+        """Insert many todo items in one transaction (see `TodoItemDAO.createTodoItems`).
+
+        `items` is materialised first so the caller's iterable is never consumed on the writer thread.
+        """
+        return await self.executor.write(self.dao.createTodoItems, list(items), chunk_size, timeout=timeout)
+
+    async def updateTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE,
+                              timeout: Optional[float] = None) -> BatchResult:
+        """Update many todo items in one transaction (see `TodoItemDAO.updateTodoItems`)."""
+        return await self.executor.write(self.dao.updateTodoItems, list(items), chunk_size, timeout=timeout)
+
+    async def completeTodoItems(self, todo_ids: Iterable[int], completed: bool = True,
+                                chunk_size: int = BATCH_CHUNK_SIZE, timeout: Optional[float] = None) -> int:
+        """Mark many todo items completed in one statement (see `TodoItemDAO.completeTodoItems`)."""
+        return await self.executor.write(self.dao.completeTodoItems, list(todo_ids), completed, chunk_size,
+                                         timeout=timeout)
+
+    async def setPriority(self, todo_ids: Iterable[int], priority: int, chunk_size: int = BATCH_CHUNK_SIZE,
+                          timeout: Optional[float] = None) -> int:
+        """Set the priority of many todo items in one statement (see `TodoItemDAO.setPriority`)."""
+        return await self.executor.write(self.dao.setPriority, list(todo_ids), priority, chunk_size, timeout=timeout)
+
+    async def moveToProject(self, todo_ids: Iterable[int], project_id: int, chunk_size: int = BATCH_CHUNK_SIZE,
+                            timeout: Optional[float] = None) -> int:
+        """Move many todo items to another project in one statement (see `TodoItemDAO.moveToProject`)."""
+        return await self.executor.write(self.dao.moveToProject, list(todo_ids), project_id, chunk_size,
+                                         timeout=timeout)
+
+    async def deleteTodoItemsByIds(self, todo_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE,
+                                   timeout: Optional[float] = None) -> BatchResult:
+        """Delete many todo items in one transaction (see `TodoItemDAO.deleteTodoItemsByIds`)."""
+        return await self.executor.write(self.dao.deleteTodoItemsByIds, list(todo_ids), chunk_size, timeout=timeout)
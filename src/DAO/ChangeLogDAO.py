@@ -0,0 +1,160 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from DAO.TodoItemDAO import _COLUMNS as _TODO_COLUMNS, _FROM as _TODO_FROM
+from Models.ChangeSet import Change, ChangeSet
+from Models.Project import Project
+from Models.TodoItem import TodoItem
+from Utils.db_connection import BATCH_CHUNK_SIZE, _chunks, _execute_as, _get_conn
+from Utils.migrations import LIVE_PROJECT
+
+# log entries read per changesSince call when no limit is given
+CHANGES_LIMIT = 500
+
+# current state of the changed rows, looked up by primary key
+_CURRENT_ROWS = {
+    "project": (f"SELECT project_id, title FROM Project p WHERE {LIVE_PROJECT} AND project_id IN ({{}})", Project.row_factory),
+    "todo": (f"SELECT {_TODO_COLUMNS} FROM {_TODO_FROM} WHERE ti.todo_id IN ({{}})", TodoItem.row_factory),
+}
+
+
+class ChangeLogDAO:
+    """Data access object for the trigger-fed `Change_Log`.
+
+    Triggers on Project and Todo_Item append one entry (seq, entity, op,
+    row_id) per inserted, updated or deleted row, so a consumer that remembers
+    the last seq it has seen reads only what changed since, instead of
+    rescanning and diffing both tables.
+    """
+
+    def __init__(self):
+        """Initialize the DAO instance.
+
+        No parameters. Database path is determined from module-level settings.
+        """
+        pass
+
+    def changesSince(self, seq: int = 0, limit: int = CHANGES_LIMIT, entity: Optional[str] = None) -> ChangeSet:
+        """Return the net changes recorded after `seq`, at most `limit` log entries' worth.
+
+        Entries of the same row are compacted into one change carrying the
+        row's current state, or a delete if it is gone; a row created and
+        deleted within the page is left out. The page and the rows it points
+        at are read from one snapshot.
+
+        Parameters:
+            seq (int): cursor returned by the previous call; 0 to start from the beginning.
+            limit (int): maximum number of log entries to read.
+            entity (Optional[str]): `project` or `todo` to read only that table's changes.
+
+        Returns:
+            ChangeSet: the changes in seq order and the cursor to continue from.
+        """
+        try:
+            with _get_conn() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                pruned = self._prunedThrough(conn)
+                if seq < pruned:
+                    return ChangeSet(cursor=pruned, has_more=True, reset=True)
+                sql = "SELECT seq, entity, op, row_id FROM Change_Log WHERE seq > ?"
+                params: list = [seq]
+                if entity is not None:
+                    sql += " AND entity = ?"
+                    params.append(entity)
+                sql += " ORDER BY seq LIMIT ?"
+                params.append(limit + 1)
+                entries = conn.execute(sql, params).fetchall()
+                has_more = len(entries) > limit
+                entries = entries[:limit]
+
+                # (entity, row_id) -> [first op in the page, last seq]
+                net: Dict[Tuple[str, int], List[Any]] = {}
+                for entry_seq, entry_entity, op, row_id in entries:
+                    key = (entry_entity, row_id)
+                    if key in net:
+                        net[key][1] = entry_seq
+                    else:
+                        net[key] = [op, entry_seq]
+                current: Dict[str, Dict[int, Dict[str, Any]]] = {}
+                for name, (query, row_factory) in _CURRENT_ROWS.items():
+                    ids = [row_id for (e, row_id) in net if e == name]
+                    current[name] = {}
+                    for chunk in _chunks(ids, BATCH_CHUNK_SIZE):
+                        for row in _execute_as(conn, row_factory, query.format(", ".join("?" * len(chunk))), chunk):
+                            data = row.to_dict()
+                            current[name][data["project_id" if name == "project" else "todo_id"]] = data
+
+            changes = []
+            for (name, row_id), (first_op, last_seq) in sorted(net.items(), key=lambda kv: kv[1][1]):
+                data = current[name].get(row_id)
+                if data is not None:
+                    changes.append(Change(last_seq, name, "upsert", row_id, data))
+                elif first_op != "insert":
+                    changes.append(Change(last_seq, name, "delete", row_id))
+            cursor = entries[-1][0] if entries else seq
+            return ChangeSet(changes=changes, cursor=cursor, has_more=has_more)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def compactChangeLog(self, retention: Optional[float] = None) -> Dict[str, int]:
+        """Shrink the change log.
+
+        Every entry with a newer entry for the same row is dropped; this loses
+        nothing, since a consumer behind it still reads the newer one. With a
+        `retention`, delete entries older than that are dropped too, and
+        consumers whose cursor is behind them are told to reload (see
+        `ChangeSet.reset`). Afterwards the log holds at most one entry per
+        existing row plus the recent deletes.
+
+        Parameters:
+            retention (Optional[float]): seconds a delete entry is kept; None keeps them all.
+
+        Returns:
+            Dict[str, int]: `superseded` and `expired` entries removed, and
+            `pruned_through`, the oldest cursor that can still continue.
+        """
+        try:
+            with _get_conn() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                superseded = conn.execute(
+                    "DELETE FROM Change_Log WHERE EXISTS (SELECT 1 FROM Change_Log n "
+                    "WHERE n.entity = Change_Log.entity AND n.row_id = Change_Log.row_id AND n.seq > Change_Log.seq)"
+                ).rowcount
+                expired = 0
+                pruned = self._prunedThrough(conn)
+                if retention is not None:
+                    cutoff = int(time.time() - retention)
+                    last = conn.execute(
+                        "SELECT MAX(seq) FROM Change_Log WHERE op = 'delete' AND changed_at < ?", (cutoff,)
+                    ).fetchone()[0]
+                    if last is not None:
+                        expired = conn.execute("DELETE FROM Change_Log WHERE op = 'delete' AND seq <= ?", (last,)).rowcount
+                        pruned = max(pruned, last)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO Change_Log_Meta (key, value) VALUES ('pruned_through', ?)", (pruned,)
+                        )
+                return {"superseded": superseded, "expired": expired, "pruned_through": pruned}
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def changeLogStats(self) -> Dict[str, int]:
+        """Return the size of the change log.
+
+        Returns:
+            Dict[str, int]: `entries`, `last_seq` (the newest seq handed out)
+            and `pruned_through` (see `compactChangeLog`).
+        """
+        try:
+            with _get_conn() as conn:
+                entries = conn.execute("SELECT COUNT(*) FROM Change_Log").fetchone()[0]
+                row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'Change_Log'").fetchone()
+                return {"entries": entries, "last_seq": row[0] if row else 0, "pruned_through": self._prunedThrough(conn)}
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    @staticmethod
+    def _prunedThrough(conn) -> int:
+        row = conn.execute("SELECT value FROM Change_Log_Meta WHERE key = 'pruned_through'").fetchone()
+        return row[0] if row else 0
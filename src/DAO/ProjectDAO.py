@@ -1,14 +1,38 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
+from Models.BatchResult import BatchResult
 from Models.Project import Project
-from Utils.db_connection import _get_conn
+from Models.ProjectStats import ProjectStats
+from Models.PurgeProgress import PurgeProgress
+from Utils.cache import LRUCache
+from Utils.db_connection import (
+    BATCH_CHUNK_SIZE, _execute_as, _execute_batch, _get_conn, add_rollback_hook, incremental_vacuum, transaction,
+)
+from Utils.migrations import LIVE_PROJECT, PRIORITIES, PROJECT_STATS_QUERY, rebuild_project_stats
+
+_STATS_COUNTS = ", ".join(["s.total", "s.completed"] + [f"s.p{n}" for n in PRIORITIES])
+
+# bounds for the read-through project cache shared by all ProjectDAO instances
+PROJECT_CACHE_SIZE = 1024
+PROJECT_CACHE_TTL = 300.0
+
+# todos removed per transaction when a deleted project is purged in the background
+PURGE_CHUNK_SIZE = 2000
 
 class ProjectDAO:
     """Data access object for `Project` records.
 
-    All methods operate directly against the SQLite database file.
+    All methods operate directly against the SQLite database file. Lookups by
+    id and by title are served from a read-through LRU cache shared by every
+    instance; writes made through any instance invalidate the affected entries.
     """
 
+    # keyed by ("id", project_id) and ("title", title); values are Project objects
+    cache = LRUCache(max_size=PROJECT_CACHE_SIZE, ttl=PROJECT_CACHE_TTL)
+
+    # projects with more todos than this are purged in the background when deleted
+    purge_threshold = PURGE_CHUNK_SIZE
+
     def __init__(self):
         """Initialize the DAO instance.
 
@@ -16,6 +40,26 @@ class ProjectDAO:
         """
         pass
 
+    def _remember(self, project: Project) -> None:
+        self.cache.put(("id", project.project_id), project)
+        self.cache.put(("title", project.title), project)
+
+    def _forget(self, project_id: Optional[int] = None, title: Optional[str] = None) -> None:
+        self.cache.invalidate(lambda key, p: p.project_id == project_id or p.title == title)
+
+    def _cached(self, key) -> Optional[Project]:
+        # hand out copies so callers mutating a result cannot corrupt the cache
+        p = self.cache.get(key)
+        return Project(project_id=p.project_id, title=p.title) if p is not None else None
+
+    def cacheStats(self) -> Dict[str, int]:
+        """Return hit/miss counters of the shared project cache.
+
+        Returns:
+            Dict[str, int]: `hits`, `misses`, `evictions` and current `size`.
+        """
+        return self.cache.stats()
+
     def createProject(self, title: str) -> Optional[Project]:
         """Insert a new Project row.
 
@@ -29,12 +73,35 @@ class ProjectDAO:
             sql = "INSERT INTO Project (title) VALUES (?)"
             with _get_conn() as conn:
                 cur = conn.execute(sql, (title,))
-                if cur.lastrowid:
-                    return Project(project_id=cur.lastrowid, title=title)
+            self._forget(title=title)
+            if cur.lastrowid:
+                return Project(project_id=cur.lastrowid, title=title)
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return None
-        
+
+    def createProjects(self, projects: Iterable[Project], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Insert many projects in a single transaction.
+
+        Parameters:
+            projects (Iterable[Project]): projects to insert. `project_id` is ignored.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: assigned `project_id` per input project (None where the
+            row was rejected, e.g. a duplicate title, with the reason in `errors`).
+        """
+        try:
+            sql = "INSERT INTO Project (title) VALUES (?)"
+            projects = list(projects)
+            with _get_conn() as conn:
+                ids, errors, affected = _execute_batch(conn, sql, ((p.title,) for p in projects), chunk_size)
+            titles = {p.title for p in projects}
+            self.cache.invalidate(lambda key, p: p.title in titles)
+            return BatchResult(ids=ids, errors=errors, affected=affected)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
     def getProjectById(self, project_id: int) -> Optional[Project]:
         """Retrieve a project by id.
 
@@ -44,13 +111,16 @@ class ProjectDAO:
         Returns:
             Optional[Project]: `Project` instance if found, otherwise `None`.
         """
+        cached = self._cached(("id", project_id))
+        if cached is not None:
+            return cached
         try:
-            sql = "SELECT project_id, title FROM Project WHERE project_id = ?"
+            sql = f"SELECT project_id, title FROM Project p WHERE project_id = ? AND {LIVE_PROJECT}"
             with _get_conn() as conn:
-                cur = conn.execute(sql, (project_id,))
-                row = cur.fetchone()
-                if row:
-                    return Project.from_row(dict(row))
+                project = _execute_as(conn, Project.row_factory, sql, (project_id,)).fetchone()
+                if project:
+                    self._remember(project)
+                    return Project(project_id=project.project_id, title=project.title)
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return None
@@ -64,13 +134,16 @@ class ProjectDAO:
         Returns:
             Optional[Project]: `Project` instance if found, otherwise `None`.
         """
+        cached = self._cached(("title", title))
+        if cached is not None:
+            return cached
         try:
-            sql = "SELECT project_id, title FROM Project WHERE title = ?"
+            sql = f"SELECT project_id, title FROM Project p WHERE title = ? AND {LIVE_PROJECT}"
             with _get_conn() as conn:
-                cur = conn.execute(sql, (title,))
-                row = cur.fetchone()
-                if row:
-                    return Project.from_row(dict(row))
+                project = _execute_as(conn, Project.row_factory, sql, (title,)).fetchone()
+                if project:
+                    self._remember(project)
+                    return Project(project_id=project.project_id, title=project.title)
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return None
@@ -82,10 +155,9 @@ class ProjectDAO:
             List[Project]: list of `Project` instances (empty list if none).
         """
         try:    
-            sql = "SELECT project_id, title FROM Project ORDER BY project_id ASC"
+            sql = f"SELECT project_id, title FROM Project p WHERE {LIVE_PROJECT} ORDER BY project_id ASC"
             with _get_conn() as conn:
-                cur = conn.execute(sql)
-                return [Project.from_row(dict(r)) for r in cur.fetchall()]
+                return _execute_as(conn, Project.row_factory, sql).fetchall()
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return []
@@ -103,7 +175,8 @@ class ProjectDAO:
             sql = "UPDATE Project SET title = ? WHERE project_id = ?"
             with _get_conn() as conn:
                 cur = conn.execute(sql, (project.title, project.project_id))
-                return cur.rowcount > 0
+            self._forget(project_id=project.project_id, title=project.title)
+            return cur.rowcount > 0
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return False
@@ -111,35 +184,179 @@ class ProjectDAO:
     def deleteProjectById(self, project_id: int) -> bool:
         """Delete a project by id.
 
+        A project with up to `purge_threshold` todos is deleted with its todos
+        at once. A larger one is only hidden: it disappears from every read
+        and its title is free for reuse, while `purgeStep` removes its todos
+        in chunks, so no single transaction holds the write lock for long.
+
         Parameters:
             project_id (int): id of the project to delete.
 
         Returns:
-            bool: True if a row was deleted, False otherwise.
+            bool: True if a row was deleted (or hidden), False otherwise.
         """
         try:
-            sql = "DELETE FROM Project WHERE project_id = ?"
             with _get_conn() as conn:
-                cur = conn.execute(sql, (project_id,))
-                return cur.rowcount > 0
+                if not conn.in_transaction:
+                    # the todo count must still hold when the delete runs
+                    conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT p.title, COALESCE(s.total, 0) FROM Project p LEFT JOIN Project_Stats s ON s.project_id = p.project_id "
+                    f"WHERE p.project_id = ? AND {LIVE_PROJECT}", (project_id,)
+                ).fetchone()
+                if row is not None and row[1] <= self.purge_threshold:
+                    conn.execute("DELETE FROM Project WHERE project_id = ?", (project_id,))
+                elif row is not None:
+                    conn.execute("INSERT INTO Project_Purge (project_id, title, todos) VALUES (?, ?, ?)",
+                                 (project_id, row[0], row[1]))
+                    # frees the title for a new project; no title a user types starts with NUL
+                    conn.execute("UPDATE Project SET title = ? WHERE project_id = ?", (f"\x00purge:{project_id}", project_id))
+            self._forget(project_id=project_id)
+            return row is not None
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return False
     
     def deleteProjectByTitle(self, title: str) -> bool:
-        """Delete a project by title.
+        """Delete a project by title (see `deleteProjectById`).
 
         Parameters:
             title (str): title of the project to delete.
 
         Returns:
-            bool: True if a row was deleted, False otherwise.
+            bool: True if a row was deleted (or hidden), False otherwise.
+        """
+        try:
+            with transaction():
+                with _get_conn() as conn:
+                    row = conn.execute(f"SELECT project_id FROM Project p WHERE title = ? AND {LIVE_PROJECT}", (title,)).fetchone()
+                deleted = row is not None and self.deleteProjectById(row[0])
+            self._forget(title=title)
+            return deleted
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+        return False
+
+    def purgeStep(self, chunk_size: int = PURGE_CHUNK_SIZE) -> Optional[PurgeProgress]:
+        """Remove the next chunk of todos of a project hidden by `deleteProjectById`.
+
+        Projects are purged oldest deletion first. The chunk that empties a
+        project also deletes the project row.
+
+        Parameters:
+            chunk_size (int): most todos removed in this transaction.
+
+        Returns:
+            Optional[PurgeProgress]: the project worked on, after this chunk;
+            None if no deleted project is waiting.
         """
         try:
-            sql = "DELETE FROM Project WHERE title = ?"
             with _get_conn() as conn:
-                cur = conn.execute(sql, (title,))
-                return cur.rowcount > 0
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                progress = _execute_as(
+                    conn, PurgeProgress.row_factory,
+                    "SELECT project_id, title, todos, purged FROM Project_Purge ORDER BY requested_at, project_id LIMIT 1",
+                ).fetchone()
+                if progress is None:
+                    return None
+                removed = conn.execute(
+                    "DELETE FROM Todo_Item WHERE todo_id IN (SELECT todo_id FROM Todo_Item WHERE project_id = ? LIMIT ?)",
+                    (progress.project_id, chunk_size),
+                ).rowcount
+                progress.purged += removed
+                if removed < chunk_size:
+                    # nothing left to cascade to but the Project_Purge row
+                    conn.execute("DELETE FROM Project WHERE project_id = ?", (progress.project_id,))
+                    progress.done = True
+                else:
+                    conn.execute("UPDATE Project_Purge SET purged = ? WHERE project_id = ?",
+                                 (progress.purged, progress.project_id))
+                return progress
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def getPurgeProgress(self) -> List[PurgeProgress]:
+        """List the deleted projects whose todos are still being purged, in purge order.
+
+        Returns:
+            List[PurgeProgress]: one entry per waiting project (empty list if none).
+        """
+        try:
+            sql = "SELECT project_id, title, todos, purged FROM Project_Purge ORDER BY requested_at, project_id"
+            with _get_conn() as conn:
+                return _execute_as(conn, PurgeProgress.row_factory, sql).fetchall()
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def incrementalVacuum(self, pages: int = 0) -> int:
+        """Return free pages to the file system (see `ConnectionPool.incremental_vacuum`).
+
+        Parameters:
+            pages (int): most pages to release; 0 releases every free page.
+
+        Returns:
+            int: number of pages released.
+        """
+        try:
+            return incremental_vacuum(pages)
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
-        return False
\ No newline at end of file
+
+    def getProjectStats(self, project_id: Optional[int] = None) -> List[ProjectStats]:
+        """Read todo counts per project from the trigger-maintained Project_Stats summary.
+
+        Costs one row per project, however many todos there are.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only this project's counts are returned.
+
+        Returns:
+            List[ProjectStats]: counts ordered by project id.
+        """
+        try:
+            sql = f"SELECT p.project_id, p.title, {_STATS_COUNTS} FROM Project_Stats s JOIN Project p ON p.project_id = s.project_id"
+            sql += f" WHERE {LIVE_PROJECT}"
+            params: tuple = ()
+            if project_id is not None:
+                sql += " AND s.project_id = ?"
+                params = (project_id,)
+            sql += " ORDER BY s.project_id"
+            with _get_conn() as conn:
+                return _execute_as(conn, ProjectStats.row_factory, sql, params).fetchall()
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def checkProjectStats(self, repair: bool = False) -> List[Dict[str, Any]]:
+        """Recompute the Project_Stats summary from Todo_Item and compare it with the stored rows.
+
+        Parameters:
+            repair (bool): if differences are found, rebuild the summary in the same transaction.
+
+        Returns:
+            List[Dict[str, Any]]: one entry per project whose counts differ, with `project_id`,
+            `stored` and `actual` counts as (total, completed, p1, ..., p5) tuples; a missing
+            row is None.
+        """
+        try:
+            counts = ", ".join(["total", "completed"] + [f"p{n}" for n in PRIORITIES])
+            with _get_conn() as conn:
+                if repair and not conn.in_transaction:
+                    # nothing may change between the comparison and the rebuild
+                    conn.execute("BEGIN IMMEDIATE")
+                stored = {r[0]: tuple(r[1:]) for r in conn.execute(f"SELECT project_id, {counts} FROM Project_Stats")}
+                actual = {r[0]: tuple(r[1:]) for r in conn.execute(PROJECT_STATS_QUERY)}
+                diffs = [
+                    {"project_id": pid, "stored": stored.get(pid), "actual": actual.get(pid)}
+                    for pid in sorted(stored.keys() | actual.keys())
+                    if stored.get(pid) != actual.get(pid)
+                ]
+                if repair and diffs:
+                    rebuild_project_stats(conn)
+                return diffs
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+
+# entries cached inside a transaction() block may describe rows that were rolled back
+add_rollback_hook(ProjectDAO.cache.clear)
@@ -0,0 +1,41 @@
+from concurrent.futures import Future
+from typing import Optional
+
+from DAO.TodoItemDAO import TodoItemDAO
+from Models.TodoItem import TodoItem
+from Utils.write_queue import WriteQueue
+
+
+class QueuedTodoItemDAO:
+    """Write-behind front end for `TodoItemDAO`'s single-row writes.
+
+    The writes are handed to a `WriteQueue`, whose writer thread commits them
+    in groups, and return a `concurrent.futures.Future` at once. Use it when
+    many threads write at the same time; a lone caller gains nothing and waits
+    up to the queue's `max_delay` per write. Reads are not queued: use the
+    wrapped `dao` for them. A read only sees a queued write once its future
+    has resolved.
+    """
+
+    def __init__(self, dao: Optional[TodoItemDAO] = None, write_queue: Optional[WriteQueue] = None):
+        """Wrap a synchronous DAO.
+
+        Parameters:
+            dao (Optional[TodoItemDAO]): DAO to delegate to; a new one by default.
+            write_queue (Optional[WriteQueue]): queue to submit writes to; a new
+                one with the default group size and delay by default.
+        """
+        self.dao = dao or TodoItemDAO()
+        self.queue = write_queue or WriteQueue()
+
+    def createTodoItem(self, item: TodoItem) -> "Future[Optional[TodoItem]]":
+        """Queue the insert of a new todo item (see `TodoItemDAO.createTodoItem`)."""
+        return self.queue.submit(self.dao.createTodoItem, item)
+
+    def updateTodoItemById(self, item: TodoItem) -> "Future[bool]":
+        """Queue the update of an existing todo item (see `TodoItemDAO.updateTodoItemById`)."""
+        return self.queue.submit(self.dao.updateTodoItemById, item)
+
+    def deleteTodoItemById(self, todo_id: int) -> "Future[bool]":
+        """Queue the delete of a todo item by id (see `TodoItemDAO.deleteTodoItemById`)."""
+        return self.queue.submit(self.dao.deleteTodoItemById, todo_id)
@@ -0,0 +1,278 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+from DAO.ProjectDAO import PROJECT_CACHE_SIZE, PROJECT_CACHE_TTL, PURGE_CHUNK_SIZE, ProjectDAO
+from Models.BatchResult import BatchResult
+from Models.Project import Project
+from Models.ProjectStats import ProjectStats
+from Models.PurgeProgress import PurgeProgress
+from Utils.cache import LRUCache
+from Utils.db_connection import BATCH_CHUNK_SIZE, _get_conn, _ROW_ERRORS, add_rollback_hook, transaction
+from Utils.sharding import ShardRouter, get_router
+
+
+class ShardedProjectDAO(ProjectDAO):
+    """`ProjectDAO` over a sharded layout (see `Utils.sharding.ShardRouter`).
+
+    Calls naming one project are sent to the shard that holds it, found in the
+    router's directory; listing calls read every shard in parallel and merge
+    the results by project id. Creating, renaming and deleting a project
+    update its shard and the directory in one `transaction()` block.
+    """
+
+    # ids and titles are unique across shards, but not shared with the unsharded DAO's cache
+    cache = LRUCache(max_size=PROJECT_CACHE_SIZE, ttl=PROJECT_CACHE_TTL)
+
+    def __init__(self, router: Optional[ShardRouter] = None):
+        """Initialize the DAO instance.
+
+        Parameters:
+            router (Optional[ShardRouter]): router to send calls through; the
+                process-wide one (see `get_router`) by default.
+        """
+        self.router = router or get_router()
+        if self.router is None:
+            raise ValueError("no shard router configured (set TODOLIST_SHARDS)")
+
+    def createProject(self, title: str) -> Optional[Project]:
+        """Insert a new Project row on the shard with the fewest projects.
+
+        Parameters:
+            title (str): Project title to insert (unique across all shards).
+
+        Returns:
+            Optional[Project]: the created project.
+        """
+        try:
+            with transaction():
+                placed = self.router.place(title)
+                with self.router.use(placed["shard"]), _get_conn() as conn:
+                    conn.execute("INSERT INTO Project (project_id, title) VALUES (?, ?)", (placed["project_id"], title))
+            self._forget(title=title)
+            return Project(project_id=placed["project_id"], title=title)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def createProjects(self, projects: Iterable[Project], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Insert many projects in a single transaction.
+
+        Parameters:
+            projects (Iterable[Project]): projects to insert. `project_id` is ignored.
+            chunk_size (int): unused; projects are placed one at a time.
+
+        Returns:
+            BatchResult: assigned `project_id` per input project (None where the
+            row was rejected, e.g. a duplicate title, with the reason in `errors`).
+        """
+        try:
+            ids: List[Optional[int]] = []
+            errors: Dict[int, str] = {}
+            with transaction():
+                for i, project in enumerate(projects):
+                    try:
+                        # each project in its own savepoint, like _execute_batch's per-row replay
+                        with transaction():
+                            ids.append(self.createProject(project.title).project_id)
+                    except _ROW_ERRORS as e:
+                        ids.append(None)
+                        errors[i] = str(e)
+            return BatchResult(ids=ids, errors=errors, affected=len(ids) - len(errors))
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def getProjectById(self, project_id: int) -> Optional[Project]:
+        """Retrieve a project by id from its shard.
+
+        Parameters:
+            project_id (int): primary key of the project to fetch.
+
+        Returns:
+            Optional[Project]: `Project` instance if found, otherwise `None`.
+        """
+        cached = self._cached(("id", project_id))
+        if cached is not None:
+            return cached
+        shard = self.router.shard_for_project(project_id)
+        if shard is None:
+            return None
+        with self.router.use(shard):
+            return super().getProjectById(project_id)
+
+    def getProjectByTitle(self, title: str) -> Optional[Project]:
+        """Retrieve a project by title from its shard.
+
+        Parameters:
+            title (str): title of the project to fetch.
+
+        Returns:
+            Optional[Project]: `Project` instance if found, otherwise `None`.
+        """
+        cached = self._cached(("title", title))
+        if cached is not None:
+            return cached
+        shard = self.router.shard_for_title(title)
+        if shard is None:
+            return None
+        with self.router.use(shard):
+            return super().getProjectByTitle(title)
+
+    def getAllProjects(self) -> List[Project]:
+        """List the projects of every shard, read in parallel, ordered by id.
+
+        Returns:
+            List[Project]: list of `Project` instances (empty list if none).
+        """
+        results = self.router.fan_out(lambda k: ProjectDAO.getAllProjects(self))
+        return self.router.merge(results, key=lambda p: p.project_id)
+
+    def updateProjectTitleById(self, project: Project) -> bool:
+        """Rename a project on its shard and in the directory.
+
+        Parameters:
+            project (Project): `Project` instance with `project_id` and new `title`.
+
+        Returns:
+            bool: True if a row was updated, False otherwise.
+        """
+        try:
+            shard = self.router.shard_for_project(project.project_id)
+            if shard is None:
+                return False
+            with transaction():
+                with self.router.use(shard):
+                    updated = super().updateProjectTitleById(project)
+                with self.router.use_directory(), _get_conn() as conn:
+                    conn.execute("UPDATE Shard_Directory SET title = ? WHERE project_id = ?", (project.title, project.project_id))
+            return updated
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def deleteProjectById(self, project_id: int) -> bool:
+        """Delete a project, with its todos, from its shard and the directory.
+
+        Parameters:
+            project_id (int): id of the project to delete.
+
+        Returns:
+            bool: True if a row was deleted, False otherwise.
+        """
+        try:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return False
+            with transaction():
+                with self.router.use(shard):
+                    deleted = super().deleteProjectById(project_id)
+                with self.router.use_directory(), _get_conn() as conn:
+                    conn.execute("DELETE FROM Shard_Directory WHERE project_id = ?", (project_id,))
+            return deleted
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def deleteProjectByTitle(self, title: str) -> bool:
+        """Delete a project by title.
+
+        Parameters:
+            title (str): title of the project to delete.
+
+        Returns:
+            bool: True if a row was deleted, False otherwise.
+        """
+        try:
+            project = self.getProjectByTitle(title)
+            if project is None:
+                return False
+            return self.deleteProjectById(project.project_id)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def purgeStep(self, chunk_size: int = PURGE_CHUNK_SIZE) -> Optional[PurgeProgress]:
+        """Purge the next chunk of a deleted project on the first shard that has one waiting.
+
+        Parameters:
+            chunk_size (int): most todos removed in this transaction.
+
+        Returns:
+            Optional[PurgeProgress]: the project worked on, after this chunk;
+            None if no shard has a deleted project waiting.
+        """
+        for k in range(self.router.shard_count):
+            with self.router.use(k):
+                progress = super().purgeStep(chunk_size)
+            if progress is not None:
+                return progress
+        return None
+
+    def getPurgeProgress(self) -> List[PurgeProgress]:
+        """List the deleted projects still being purged on every shard, ordered by id.
+
+        Returns:
+            List[PurgeProgress]: one entry per waiting project (empty list if none).
+        """
+        results = self.router.fan_out(lambda k: ProjectDAO.getPurgeProgress(self))
+        # each shard lists its own in purge order, not by id
+        return sorted((p for shard in results for p in shard), key=lambda p: p.project_id)
+
+    def incrementalVacuum(self, pages: int = 0) -> int:
+        """Return free pages of every shard file to the file system.
+
+        Parameters:
+            pages (int): most pages to release per shard; 0 releases every free page.
+
+        Returns:
+            int: number of pages released over all shards.
+        """
+        return sum(self.router.fan_out(lambda k: ProjectDAO.incrementalVacuum(self, pages)))
+
+    def moveProject(self, project_id: int, shard: int) -> Dict[int, int]:
+        """Move a project and its todos to another shard (see `ShardRouter.moveProject`).
+
+        Parameters:
+            project_id (int): id of the project to move.
+            shard (int): number of the destination shard.
+
+        Returns:
+            Dict[int, int]: old todo id -> new todo id.
+        """
+        try:
+            return self.router.moveProject(project_id, shard)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def shardStats(self) -> List[Dict[str, Any]]:
+        """Return the projects, todos and pool counters of every shard (see `ShardRouter.stats`)."""
+        return self.router.stats()
+
+    def getProjectStats(self, project_id: Optional[int] = None) -> List[ProjectStats]:
+        """Read todo counts per project from the Project_Stats summary of each shard.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only this project's counts are returned.
+
+        Returns:
+            List[ProjectStats]: counts ordered by project id.
+        """
+        if project_id is not None:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return []
+            with self.router.use(shard):
+                return super().getProjectStats(project_id)
+        results = self.router.fan_out(lambda k: ProjectDAO.getProjectStats(self))
+        return self.router.merge(results, key=lambda s: s.project_id)
+
+    def checkProjectStats(self, repair: bool = False) -> List[Dict[str, Any]]:
+        """Check (and optionally repair) the Project_Stats summary of every shard.
+
+        Parameters:
+            repair (bool): rebuild a shard's summary if any of its counts differ.
+
+        Returns:
+            List[Dict[str, Any]]: the differing projects of all shards (see
+            `ProjectDAO.checkProjectStats`), ordered by project id.
+        """
+        results = self.router.fan_out(lambda k: ProjectDAO.checkProjectStats(self, repair))
+        return self.router.merge(results, key=lambda d: d["project_id"])
+
+
+# entries cached inside a transaction() block may describe rows that were rolled back
+add_rollback_hook(ShardedProjectDAO.cache.clear)
@@ -0,0 +1,383 @@
+import heapq
+import sqlite3
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from DAO.TodoItemDAO import NEXT_LIMIT, SEARCH_LIMIT, TodoItemDAO
+from Models.BatchResult import BatchResult
+from Models.SearchResult import SearchResult
+from Models.TodoItem import TodoItem
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE, transaction
+from Utils.sharding import ShardRouter, get_router
+
+T = TypeVar("T")
+
+
+def _priority_order(item: TodoItem) -> Tuple[int, int]:
+    return (item.priority, item.todo_id)
+
+
+class ShardedTodoItemDAO(TodoItemDAO):
+    """`TodoItemDAO` over a sharded layout (see `Utils.sharding.ShardRouter`).
+
+    A todo lives on the shard of its project. Calls naming a project or a todo
+    are sent to that one shard (a todo id encodes its shard); calls over all
+    todos read every shard in parallel and merge the per-shard results, which
+    are already in (priority, todo_id) order, so the merged list is too. Bulk
+    calls are split into one call per shard.
+
+    Search results are merged by score, but bm25 scores are computed per
+    shard, so the ranking across shards is approximate.
+    """
+
+    def __init__(self, router: Optional[ShardRouter] = None):
+        """Initialize the DAO instance.
+
+        Parameters:
+            router (Optional[ShardRouter]): router to send calls through; the
+                process-wide one (see `get_router`) by default.
+        """
+        self.router = router or get_router()
+        if self.router is None:
+            raise ValueError("no shard router configured (set TODOLIST_SHARDS)")
+
+    def _project_shard(self, project_id: Optional[int]) -> int:
+        shard = self.router.shard_for_project(project_id) if project_id is not None else None
+        if shard is None:
+            # what the foreign key reports on an unsharded database
+            raise sqlite3.IntegrityError("FOREIGN KEY constraint failed")
+        return shard
+
+    def _by_shard(self, keys: List[Optional[int]], shard_of: Callable[[int], Optional[int]]) -> Dict[int, List[int]]:
+        """Group input positions by the shard of their key; positions with no shard are left out."""
+        groups: Dict[int, List[int]] = {}
+        for i, key in enumerate(keys):
+            shard = shard_of(key) if key is not None else None
+            if shard is not None:
+                groups.setdefault(shard, []).append(i)
+        return groups
+
+    def _batch(self, rows: List[T], keys: List[Optional[int]], shard_of: Callable[[int], Optional[int]],
+               call: Callable[[List[T]], BatchResult], missing: str) -> BatchResult:
+        """Run a bulk call once per shard and scatter the results back onto the input order."""
+        groups = self._by_shard(keys, shard_of)
+        placed = {i for positions in groups.values() for i in positions}
+        result = BatchResult(ids=[None] * len(rows),
+                             errors={i: missing for i in range(len(rows)) if i not in placed})
+        with transaction():
+            for shard, positions in sorted(groups.items()):
+                with self.router.use(shard):
+                    part = call([rows[i] for i in positions]).scatter(positions, len(rows), {})
+                for i in positions:
+                    result.ids[i] = part.ids[i]
+                result.errors.update(part.errors)
+                result.affected += part.affected
+        result.errors = dict(sorted(result.errors.items()))
+        return result
+
+    def _per_shard_ids(self, todo_ids: Iterable[int], call: Callable[[List[int]], int]) -> int:
+        ids = list(todo_ids)
+        groups = self._by_shard(ids, self.router.shard_for_todo)
+        with transaction():
+            total = 0
+            for shard, positions in sorted(groups.items()):
+                with self.router.use(shard):
+                    total += call([ids[i] for i in positions])
+        return total
+
+    def createTodoItem(self, item: TodoItem) -> Optional[TodoItem]:
+        """Insert a new todo item on its project's shard.
+
+        Parameters:
+            item (TodoItem): domain object containing todo fields. `todo_id` is ignored.
+
+        Returns:
+            Optional[TodoItem]: the created `TodoItem` with `todo_id` set if insertion succeeded, otherwise None.
+        """
+        with self.router.use(self._project_shard(item.project_id)):
+            return super().createTodoItem(item)
+
+    def getTodoItemById(self, todo_id: int) -> Optional[TodoItem]:
+        """Fetch a todo item by its id from the shard its id belongs to.
+
+        Parameters:
+            todo_id (int): primary key of the todo item.
+
+        Returns:
+            Optional[TodoItem]: `TodoItem` if found, otherwise `None`.
+        """
+        shard = self.router.shard_for_todo(todo_id)
+        if shard is None:
+            return None
+        with self.router.use(shard):
+            return super().getTodoItemById(todo_id)
+
+    def getAllTodoItemsByProjectId(self, project_id: int) -> List[TodoItem]:
+        """List a project's todo items from its shard.
+
+        Parameters:
+            project_id (int): id of the project.
+
+        Returns:
+            List[TodoItem]: list of `TodoItem` instances (may be empty).
+        """
+        shard = self.router.shard_for_project(project_id)
+        if shard is None:
+            return []
+        with self.router.use(shard):
+            return super().getAllTodoItemsByProjectId(project_id)
+
+    def getAllTodoItemsByProjectTitle(self, project_title: str) -> List[TodoItem]:
+        """List a project's todo items, by project title, from its shard.
+
+        Parameters:
+            project_title (str): title of the project to filter todos.
+        Returns:
+            List[TodoItem]: list of `TodoItem` instances (may be empty).
+        """
+        shard = self.router.shard_for_title(project_title)
+        if shard is None:
+            return []
+        with self.router.use(shard):
+            return super().getAllTodoItemsByProjectTitle(project_title)
+
+    def nextTodoItems(self, k: int = NEXT_LIMIT, project_id: Optional[int] = None, include_completed: bool = False) -> List[TodoItem]:
+        """Return the first `k` todos by priority: each shard's top `k`, merged.
+
+        Parameters:
+            k (int): maximum number of todos to return.
+            project_id (Optional[int]): if provided, only todos for this project are considered.
+            include_completed (bool): also consider completed todos.
+
+        Returns:
+            List[TodoItem]: up to `k` todos ordered by (priority, todo_id).
+        """
+        if project_id is not None:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return []
+            with self.router.use(shard):
+                return super().nextTodoItems(k, project_id, include_completed)
+        results = self.router.fan_out(lambda s: TodoItemDAO.nextTodoItems(self, k, None, include_completed))
+        return self.router.merge(results, key=_priority_order, limit=k)
+
+    def getAllTodoItems(self) -> List[TodoItem]:
+        """List the todo items of every shard, read in parallel, in (priority, todo_id) order.
+
+        Returns:
+            List[TodoItem]: list of `TodoItem` instances (may be empty).
+        """
+        results = self.router.fan_out(lambda s: TodoItemDAO.getAllTodoItems(self))
+        return self.router.merge(results, key=_priority_order)
+
+    def _routed_iter(self, shard: int, project_id: Optional[int], batch_size: int) -> Iterator[TodoItem]:
+        # the route is only needed while the first batch opens the cursor; it must
+        # not stay set while the caller runs between items
+        items = TodoItemDAO.iterTodoItems(self, project_id, batch_size)
+        with self.router.use(shard):
+            first = next(items, None)
+        if first is not None:
+            yield first
+            yield from items
+
+    def iterTodoItems(self, project_id: Optional[int] = None, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[TodoItem]:
+        """Stream todo items ordered by priority, merging one stream per shard.
+
+        Holds a connection to every shard until the iterator is exhausted or closed.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only todos for this project are yielded.
+            batch_size (int): rows fetched per round trip from each shard.
+
+        Returns:
+            Iterator[TodoItem]: todo items ordered by (priority, todo_id).
+        """
+        if project_id is not None:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return iter(())
+            return self._routed_iter(shard, project_id, batch_size)
+        streams = [self._routed_iter(k, None, batch_size) for k in range(self.router.shard_count)]
+        return heapq.merge(*streams, key=_priority_order)
+
+    def getTodoItemsPage(self, project_id: Optional[int] = None, after: Optional[Tuple[int, int]] = None, limit: int = 50) -> List[TodoItem]:
+        """Return one page of todo items using keyset pagination across shards.
+
+        Every shard returns its own next `limit` items after `after`, and the
+        merged page keeps the first `limit`, so pages line up with the
+        unsharded ones.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only todos for this project are returned.
+            after (Optional[Tuple[int, int]]): (priority, todo_id) to continue after; None for the first page.
+            limit (int): maximum number of items to return.
+
+        Returns:
+            List[TodoItem]: up to `limit` `TodoItem` instances (empty after the last page).
+        """
+        if project_id is not None:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return []
+            with self.router.use(shard):
+                return super().getTodoItemsPage(project_id, after, limit)
+        results = self.router.fan_out(lambda s: TodoItemDAO.getTodoItemsPage(self, None, after, limit))
+        return self.router.merge(results, key=_priority_order, limit=limit)
+
+    def searchTodoItems(self, query: str, project_id: Optional[int] = None, limit: int = SEARCH_LIMIT) -> List[SearchResult]:
+        """Full-text search over every shard (or the project's shard), best matches first.
+
+        Parameters:
+            query (str): free-text search terms.
+            project_id (Optional[int]): if provided, only todos for this project are returned.
+            limit (int): maximum number of results.
+
+        Returns:
+            List[SearchResult]: best matches first, each with a highlighted snippet (may be empty).
+        """
+        if project_id is not None:
+            shard = self.router.shard_for_project(project_id)
+            if shard is None:
+                return []
+            with self.router.use(shard):
+                return super().searchTodoItems(query, project_id, limit)
+        results = self.router.fan_out(lambda s: TodoItemDAO.searchTodoItems(self, query, None, limit))
+        return self.router.merge(results, key=lambda r: r.score, limit=limit)
+
+    def updateTodoItemById(self, item: TodoItem) -> bool:
+        """Update an existing todo item on its shard.
+
+        Parameters:
+            item (TodoItem): `TodoItem` with `todo_id` set and updated fields.
+
+        Returns:
+            bool: True if a row was updated, False otherwise.
+
+        Raises:
+            ValueError: if `item.project_id` names a project on another shard
+            (move the project with `ShardRouter.moveProject` instead).
+        """
+        shard = self.router.shard_for_todo(item.todo_id)
+        if shard is None:
+            return False
+        if self._project_shard(item.project_id) != shard:
+            raise ValueError("a todo cannot be moved to a project on another shard")
+        with self.router.use(shard):
+            return super().updateTodoItemById(item)
+
+    def deleteTodoItemById(self, todo_id: int) -> bool:
+        """Delete a todo item by id from its shard.
+
+        Parameters:
+            todo_id (int): id of the todo to delete.
+
+        Returns:
+            bool: True if a row was deleted, False otherwise.
+        """
+        shard = self.router.shard_for_todo(todo_id)
+        if shard is None:
+            return False
+        with self.router.use(shard):
+            return super().deleteTodoItemById(todo_id)
+
+    def createTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Insert many todo items, one batch per shard, in a single transaction block.
+
+        Parameters:
+            items (Iterable[TodoItem]): todos to insert. `todo_id` is ignored.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: assigned `todo_id` per input item (None where the row was
+            rejected, with the reason in `errors`).
+        """
+        items = list(items)
+        return self._batch(items, [t.project_id for t in items], self.router.shard_for_project,
+                           lambda part: TodoItemDAO.createTodoItems(self, part, chunk_size),
+                           "FOREIGN KEY constraint failed")
+
+    def updateTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Update many existing todo items, one batch per shard, in a single transaction block.
+
+        Items whose `project_id` is on another shard than the todo are rejected.
+
+        Parameters:
+            items (Iterable[TodoItem]): todos with `todo_id` set and updated fields.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: `todo_id` per input item (None where the row was rejected)
+            and the number of rows actually updated in `affected`.
+        """
+        items = list(items)
+        project_shards = {t.project_id: self.router.shard_for_project(t.project_id)
+                          for t in items if t.project_id is not None}
+        keys = [t.todo_id if t.todo_id is not None and self.router.shard_for_todo(t.todo_id) == project_shards.get(t.project_id)
+                else None for t in items]
+        return self._batch(items, keys, self.router.shard_for_todo,
+                           lambda part: TodoItemDAO.updateTodoItems(self, part, chunk_size),
+                           "todo and project are on different shards")
+
+    def deleteTodoItemsByIds(self, todo_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Delete many todo items, one batch per shard, in a single transaction block.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to delete.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: the requested ids and the number of rows deleted in `affected`.
+        """
+        todo_ids = list(todo_ids)
+        result = self._batch(todo_ids, todo_ids, self.router.shard_for_todo,
+                             lambda part: TodoItemDAO.deleteTodoItemsByIds(self, part, chunk_size), "")
+        # like the unsharded DAO, an unknown id is not an error
+        result.ids, result.errors = todo_ids, {i: e for i, e in result.errors.items() if e}
+        return result
+
+    def completeTodoItems(self, todo_ids: Iterable[int], completed: bool = True,
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Mark many todo items completed (or open again), one statement per shard.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to change.
+            completed (bool): the state to set.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos whose state changed.
+        """
+        return self._per_shard_ids(todo_ids, lambda part: TodoItemDAO.completeTodoItems(self, part, completed, chunk_size))
+
+    def setPriority(self, todo_ids: Iterable[int], priority: int, chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Set the priority of many todo items, one statement per shard.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to change.
+            priority (int): the new priority.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos whose priority changed.
+        """
+        return self._per_shard_ids(todo_ids, lambda part: TodoItemDAO.setPriority(self, part, priority, chunk_size))
+
+    def moveToProject(self, todo_ids: Iterable[int], project_id: int, chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Move many todo items to another project on the same shard.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to move.
+            project_id (int): id of the destination project.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos moved.
+
+        Raises:
+            ValueError: if any of the todos is on another shard than the project.
+        """
+        todo_ids = list(todo_ids)
+        shard = self._project_shard(project_id)
+        if any(self.router.shard_for_todo(t) not in (shard, None) for t in todo_ids):
+            raise ValueError("todos cannot be moved to a project on another shard")
+        with self.router.use(shard):
+            return super().moveToProject(todo_ids, project_id, chunk_size)
@@ -1,7 +1,66 @@
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+from Models.BatchResult import BatchResult
+from Models.SearchResult import SearchResult
 from Models.TodoItem import TodoItem
-from Utils.db_connection import _get_conn
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE, _chunks, _execute_as, _execute_batch, _get_conn
+from Utils.migrations import LIVE_PROJECT
+
+# select list matching TodoItem.COLUMNS, consumed by TodoItem.row_factory; the
+# title comes from the owning project, joined on its primary key; todos of a
+# project that is being purged (see ProjectDAO.deleteProjectById) are skipped
+_COLUMNS = ", ".join("p.title" if c == "title" else "ti." + c for c in TodoItem.COLUMNS)
+_FROM = f"Todo_Item ti JOIN Project p ON p.project_id = ti.project_id AND {LIVE_PROJECT}"
+
+# bm25 column weights for Todo_Search (description, title): a hit in the
+# description counts for more than a hit in the project title
+_SEARCH_WEIGHTS = (4.0, 1.0)
+SEARCH_LIMIT = 20
+
+# todos returned by nextTodoItems when no count is given
+NEXT_LIMIT = 10
+
+
+def _match_expression(query: str) -> str:
+    """Turn free text into an FTS5 query that ANDs every term.
+
+    Each term is quoted so FTS5 operators and punctuation typed by the user are
+    matched literally instead of raising a syntax error; a trailing `*` is kept
+    as a prefix search.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '""')
+        if word:
+            terms.append(f'"{word}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _search_row(cursor, row: tuple) -> SearchResult:
+    # TodoItem.COLUMNS followed by the snippet and the bm25 score
+    return SearchResult(TodoItem.row_factory(cursor, row[:-2]), row[-2], row[-1])
+
+
+def _update_in(column: str, value, todo_ids: Iterable[int], chunk_size: int) -> int:
+    """Set `column` to `value` on every listed todo with one `UPDATE ... IN (...)` per chunk of ids.
+
+    Rows that already hold `value` are not rewritten. Chunks share one
+    transaction, and `chunk_size` keeps each statement under SQLite's bound
+    parameter limit.
+    """
+    ids = sorted(set(todo_ids))
+    affected = 0
+    with _get_conn() as conn:
+        if len(ids) > chunk_size and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        for chunk in _chunks(ids, chunk_size):
+            sql = (
+                f"UPDATE Todo_Item SET {column} = ? "
+                f"WHERE todo_id IN ({', '.join('?' * len(chunk))}) AND {column} IS NOT ?"
+            )
+            affected += conn.execute(sql, (value, *chunk, value)).rowcount
+    return affected
 
 
 class TodoItemDAO:
@@ -25,8 +84,8 @@ class TodoItemDAO:
         """
         try:
             sql = (
-                "INSERT INTO Todo_Item (description, priority, completed, title, project_id) "
-                "VALUES (?, ?, ?, ?, ?)"
+                "INSERT INTO Todo_Item (description, priority, completed, project_id) "
+                "VALUES (?, ?, ?, ?)"
             )
             with _get_conn() as conn:
                 cur = conn.execute(sql, item.to_tuple_for_insert())
@@ -53,12 +112,9 @@ class TodoItemDAO:
             Optional[TodoItem]: `TodoItem` if found, otherwise `None`.
         """
         try:
-            sql = "SELECT todo_id, title, description, priority, completed, project_id, created_at FROM Todo_Item WHERE todo_id = ?"
+            sql = f"SELECT {_COLUMNS} FROM {_FROM} WHERE ti.todo_id = ?"
             with _get_conn() as conn:
-                cur = conn.execute(sql, (todo_id,))
-                row = cur.fetchone()
-                if row:
-                    return TodoItem.from_row(dict(row))
+                return _execute_as(conn, TodoItem.row_factory, sql, (todo_id,)).fetchone()
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return None
@@ -73,15 +129,46 @@ class TodoItemDAO:
             List[TodoItem]: list of `TodoItem` instances (may be empty).
         """
         try:
-            sql = "SELECT todo_id, title, description, priority, completed, project_id, created_at FROM Todo_Item WHERE project_id = ? ORDER BY priority ASC"
+            sql = f"SELECT {_COLUMNS} FROM {_FROM} WHERE ti.project_id = ? ORDER BY ti.priority ASC, ti.todo_id ASC"
             params = (project_id,)
             with _get_conn() as conn:
-                cur = conn.execute(sql, params)
-                return [TodoItem.from_row(dict(r)) for r in cur.fetchall()]
+                return _execute_as(conn, TodoItem.row_factory, sql, params).fetchall()
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return []
     
+    def nextTodoItems(self, k: int = NEXT_LIMIT, project_id: Optional[int] = None, include_completed: bool = False) -> List[TodoItem]:
+        """Return the first `k` todos by priority, oldest first within a priority.
+
+        Todo_Item drives the join and every filter combination has an index
+        ending in (priority, todo_id), so SQLite walks the index in order and
+        stops after `k` rows; the cost does not grow with the table.
+
+        Parameters:
+            k (int): maximum number of todos to return.
+            project_id (Optional[int]): if provided, only todos for this project are considered.
+            include_completed (bool): also consider completed todos.
+
+        Returns:
+            List[TodoItem]: up to `k` todos ordered by (priority, todo_id).
+        """
+        try:
+            where, params = [], []
+            if project_id is not None:
+                where.append("ti.project_id = ?")
+                params.append(project_id)
+            if not include_completed:
+                where.append("ti.completed = 0")
+            sql = f"SELECT {_COLUMNS} FROM Todo_Item ti CROSS JOIN Project p ON p.project_id = ti.project_id AND {LIVE_PROJECT}"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += " ORDER BY ti.priority ASC, ti.todo_id ASC LIMIT ?"
+            params.append(k)
+            with _get_conn() as conn:
+                return _execute_as(conn, TodoItem.row_factory, sql, params).fetchall()
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
     def getAllTodoItemsByProjectTitle(self, project_title: str) -> List[TodoItem]:
         """List todo items, filtered by project title.
 
@@ -91,11 +178,10 @@ class TodoItemDAO:
             List[TodoItem]: list of `TodoItem` instances (may be empty).
         """
         try:
-            sql = "SELECT ti.todo_id, ti.title, ti.description, ti.priority, ti.completed, ti.project_id, ti.title FROM Todo_Item ti JOIN Project p ON ti.project_id = p.project_id WHERE p.title = ? ORDER BY ti.priority ASC"
+            sql = f"SELECT {_COLUMNS} FROM {_FROM} WHERE p.title = ? ORDER BY ti.priority ASC, ti.todo_id ASC"
             params = (project_title,)
             with _get_conn() as conn:
-                cur = conn.execute(sql, params)
-                return [TodoItem.from_row(dict(r)) for r in cur.fetchall()]
+                return _execute_as(conn, TodoItem.row_factory, sql, params).fetchall()
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return []
@@ -109,10 +195,117 @@ class TodoItemDAO:
             List[TodoItem]: list of `TodoItem` instances (may be empty).
         """
         try:
-            sql = "SELECT todo_id, description, priority, completed, project_id, title FROM Todo_Item ORDER BY priority ASC"
+            sql = f"SELECT {_COLUMNS} FROM {_FROM} ORDER BY ti.priority ASC, ti.todo_id ASC"
+            with _get_conn() as conn:
+                return _execute_as(conn, TodoItem.row_factory, sql).fetchall()
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+        return []
+
+    def iterTodoItems(self, project_id: Optional[int] = None, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[TodoItem]:
+        """Stream todo items ordered by priority without materialising the result.
+
+        Rows are pulled from the cursor `batch_size` at a time, so memory use is
+        bounded by the batch size and the first item is available as soon as the
+        first batch arrives. The pooled connection is held until the generator is
+        exhausted or closed.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only todos for this project are yielded.
+            batch_size (int): rows fetched per round trip.
+
+        Returns:
+            Iterator[TodoItem]: todo items ordered by (priority, todo_id).
+        """
+        try:
+            sql = f"SELECT {_COLUMNS} FROM {_FROM}"
+            params: tuple = ()
+            if project_id is not None:
+                sql += " WHERE ti.project_id = ?"
+                params = (project_id,)
+            sql += " ORDER BY ti.priority ASC, ti.todo_id ASC"
+            with _get_conn() as conn:
+                cur = _execute_as(conn, TodoItem.row_factory, sql, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def getTodoItemsPage(self, project_id: Optional[int] = None, after: Optional[Tuple[int, int]] = None, limit: int = 50) -> List[TodoItem]:
+        """Return one page of todo items using keyset pagination.
+
+        Pages are ordered by (priority, todo_id); pass the (priority, todo_id) of
+        the last item of a page as `after` to get the next one. Unlike OFFSET,
+        each page costs the same no matter how deep into the list it is.
+
+        Parameters:
+            project_id (Optional[int]): if provided, only todos for this project are returned.
+            after (Optional[Tuple[int, int]]): (priority, todo_id) to continue after; None for the first page.
+            limit (int): maximum number of items to return.
+
+        Returns:
+            List[TodoItem]: up to `limit` `TodoItem` instances (empty after the last page).
+        """
+        try:
+            clauses = []
+            params: list = []
+            if project_id is not None:
+                clauses.append("ti.project_id = ?")
+                params.append(project_id)
+            if after is not None:
+                clauses.append("(ti.priority, ti.todo_id) > (?, ?)")
+                params.extend(after)
+            sql = f"SELECT {_COLUMNS} FROM {_FROM}"
+            if clauses:
+                sql += " WHERE " + " AND ".join(clauses)
+            sql += " ORDER BY ti.priority ASC, ti.todo_id ASC LIMIT ?"
+            params.append(limit)
+            with _get_conn() as conn:
+                return _execute_as(conn, TodoItem.row_factory, sql, params).fetchall()
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+        return []
+
+    def searchTodoItems(self, query: str, project_id: Optional[int] = None, limit: int = SEARCH_LIMIT) -> List[SearchResult]:
+        """Full-text search over todo descriptions and project titles.
+
+        Uses the `Todo_Search` FTS5 index, so the cost depends on the number of
+        matches rather than the number of todos. Every term must match; a term
+        ending in `*` matches as a prefix.
+
+        Parameters:
+            query (str): free-text search terms.
+            project_id (Optional[int]): if provided, only todos for this project are returned.
+            limit (int): maximum number of results.
+
+        Returns:
+            List[SearchResult]: best matches first, each with a highlighted snippet (may be empty).
+        """
+        try:
+            match = _match_expression(query)
+            if not match:
+                return []
+            weights = ", ".join(str(w) for w in _SEARCH_WEIGHTS)
+            sql = (
+                f"SELECT {_COLUMNS}, snippet(Todo_Search, 0, '[', ']', '...', 12), bm25(Todo_Search, {weights}) AS score "
+                # CROSS JOIN pins the join order: resolve the MATCH in the FTS
+                # index first, then look each hit up by primary key
+                "FROM Todo_Search CROSS JOIN Todo_Item ti ON ti.todo_id = Todo_Search.rowid "
+                f"CROSS JOIN Project p ON p.project_id = ti.project_id AND {LIVE_PROJECT} "
+                "WHERE Todo_Search MATCH ?"
+            )
+            params: list = [match]
+            if project_id is not None:
+                # unary + keeps the planner on the primary key lookup per hit
+                sql += " AND +ti.project_id = ?"
+                params.append(project_id)
+            sql += " ORDER BY score LIMIT ?"
+            params.append(limit)
             with _get_conn() as conn:
-                cur = conn.execute(sql)
-                return [TodoItem.from_row(dict(r)) for r in cur.fetchall()]
+                return _execute_as(conn, _search_row, sql, params).fetchall()
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return []
@@ -128,7 +321,7 @@ class TodoItemDAO:
         """
         try:
             sql = (
-                "UPDATE Todo_Item SET description = ?, priority = ?, completed = ?, title = ?, project_id = ? WHERE todo_id = ?"
+                "UPDATE Todo_Item SET description = ?, priority = ?, completed = ?, project_id = ? WHERE todo_id = ?"
             )
             with _get_conn() as conn:
                 cur = conn.execute(sql, item.to_tuple_for_update())
@@ -154,4 +347,118 @@ class TodoItemDAO:
         except Exception as e:
             raise e.with_traceback(e.__traceback__)
         return False
-    
\ No newline at end of file
+
+    def createTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Insert many todo items in a single transaction.
+
+        Parameters:
+            items (Iterable[TodoItem]): todos to insert. `todo_id` is ignored.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: assigned `todo_id` per input item (None where the row was
+            rejected, with the reason in `errors`).
+        """
+        try:
+            sql = (
+                "INSERT INTO Todo_Item (description, priority, completed, project_id) "
+                "VALUES (?, ?, ?, ?)"
+            )
+            with _get_conn() as conn:
+                ids, errors, affected = _execute_batch(
+                    conn, sql, (item.to_tuple_for_insert() for item in items), chunk_size
+                )
+                return BatchResult(ids=ids, errors=errors, affected=affected)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def updateTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Update many existing todo items in a single transaction.
+
+        Parameters:
+            items (Iterable[TodoItem]): todos with `todo_id` set and updated fields.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: `todo_id` per input item (None where the row was rejected)
+            and the number of rows actually updated in `affected`.
+        """
+        try:
+            sql = (
+                "UPDATE Todo_Item SET description = ?, priority = ?, completed = ?, project_id = ? WHERE todo_id = ?"
+            )
+            with _get_conn() as conn:
+                ids, errors, affected = _execute_batch(
+                    conn, sql, (item.to_tuple_for_update() for item in items), chunk_size, key_index=4
+                )
+                return BatchResult(ids=ids, errors=errors, affected=affected)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def deleteTodoItemsByIds(self, todo_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """Delete many todo items in a single transaction.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to delete.
+            chunk_size (int): rows sent per `executemany` call.
+
+        Returns:
+            BatchResult: the requested ids and the number of rows deleted in `affected`.
+        """
+        try:
+            sql = "DELETE FROM Todo_Item WHERE todo_id = ?"
+            with _get_conn() as conn:
+                ids, errors, affected = _execute_batch(conn, sql, ((todo_id,) for todo_id in todo_ids), chunk_size, key_index=0)
+                return BatchResult(ids=ids, errors=errors, affected=affected)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def completeTodoItems(self, todo_ids: Iterable[int], completed: bool = True,
+                          chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Mark many todo items completed (or open again) in a single statement.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to change.
+            completed (bool): the state to set.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos whose state changed; unknown ids and todos
+            already in that state are not counted.
+        """
+        try:
+            return _update_in("completed", 1 if completed else 0, todo_ids, chunk_size)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def setPriority(self, todo_ids: Iterable[int], priority: int, chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Set the priority of many todo items in a single statement.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to change.
+            priority (int): the new priority.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos whose priority changed.
+        """
+        try:
+            return _update_in("priority", priority, todo_ids, chunk_size)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
+
+    def moveToProject(self, todo_ids: Iterable[int], project_id: int, chunk_size: int = BATCH_CHUNK_SIZE) -> int:
+        """Move many todo items to another project in a single statement.
+
+        Parameters:
+            todo_ids (Iterable[int]): ids of the todos to move.
+            project_id (int): id of the destination project.
+            chunk_size (int): ids bound per `IN (...)` list.
+
+        Returns:
+            int: number of todos moved.
+        """
+        try:
+            return _update_in("project_id", project_id, todo_ids, chunk_size)
+        except Exception as e:
+            raise e.with_traceback(e.__traceback__)
@@ -0,0 +1,43 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a bulk DAO or service call.
+
+    `ids` has one entry per input row, in input order: the assigned id for
+    inserts, the row id for updates/deletes, or None if that row failed.
+    `errors` maps the input index of each failed row to its error message.
+    `affected` is the total number of rows the database changed.
+    """
+    ids: List[Optional[int]] = field(default_factory=list)
+    errors: Dict[int, str] = field(default_factory=dict)
+    affected: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def scatter(self, positions: List[int], size: int, rejected: Dict[int, str]) -> "BatchResult":
+        """Map a result computed over a subset of the input back onto the full input.
+
+        Parameters:
+            positions (List[int]): input index of each row this result covers.
+            size (int): number of rows in the full input.
+            rejected (Dict[int, str]): input index -> reason for rows that were
+                filtered out before reaching the database.
+
+        Returns:
+            BatchResult: result indexed by position in the full input.
+        """
+        ids: List[Optional[int]] = [None] * size
+        errors = dict(rejected)
+        for sub_index, position in enumerate(positions):
+            ids[position] = self.ids[sub_index]
+            if sub_index in self.errors:
+                errors[position] = self.errors[sub_index]
+        return BatchResult(ids=ids, errors=dict(sorted(errors.items())), affected=self.affected)
+
+    def __str__(self) -> str:
+        return f"BatchResult(rows={len(self.ids)}, affected={self.affected}, errors={len(self.errors)})"
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Change:
+    """The net change of one row since a consumer's cursor.
+
+    `op` is `upsert` (the row exists; `data` holds its current state, as
+    `Project.to_dict()` or `TodoItem.to_dict()`) or `delete` (the row is gone
+    and `data` is None). `seq` is the change log entry the change was last
+    recorded at.
+    """
+    seq: int
+    entity: str
+    op: str
+    row_id: int
+    data: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"seq": self.seq, "entity": self.entity, "op": self.op, "row_id": self.row_id, "data": self.data}
+
+
+@dataclass
+class ChangeSet:
+    """One page of changes returned by `changesSince`.
+
+    Pass `cursor` as the next call's `seq`. `has_more` is set while further
+    entries are waiting. `reset` is set when the log no longer reaches back to
+    the requested seq: the consumer must reload everything (e.g. with
+    `getAllTodoItems`) and then continue from `cursor`.
+    """
+    changes: List[Change] = field(default_factory=list)
+    cursor: int = 0
+    has_more: bool = False
+    reset: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "changes": [c.to_dict() for c in self.changes],
+            "cursor": self.cursor,
+            "has_more": self.has_more,
+            "reset": self.reset,
+        }
@@ -1,11 +1,27 @@
-from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 
 
-@dataclass
 class Project:
-    project_id: Optional[int]
-    title: str
+    """A project grouping todo items. Slotted to keep instances small."""
+
+    __slots__ = ("project_id", "title")
+
+    # column order expected by `row_factory`
+    COLUMNS: Tuple[str, ...] = ("project_id", "title")
+
+    def __init__(self, project_id: Optional[int], title: str):
+        self.project_id = project_id
+        self.title = title
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return (self.project_id, self.title) == (other.project_id, other.title)
+
+    __hash__ = None  # mutable, like the dataclass it replaces
+
+    def __repr__(self) -> str:
+        return f"Project(project_id={self.project_id!r}, title={self.title!r})"
 
     def to_dict(self) -> Dict[str, Any]:
         return {"project_id": self.project_id, "title": self.title}
@@ -14,5 +30,10 @@ class Project:
     def from_row(cls, row: Dict[str, Any]) -> "Project":
         return cls(project_id=row.get("project_id"), title=row.get("title") or "")
 
+    @staticmethod
+    def row_factory(cursor, row: tuple) -> "Project":
+        """sqlite3 row factory building a `Project` from a `(project_id, title)` tuple."""
+        return Project(row[0], row[1] or "")
+
     def __str__(self) -> str:
         return f"Project(id={self.project_id}, title={self.title})"
@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple
+
+
+@dataclass
+class ProjectStats:
+    """Todo counts for one project, read from the Project_Stats summary.
+
+    `by_priority` holds the number of todos at priority 1 to 5, in that order.
+    """
+    project_id: int
+    title: str
+    total: int = 0
+    completed: int = 0
+    by_priority: Tuple[int, int, int, int, int] = (0, 0, 0, 0, 0)
+
+    @property
+    def open(self) -> int:
+        return self.total - self.completed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "title": self.title,
+            "total": self.total,
+            "open": self.open,
+            "completed": self.completed,
+            "by_priority": {str(n): count for n, count in enumerate(self.by_priority, 1)},
+        }
+
+    @staticmethod
+    def row_factory(cursor, row: tuple) -> "ProjectStats":
+        """sqlite3 row factory for `(project_id, title, total, completed, p1, ..., p5)` tuples."""
+        return ProjectStats(row[0], row[1] or "", row[2], row[3], tuple(row[4:9]))
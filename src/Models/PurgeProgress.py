@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+from typing import Any, Dict
+
+
+@dataclass
+class PurgeProgress:
+    """How far the background deletion of one project has got.
+
+    `todos` is the number of todos the project had when it was deleted and
+    `purged` the number removed since. `done` is set once the project row
+    itself is gone.
+    """
+    project_id: int
+    title: str
+    todos: int = 0
+    purged: int = 0
+    done: bool = False
+
+    @property
+    def remaining(self) -> int:
+        return max(self.todos - self.purged, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "project_id": self.project_id,
+            "title": self.title,
+            "todos": self.todos,
+            "purged": self.purged,
+            "remaining": self.remaining,
+            "done": self.done,
+        }
+
+    @staticmethod
+    def row_factory(cursor, row: tuple) -> "PurgeProgress":
+        """sqlite3 row factory for `(project_id, title, todos, purged)` tuples."""
+        return PurgeProgress(row[0], row[1], row[2], row[3])
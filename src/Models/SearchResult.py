@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+
+from Models.TodoItem import TodoItem
+
+
+@dataclass
+class SearchResult:
+    """One full-text search hit.
+
+    `snippet` is an excerpt of the matching description with the matched
+    terms wrapped in brackets. `score` is the bm25 relevance; lower is better.
+    """
+    item: TodoItem
+    snippet: str
+    score: float
+
+    def __str__(self) -> str:
+        return f"SearchResult(todo_id={self.item.todo_id}, score={self.score:.3f}, snippet={self.snippet!r})"
@@ -0,0 +1,36 @@
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class TransferResult:
+    """Outcome of an import or export.
+
+    `rows` is the number of records read (import) or written (export).
+    `written` counts the rows stored by an import. `skipped` counts rows that
+    were already present, such as a project whose title exists. `errors` maps
+    the line number of each rejected row to the reason it was rejected.
+    """
+    rows: int = 0
+    written: int = 0
+    skipped: int = 0
+    errors: Dict[int, str] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "rows": self.rows,
+            "written": self.written,
+            "skipped": self.skipped,
+            "errors": {str(line): reason for line, reason in self.errors.items()},
+            "seconds": round(self.seconds, 6),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
@@ -1,9 +1,17 @@
 -- TODO Remove before submission
+DROP TABLE IF EXISTS Project_Purge;
+DROP TABLE IF EXISTS Change_Log_Meta;
+DROP TABLE IF EXISTS Change_Log;
+DROP TABLE IF EXISTS Todo_Search;
+DROP TABLE IF EXISTS Project_Stats;
 DROP TABLE IF EXISTS Todo_Item;
 DROP TABLE IF EXISTS Project;
 
 -- SQLite schema for Todo List application
 PRAGMA foreign_keys = ON;
+-- free pages are returned to the file system by PRAGMA incremental_vacuum;
+-- only takes effect while the database is still empty
+PRAGMA auto_vacuum = INCREMENTAL;
 
 -- Projects table: stores categories/projects for todo items
 -- It is not good practice to have ON DELETE CASCADE on non-PRIMARY KEY fields, so it has been removed to avoid syntax errors.
@@ -12,34 +20,188 @@ CREATE TABLE IF NOT EXISTS Project (
 	title TEXT NOT NULL UNIQUE
 );
 
--- Todo_Item table: tasks belonging (optionally) to a project
+-- Todo_Item table: tasks belonging to a project; the project title is joined in on read
 CREATE TABLE IF NOT EXISTS Todo_Item (
 	todo_id INTEGER PRIMARY KEY AUTOINCREMENT,
 	description TEXT NOT NULL,
 	priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5),
-	completed TEXT NOT NULL CHECK (completed IN ('yes', 'no')),
+	completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)),
 	project_id INTEGER NOT NULL,
+	FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE
+);
+
+-- Projects being deleted in the background: hidden from every read at once,
+-- their todos purged in chunks; the Project row keeps a placeholder title
+CREATE TABLE IF NOT EXISTS Project_Purge (
+	project_id INTEGER PRIMARY KEY REFERENCES Project(project_id) ON DELETE CASCADE,
 	title TEXT NOT NULL,
-	FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE,
-	FOREIGN KEY (title) REFERENCES Project(title) ON DELETE CASCADE
+	todos INTEGER NOT NULL,
+	purged INTEGER NOT NULL DEFAULT 0,
+	requested_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+
+-- Helpful indexes for queries; each ends in todo_id so ORDER BY priority, todo_id needs no sort
+CREATE INDEX IF NOT EXISTS idx_todo_project_priority ON Todo_Item(project_id, priority, todo_id);
+CREATE INDEX IF NOT EXISTS idx_todo_project_open ON Todo_Item(project_id, completed, priority, todo_id);
+CREATE INDEX IF NOT EXISTS idx_todo_priority ON Todo_Item(priority, todo_id);
+CREATE INDEX IF NOT EXISTS idx_todo_open_priority ON Todo_Item(completed, priority, todo_id);
+
+-- Full-text search over todo descriptions and project titles (rowid = todo_id),
+-- kept in sync with Todo_Item and project renames by the triggers below
+CREATE VIRTUAL TABLE IF NOT EXISTS Todo_Search USING fts5(
+	description, title, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_search_insert AFTER INSERT ON Todo_Item BEGIN
+	INSERT INTO Todo_Search (rowid, description, title)
+	VALUES (new.todo_id, new.description, (SELECT title FROM Project WHERE project_id = new.project_id));
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_search_update AFTER UPDATE OF description, project_id ON Todo_Item BEGIN
+	UPDATE Todo_Search
+	SET description = new.description, title = (SELECT title FROM Project WHERE project_id = new.project_id)
+	WHERE rowid = new.todo_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_search_delete AFTER DELETE ON Todo_Item BEGIN
+	DELETE FROM Todo_Search WHERE rowid = old.todo_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_search_rename AFTER UPDATE OF title ON Project
+WHEN new.project_id NOT IN (SELECT project_id FROM Project_Purge) BEGIN
+	UPDATE Todo_Search SET title = new.title
+	WHERE rowid IN (SELECT todo_id FROM Todo_Item WHERE project_id = new.project_id);
+END;
+
+-- Per-project counters (all todos, completed todos, todos per priority),
+-- kept current by the triggers below so summaries read one row per project
+CREATE TABLE IF NOT EXISTS Project_Stats (
+	project_id INTEGER PRIMARY KEY,
+	total INTEGER NOT NULL DEFAULT 0,
+	completed INTEGER NOT NULL DEFAULT 0,
+	p1 INTEGER NOT NULL DEFAULT 0,
+	p2 INTEGER NOT NULL DEFAULT 0,
+	p3 INTEGER NOT NULL DEFAULT 0,
+	p4 INTEGER NOT NULL DEFAULT 0,
+	p5 INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_project_stats_create AFTER INSERT ON Project BEGIN
+	INSERT OR REPLACE INTO Project_Stats (project_id) VALUES (new.project_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_stats_drop AFTER DELETE ON Project BEGIN
+	DELETE FROM Project_Stats WHERE project_id = old.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_stats_insert AFTER INSERT ON Todo_Item BEGIN
+	UPDATE Project_Stats SET total = total + 1,
+		completed = completed + new.completed,
+		p1 = p1 + (new.priority = 1),
+		p2 = p2 + (new.priority = 2),
+		p3 = p3 + (new.priority = 3),
+		p4 = p4 + (new.priority = 4),
+		p5 = p5 + (new.priority = 5)
+	WHERE project_id = new.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_stats_delete AFTER DELETE ON Todo_Item BEGIN
+	UPDATE Project_Stats SET total = total - 1,
+		completed = completed - old.completed,
+		p1 = p1 - (old.priority = 1),
+		p2 = p2 - (old.priority = 2),
+		p3 = p3 - (old.priority = 3),
+		p4 = p4 - (old.priority = 4),
+		p5 = p5 - (old.priority = 5)
+	WHERE project_id = old.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_stats_update AFTER UPDATE OF completed, priority, project_id ON Todo_Item BEGIN
+	UPDATE Project_Stats SET total = total - 1,
+		completed = completed - old.completed,
+		p1 = p1 - (old.priority = 1),
+		p2 = p2 - (old.priority = 2),
+		p3 = p3 - (old.priority = 3),
+		p4 = p4 - (old.priority = 4),
+		p5 = p5 - (old.priority = 5)
+	WHERE project_id = old.project_id;
+	UPDATE Project_Stats SET total = total + 1,
+		completed = completed + new.completed,
+		p1 = p1 + (new.priority = 1),
+		p2 = p2 + (new.priority = 2),
+		p3 = p3 + (new.priority = 3),
+		p4 = p4 + (new.priority = 4),
+		p5 = p5 + (new.priority = 5)
+	WHERE project_id = new.project_id;
+END;
+
+-- Append-only log of row changes for incremental sync (changesSince), fed by
+-- the triggers below; seq only grows, so a consumer resumes from its last seq
+CREATE TABLE IF NOT EXISTS Change_Log (
+	seq INTEGER PRIMARY KEY AUTOINCREMENT,
+	entity TEXT NOT NULL CHECK (entity IN ('project', 'todo')),
+	op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+	row_id INTEGER NOT NULL,
+	changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+);
+
+CREATE INDEX IF NOT EXISTS idx_change_log_row ON Change_Log(entity, row_id, seq);
+
+-- pruned_through: highest seq dropped by retention; older cursors must resync
+CREATE TABLE IF NOT EXISTS Change_Log_Meta (
+	key TEXT PRIMARY KEY,
+	value INTEGER NOT NULL
 );
 
--- Helpful indexes for queries
-CREATE INDEX IF NOT EXISTS idx_todo_project ON Todo_Item(project_id);
-CREATE INDEX IF NOT EXISTS idx_todo_priority ON Todo_Item(priority);
+CREATE TRIGGER IF NOT EXISTS trg_project_log_insert AFTER INSERT ON Project BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'insert', new.project_id);
+END;
+
+-- a rename changes the title every todo of the project is read with
+CREATE TRIGGER IF NOT EXISTS trg_project_log_update AFTER UPDATE OF title ON Project
+WHEN old.title IS NOT new.title AND new.project_id NOT IN (SELECT project_id FROM Project_Purge) BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'update', new.project_id);
+	INSERT INTO Change_Log (entity, op, row_id)
+	SELECT 'todo', 'update', todo_id FROM Todo_Item WHERE project_id = new.project_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_log_delete AFTER DELETE ON Project BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'delete', old.project_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_project_purge_log AFTER INSERT ON Project_Purge BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'delete', new.project_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_log_insert AFTER INSERT ON Todo_Item BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'insert', new.todo_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_log_update AFTER UPDATE ON Todo_Item
+WHEN old.description IS NOT new.description OR old.priority IS NOT new.priority
+	OR old.completed IS NOT new.completed OR old.project_id IS NOT new.project_id BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'update', new.todo_id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_todo_log_delete AFTER DELETE ON Todo_Item BEGIN
+	INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'delete', old.todo_id);
+END;
 
 -- Seed data (optional) - a small sample to get started
 INSERT OR IGNORE INTO Project (project_id, title) VALUES (1, 'General');
 INSERT OR IGNORE INTO Project (project_id, title) VALUES (2, 'Work');
 INSERT OR IGNORE INTO Project (project_id, title) VALUES (3, 'Personal');
 
-INSERT OR IGNORE INTO Todo_Item (todo_id, title, description, priority, completed, project_id)
-	VALUES (1, 'General', 'Get milk, eggs, bread from grocery store', 3, 'no', 1);
+INSERT OR IGNORE INTO Todo_Item (todo_id, description, priority, completed, project_id)
+	VALUES (1, 'Get milk, eggs, bread from grocery store', 3, 0, 1);
+
+INSERT OR IGNORE INTO Todo_Item (todo_id, description, priority, completed, project_id)
+	VALUES (2, 'Complete the monthly financial report', 5, 0, 2);
 
-INSERT OR IGNORE INTO Todo_Item (todo_id, title, description, priority, completed, project_id)
-	VALUES (2, 'Work', 'Complete the monthly financial report', 5, 'no', 2);
+INSERT OR IGNORE INTO Todo_Item (todo_id, description, priority, completed, project_id)
+	VALUES (3, 'Fix kitchen sink leak', 4, 1, 3);
 
-INSERT OR IGNORE INTO Todo_Item (todo_id, title, description, priority, completed, project_id)
-	VALUES (3, 'Personal', 'Fix kitchen sink leak', 4, 'yes', 3);
+-- Schema version understood by src/Utils/migrations.py
+PRAGMA user_version = 8;
 
 -- End of schema
@@ -0,0 +1,535 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from DAO.TodoItemDAO import NEXT_LIMIT
+from Models.Project import Project
+from Models.TodoItem import TodoItem
+from Service.ProjectService import ProjectService
+from Service.TodoItemService import TodoItemService
+from Utils.db_connection import POOL_TIMEOUT, configure_pool, pool_stats
+from Utils.instrumentation import QueryRecord, QueryStats, get_query_stats
+from Utils.write_queue import WriteQueue
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 8
+
+# seconds an idle keep-alive connection may hold a worker before it is closed
+KEEP_ALIVE_TIMEOUT = 5.0
+
+# largest request body accepted, and largest page a client may ask for
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_PAGE_SIZE = 500
+DEFAULT_PAGE_SIZE = 50
+
+logger = logging.getLogger("todolist.server")
+logger.addHandler(logging.NullHandler())
+
+
+class HTTPError(Exception):
+    """Raised by route handlers to answer with an error status and message."""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+Handler = Callable[..., Tuple[HTTPStatus, Any]]
+
+
+class TodoListApp:
+    """JSON front end over `ProjectService` and `TodoItemService`.
+
+    Transport-free: `dispatch` takes a method, path, query and decoded body and
+    returns a status and a JSON-serialisable payload, so the routes can be
+    exercised without a socket. Latency is recorded per route template (e.g.
+    `GET /todos/{id}`) in a `QueryStats` histogram and served by `GET /metrics`.
+
+    With a `write_queue`, single-todo writes (`POST /todos`, `PUT|DELETE
+    /todos/{id}`) from all workers are committed in groups by its writer
+    thread instead of one transaction each; a request still answers only once
+    its write has committed.
+    """
+
+    def __init__(self, project_service: Optional[ProjectService] = None,
+                 todo_service: Optional[TodoItemService] = None,
+                 write_queue: Optional[WriteQueue] = None):
+        self.projects = project_service or ProjectService()
+        self.todos = todo_service or TodoItemService(self.projects)
+        self.write_queue = write_queue
+        self.metrics = QueryStats()
+        self._routes: List[Tuple[str, Pattern, str, Handler]] = []
+        self._route("GET", "/projects", self._list_projects)
+        self._route("POST", "/projects", self._create_project)
+        self._route("POST", "/projects/bulk", self._create_projects)
+        self._route("GET", "/projects/stats", self._project_stats)
+        self._route("GET", "/projects/changes", self._project_changes)
+        self._route("GET", "/projects/purges", self._project_purges)
+        self._route("GET", "/projects/{id}", self._get_project)
+        self._route("PUT", "/projects/{id}", self._update_project)
+        self._route("DELETE", "/projects/{id}", self._delete_project)
+        self._route("GET", "/todos", self._list_todos)
+        self._route("POST", "/todos", self._create_todo)
+        self._route("GET", "/todos/search", self._search_todos)
+        self._route("GET", "/todos/next", self._next_todos)
+        self._route("GET", "/todos/changes", self._todo_changes)
+        self._route("POST", "/todos/bulk", self._create_todos)
+        self._route("PUT", "/todos/bulk", self._update_todos)
+        self._route("DELETE", "/todos/bulk", self._delete_todos)
+        self._route("GET", "/todos/{id}", self._get_todo)
+        self._route("PUT", "/todos/{id}", self._update_todo)
+        self._route("DELETE", "/todos/{id}", self._delete_todo)
+        self._route("GET", "/metrics", self._metrics)
+
+    def _route(self, method: str, template: str, handler: Handler) -> None:
+        pattern = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", template) + "$")
+        self._routes.append((method, pattern, template, handler))
+
+    def dispatch(self, method: str, path: str, query: Dict[str, List[str]], body: Any) -> Tuple[int, Any]:
+        """Route one request and record its latency.
+
+        Parameters:
+            method (str): HTTP method.
+            path (str): request path without the query string.
+            query (Dict[str, List[str]]): parsed query string.
+            body (Any): decoded JSON body, or None.
+
+        Returns:
+            Tuple[int, Any]: HTTP status and JSON-serialisable payload.
+        """
+        started = time.perf_counter()
+        try:
+            status, payload = self._dispatch(method, path, query, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except sqlite3.IntegrityError as e:
+            status, payload = HTTPStatus.CONFLICT, {"error": str(e)}
+        except Exception as e:
+            logger.exception("%s %s failed", method, path)
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": type(e).__name__}
+        rec = QueryRecord(self._label(method, path), path, "")
+        rec.elapsed = time.perf_counter() - started
+        rec.rows = len(payload["items"]) if isinstance(payload, dict) and isinstance(payload.get("items"), list) else 1
+        if status >= 500:
+            rec.error = f"HTTP {int(status)}"
+        self.metrics.record(rec)
+        return int(status), payload
+
+    def _label(self, method: str, path: str) -> str:
+        # metrics are keyed by route template so /todos/1 and /todos/2 aggregate
+        for m, pattern, template, _ in self._routes:
+            if m == method and pattern.match(path):
+                return f"{method} {template}"
+        return f"{method} (unmatched)"
+
+    def _dispatch(self, method: str, path: str, query: Dict[str, List[str]], body: Any) -> Tuple[HTTPStatus, Any]:
+        allowed = False
+        for m, pattern, _, handler in self._routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            if m != method:
+                allowed = True
+                continue
+            args = {k: int(v) for k, v in match.groupdict().items()}
+            return handler(query=query, body=body, **args)
+        if allowed:
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{method} not allowed on {path}")
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No route for {path}")
+
+    # request helpers
+
+    @staticmethod
+    def _param(query: Dict[str, List[str]], name: str, cast: Callable = str, default: Any = None) -> Any:
+        values = query.get(name)
+        if not values or values[0] == "":
+            return default
+        try:
+            return cast(values[0])
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Invalid value for {name!r}")
+
+    @classmethod
+    def _limit(cls, query: Dict[str, List[str]], name: str, default: int) -> int:
+        """Read a page size parameter: at least 1, capped at `MAX_PAGE_SIZE`."""
+        limit = cls._param(query, name, int, default)
+        if limit < 1:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"{name!r} must be at least 1")
+        return min(limit, MAX_PAGE_SIZE)
+
+    @staticmethod
+    def _field(body: Any, name: str, required: bool = True, default: Any = None) -> Any:
+        if not isinstance(body, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON object body")
+        if name not in body:
+            if required:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Missing field {name!r}")
+            return default
+        return body[name]
+
+    @staticmethod
+    def _project_id(value: Any) -> Optional[int]:
+        """Check a `project_id` taken from a request body: an integer, or None."""
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'project_id' must be an integer")
+        return value
+
+    def _todo_from_json(self, data: Any, titles: Dict[int, str], todo_id: Optional[int] = None) -> TodoItem:
+        """Build a `TodoItem` from a JSON object naming its project by `title` or `project_id`."""
+        project_id = self._project_id(self._field(data, "project_id", required=False))
+        title = self._field(data, "title", required=False) or titles.get(project_id, "")
+        return TodoItem(
+            todo_id=todo_id if todo_id is not None else self._field(data, "todo_id", required=False),
+            title=title,
+            description=self._field(data, "description"),
+            priority=self._field(data, "priority", required=False, default=3),
+            completed=bool(self._field(data, "completed", required=False, default=False)),
+            project_id=project_id,
+        )
+
+    def _write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.write_queue is None:
+            return fn(*args)
+        return self.write_queue.call(fn, *args)
+
+    def _project_titles(self) -> Dict[int, str]:
+        return {p.project_id: p.title for p in self.projects.getAllProjects()}
+
+    # projects
+
+    def _list_projects(self, query, body):
+        return HTTPStatus.OK, {"items": [p.to_dict() for p in self.projects.getAllProjects()]}
+
+    def _create_project(self, query, body):
+        project = self.projects.createProject(self._field(body, "title"))
+        if project is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid project title")
+        return HTTPStatus.CREATED, project.to_dict()
+
+    def _create_projects(self, query, body):
+        titles = self._field(body, "titles")
+        if not isinstance(titles, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'titles' must be a list")
+        return HTTPStatus.OK, asdict(self.projects.createProjects(titles))
+
+    def _project_stats(self, query, body):
+        stats = self.projects.getProjectStats(self._param(query, "project_id", int))
+        return HTTPStatus.OK, {"items": [s.to_dict() for s in stats]}
+
+    def _project_changes(self, query, body):
+        return self._changes(self.projects.changesSince, query)
+
+    def _project_purges(self, query, body):
+        return HTTPStatus.OK, {"items": [p.to_dict() for p in self.projects.getPurgeProgress()]}
+
+    def _get_project(self, query, body, id):
+        project = self.projects.getProjectbById(id)
+        if project is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Project {id} not found")
+        return HTTPStatus.OK, project.to_dict()
+
+    def _update_project(self, query, body, id):
+        title = self._field(body, "title")
+        if not self.projects.validate_title(title):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid project title")
+        if not self.projects.updateProject(Project(project_id=id, title=title.strip())):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Project {id} not found")
+        return HTTPStatus.OK, {"project_id": id, "title": title.strip()}
+
+    def _delete_project(self, query, body, id):
+        if not self.projects.deleteProjectById(id):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Project {id} not found")
+        return HTTPStatus.OK, {"deleted": id}
+
+    # todos
+
+    def _list_todos(self, query, body):
+        project_id = self._param(query, "project_id", int)
+        limit = self._limit(query, "limit", DEFAULT_PAGE_SIZE)
+        after = self._param(query, "after")
+        if after is not None:
+            try:
+                priority, todo_id = (int(x) for x in after.split(","))
+            except ValueError:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "'after' must be '<priority>,<todo_id>'")
+            after = (priority, todo_id)
+        page = self.todos.getTodoItemsPage(project_id, after, limit)
+        next_key = f"{page[-1].priority},{page[-1].todo_id}" if page and len(page) == limit else None
+        return HTTPStatus.OK, {"items": [t.to_dict() for t in page], "next": next_key}
+
+    def _search_todos(self, query, body):
+        results = self.todos.searchTodoItems(
+            self._param(query, "q", default=""),
+            self._param(query, "project_id", int),
+            self._limit(query, "limit", 20),
+        )
+        return HTTPStatus.OK, {
+            "items": [dict(r.item.to_dict(), snippet=r.snippet, score=r.score) for r in results],
+        }
+
+    def _next_todos(self, query, body):
+        todos = self.todos.nextTodos(
+            self._limit(query, "k", NEXT_LIMIT),
+            self._param(query, "project_id", int),
+            self._param(query, "include_completed", lambda v: v.lower() in ("1", "true", "yes"), False),
+        )
+        return HTTPStatus.OK, {"items": [t.to_dict() for t in todos]}
+
+    def _todo_changes(self, query, body):
+        return self._changes(self.todos.changesSince, query)
+
+    def _changes(self, changes_since: Callable[[int, int], Any], query) -> Tuple[HTTPStatus, Any]:
+        changes = changes_since(
+            self._param(query, "since", int, 0),
+            self._limit(query, "limit", MAX_PAGE_SIZE),
+        )
+        if changes is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Change log unavailable for these arguments or on a sharded database")
+        return HTTPStatus.OK, changes.to_dict()
+
+    def _create_todo(self, query, body):
+        titles = self._project_titles()
+        item = self._todo_from_json(body, titles)
+        todo = self._write(self.todos.createTodoItem, item.title, item.description, item.priority, item.project_id)
+        if todo is None:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid todo or unknown project")
+        return HTTPStatus.CREATED, todo.to_dict()
+
+    def _create_todos(self, query, body):
+        items = self._field(body, "items")
+        if not isinstance(items, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'items' must be a list")
+        titles = self._project_titles()
+        return HTTPStatus.OK, asdict(self.todos.createTodoItems(self._todo_from_json(i, titles) for i in items))
+
+    def _update_todos(self, query, body):
+        items = self._field(body, "items")
+        if not isinstance(items, list):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'items' must be a list")
+        titles = self._project_titles()
+        return HTTPStatus.OK, asdict(self.todos.updateTodoItems(self._todo_from_json(i, titles) for i in items))
+
+    def _delete_todos(self, query, body):
+        ids = self._field(body, "ids")
+        if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "'ids' must be a list of integers")
+        return HTTPStatus.OK, asdict(self.todos.deleteTodoItems(ids))
+
+    def _get_todo(self, query, body, id):
+        todo = self.todos.getTodoItemById(id)
+        if todo is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Todo {id} not found")
+        return HTTPStatus.OK, todo.to_dict()
+
+    def _update_todo(self, query, body, id):
+        todo = self.todos.getTodoItemById(id)
+        if todo is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Todo {id} not found")
+        if not isinstance(body, dict):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Expected a JSON object body")
+        todo.description = body.get("description", todo.description)
+        todo.priority = body.get("priority", todo.priority)
+        todo.completed = bool(body.get("completed", todo.completed))
+        if "project_id" in body and self._project_id(body["project_id"]) != todo.project_id:
+            project = self.projects.getProjectbById(body["project_id"])
+            if project is None:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"Project {body['project_id']} not found")
+            todo.project_id, todo.title = project.project_id, project.title
+        if not self._write(self.todos.updateTodoItem, todo):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid todo")
+        return HTTPStatus.OK, todo.to_dict()
+
+    def _delete_todo(self, query, body, id):
+        if not self._write(self.todos.deleteTodoItem, id):
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"Todo {id} not found")
+        return HTTPStatus.OK, {"deleted": id}
+
+    def _metrics(self, query, body):
+        metrics = {
+            "routes": self.metrics.snapshot(),
+            "pool": pool_stats(),
+            "project_cache": self.projects.getCacheStats(),
+            "queries": get_query_stats(),
+        }
+        if self.write_queue is not None:
+            metrics["write_queue"] = self.write_queue.stats()
+        if self.projects.purge_worker is not None:
+            metrics["purge"] = self.projects.purge_worker.stats()
+        return HTTPStatus.OK, metrics
+
+
+class TodoListRequestHandler(BaseHTTPRequestHandler):
+    """Translates HTTP/1.1 requests to `TodoListApp.dispatch` calls.
+
+    Responses always carry a Content-Length, so clients can keep the
+    connection open and send further requests on it.
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "TodoList/1.0"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # headers and body go out in separate writes; with Nagle on, the body waits
+    # for the client's delayed ACK (~40 ms) on every keep-alive request
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def do_PUT(self):
+        self._handle()
+
+    def do_DELETE(self):
+        self._handle()
+
+    def _handle(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            body = self._read_body()
+        except HTTPError as e:
+            self._send(e.status, {"error": e.message})
+            self.close_connection = True
+            return
+        status, payload = self.server.app.dispatch(self.command, url.path.rstrip("/") or "/",
+                                                   parse_qs(url.query), body)
+        self._send(status, payload)
+
+    def _read_body(self) -> Any:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # a negative length would make rfile.read wait for the client to hang up
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Body is not valid JSON")
+
+    def _send(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """HTTP server that handles connections on a fixed pool of worker threads.
+
+    Unlike `ThreadingHTTPServer`, which starts a thread per connection, at
+    most `workers` connections are served at once; further connections queue
+    until a worker frees up. A keep-alive connection occupies its worker
+    until it closes or sits idle for `KEEP_ALIVE_TIMEOUT` seconds.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], app: TodoListApp, workers: int = DEFAULT_WORKERS):
+        self.app = app
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="todolist-http")
+        # accepted connections by their futures, until a worker has handled them
+        self._pending: Dict[Future, Any] = {}
+        self._pending_lock = threading.Lock()
+        super().__init__(address, TodoListRequestHandler)
+
+    def process_request(self, request, client_address) -> None:
+        with self._pending_lock:
+            future = self._pool.submit(self._process, request, client_address)
+            self._pending[future] = request
+        future.add_done_callback(self._handled)
+
+    def _handled(self, future: Future) -> None:
+        with self._pending_lock:
+            self._pending.pop(future, None)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        # connections still waiting for a worker are closed rather than dropped,
+        # so their clients see the connection end instead of a reset or a hang
+        with self._pending_lock:
+            pending = list(self._pending.items())
+        for future, request in pending:
+            if future.cancel():
+                self.shutdown_request(request)
+        self._pool.shutdown(wait=True)
+        if self.app.write_queue is not None:
+            self.app.write_queue.close()
+        self.app.projects.stopPurgeWorker()
+
+
+def create_server(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS,
+                  db_path=None, group_commit: bool = False) -> ThreadPoolHTTPServer:
+    """Create a server over the configured database, sizing the connection pool to the workers.
+
+    Parameters:
+        host (str): interface to bind.
+        port (int): TCP port; 0 picks a free one (see `server.server_address`).
+        workers (int): request worker threads, and pooled connections.
+        db_path (str | Path | None): database file; defaults to the application database.
+        group_commit (bool): commit single-todo writes in groups through a `WriteQueue`.
+
+    Returns:
+        ThreadPoolHTTPServer: bound server; call `serve_forever()` to start it.
+    """
+    # one pooled connection per worker, so no request waits for a connection,
+    # plus one for the purge worker and one for the group-commit writer thread
+    configure_pool(db_path, max_size=workers + 1 + (1 if group_commit else 0), timeout=POOL_TIMEOUT)
+    app = TodoListApp(write_queue=WriteQueue() if group_commit else None)
+    app.projects.startPurgeWorker()
+    return ThreadPoolHTTPServer((host, port), app, workers)
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS, db_path=None,
+          group_commit: bool = False) -> None:
+    """Run the HTTP server until interrupted."""
+    server = create_server(host, port, workers, db_path, group_commit)
+    print(f"Serving the todo list API on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"with {workers} workers (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def start_in_thread(server: ThreadPoolHTTPServer) -> threading.Thread:
+    """Run `server.serve_forever()` on a daemon thread; stop it with `server.shutdown()`."""
+    thread = threading.Thread(target=server.serve_forever, name="todolist-http-accept", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,145 @@
+from typing import Dict, Iterable, List, Optional
+
+from Models.BatchResult import BatchResult
+from Models.Project import Project
+from Service.ProjectService import ProjectService
+from Utils.async_executor import DatabaseExecutor, get_executor
+from Utils.db_connection import BATCH_CHUNK_SIZE
+
+
+class AsyncProjectService:
+    """Asyncio counterpart of `ProjectService`.
+
+    Calls that only read run on the executor's reader threads; calls that
+    write run, validation included, on its single writer thread.
+    """
+
+    def __init__(self, service: Optional[ProjectService] = None, executor: Optional[DatabaseExecutor] = None):
+        self.service = service or ProjectService()
+        self.executor = executor or get_executor()
+
+    def validate_title(self, title: str) -> bool:
+        """
+        Validates the title of a project (no I/O).
+
+        Parameters:
+        title (str): The title of the project to validate.
+
+        Returns:
+        bool: True if the title is valid, False otherwise.
+        """
+        return self.service.validate_title(title)
+
+    async def createProject(self, title: str, timeout: Optional[float] = None) -> Optional[Project]:
+        """
+        Creates a new project with the given title.
+
+        Parameters:
+        title (str): The title of the project to create.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[Project]: The created Project object if successful, None otherwise.
+        """
+        return await self.executor.write(self.service.createProject, title, timeout=timeout)
+
+    async def createProjects(self, titles: Iterable[str], chunk_size: int = BATCH_CHUNK_SIZE,
+                             timeout: Optional[float] = None) -> BatchResult:
+        """
+        Creates many projects in a single transaction.
+
+        Parameters:
+        titles (Iterable[str]): The titles of the projects to create.
+        chunk_size (int): Rows sent to the database per batch.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        BatchResult: The new project ID per title, with invalid or duplicate titles reported in `errors`.
+        """
+        return await self.executor.write(self.service.createProjects, list(titles), chunk_size, timeout=timeout)
+
+    async def getProjectById(self, project_id: int, timeout: Optional[float] = None) -> Optional[Project]:
+        """
+        Retrieves a project by its ID.
+
+        Parameters:
+        project_id (int): The ID of the project to retrieve.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[Project]: The Project object if found, None otherwise.
+        """
+        return await self.executor.read(self.service.getProjectbById, project_id, timeout=timeout)
+
+    async def getProjectByTitle(self, title: str, timeout: Optional[float] = None) -> Optional[Project]:
+        """
+        Retrieves a project by its title.
+
+        Parameters:
+        title (str): The title of the project to retrieve.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[Project]: The Project object if found, None otherwise.
+        """
+        return await self.executor.read(self.service.getProjectByTitle, title, timeout=timeout)
+
+    async def getAllProjects(self, timeout: Optional[float] = None) -> List[Project]:
+        """
+        Retrieves all projects.
+
+        Parameters:
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[Project]: A list of all Project objects.
+        """
+        return await self.executor.read(self.service.getAllProjects, timeout=timeout)
+
+    async def updateProject(self, project: Project, timeout: Optional[float] = None) -> bool:
+        """
+        Updates the title of an existing project.
+
+        Parameters:
+        project (Project): The Project object containing the updated title and ID.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        bool: True if the update was successful, False otherwise.
+        """
+        return await self.executor.write(self.service.updateProject, project, timeout=timeout)
+
+    async def deleteProjectById(self, project_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes a project by its ID.
+
+        Parameters:
+        project_id (int): The ID of the project to delete.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        bool: True if the deletion was successful, False otherwise.
+        """
+        return await self.executor.write(self.service.deleteProjectById, project_id, timeout=timeout)
+
+    async def deleteProjectByTitle(self, title: str, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes a project by its title.
+
+        Parameters:
+        title (str): The title of the project to delete.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        bool: True if the deletion was successful, False otherwise.
+        """
+        return await self.executor.write(self.service.deleteProjectByTitle, title, timeout=timeout)
+
+    def getCacheStats(self) -> Dict[str, int]:
+        """
+        Retrieves hit/miss counters of the project lookup cache (no I/O).
+
+        Returns:
+        Dict[str, int]: Counters `hits`, `misses`, `evictions` and the current `size`.
+        """
+        return self.service.getCacheStats()
@@ -0,0 +1,296 @@
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from DAO.TodoItemDAO import NEXT_LIMIT, SEARCH_LIMIT
+from Models.BatchResult import BatchResult
+from Models.Project import Project
+from Models.SearchResult import SearchResult
+from Models.TodoItem import TodoItem
+from Service.TodoItemService import TodoItemService
+from Utils.async_executor import DatabaseExecutor, get_executor
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE
+
+
+class AsyncTodoItemService:
+    """Asyncio counterpart of `TodoItemService`.
+
+    Calls that only read run on the executor's reader threads; calls that
+    write run, validation included, on its single writer thread.
+    """
+
+    def __init__(self, service: Optional[TodoItemService] = None, executor: Optional[DatabaseExecutor] = None):
+        self.service = service or TodoItemService()
+        self.executor = executor or get_executor()
+
+    async def createTodoItem(self, title: str, description: str, priority: int, project_id: Optional[int],
+                             timeout: Optional[float] = None) -> Optional[TodoItem]:
+        """
+        Creates a new todo item.
+
+        Parameters:
+        title (str): The title of the project the todo item belongs to.
+        description (str): The description of the todo item.
+        priority (int): The priority level of the todo item (1-5).
+        project_id (int): The ID of the associated project; looked up from the title if None.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[TodoItem]: The created TodoItem object if successful, None otherwise.
+        """
+        return await self.executor.write(
+            self.service.createTodoItem, title, description, priority, project_id, timeout=timeout
+        )
+
+    async def createTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE,
+                              timeout: Optional[float] = None) -> BatchResult:
+        """
+        Creates many todo items in a single transaction.
+
+        Parameters:
+        items (Iterable[TodoItem]): The todo items to create; `todo_id` is ignored.
+        chunk_size (int): Rows sent to the database per batch.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        BatchResult: The new todo ID per item, with invalid or rejected items reported in `errors`.
+        """
+        return await self.executor.write(self.service.createTodoItems, list(items), chunk_size, timeout=timeout)
+
+    async def createProjectWithTodos(self, title: str, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE,
+                                     timeout: Optional[float] = None) -> Optional[Tuple[Project, BatchResult]]:
+        """
+        Creates a project together with its initial todo items, all or nothing.
+
+        Parameters:
+        title (str): The title of the new project.
+        items (Iterable[TodoItem]): The initial todo items; `todo_id`, `title` and `project_id` are ignored.
+        chunk_size (int): Rows sent to the database per batch.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[Tuple[Project, BatchResult]]: The new project and the IDs of its todos, or None if nothing was created.
+        """
+        return await self.executor.write(
+            self.service.createProjectWithTodos, title, list(items), chunk_size, timeout=timeout
+        )
+
+    async def updateTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE,
+                              timeout: Optional[float] = None) -> BatchResult:
+        """
+        Updates many existing todo items in a single transaction.
+
+        Parameters:
+        items (Iterable[TodoItem]): The todo items to update, each with `todo_id` set.
+        chunk_size (int): Rows sent to the database per batch.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        BatchResult: The todo ID per item, with invalid or rejected items reported in `errors`.
+        """
+        return await self.executor.write(self.service.updateTodoItems, list(items), chunk_size, timeout=timeout)
+
+    async def completeTodoItems(self, todo_ids: Iterable[int], completed: bool = True,
+                                timeout: Optional[float] = None) -> int:
+        """
+        Marks many todo items completed (or open again) without reading them first.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to change.
+        completed (bool): The state to set.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        int: The number of todo items whose state changed.
+        """
+        return await self.executor.write(self.service.completeTodoItems, list(todo_ids), completed, timeout=timeout)
+
+    async def setPriority(self, todo_ids: Iterable[int], priority: int,
+                          timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Sets the priority of many todo items.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to change.
+        priority (int): The new priority level (1-5).
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[int]: The number of todo items changed, or None if the priority is invalid.
+        """
+        return await self.executor.write(self.service.setPriority, list(todo_ids), priority, timeout=timeout)
+
+    async def moveToProject(self, todo_ids: Iterable[int], project_id: int,
+                            timeout: Optional[float] = None) -> Optional[int]:
+        """
+        Moves many todo items to another project.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to move.
+        project_id (int): The ID of the destination project.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[int]: The number of todo items moved, or None if the project does not exist.
+        """
+        return await self.executor.write(self.service.moveToProject, list(todo_ids), project_id, timeout=timeout)
+
+    async def deleteTodoItems(self, todo_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE,
+                              timeout: Optional[float] = None) -> BatchResult:
+        """
+        Deletes many todo items in a single transaction.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to delete.
+        chunk_size (int): Rows sent to the database per batch.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        BatchResult: The requested IDs, with the number of deleted rows in `affected`.
+        """
+        return await self.executor.write(self.service.deleteTodoItems, list(todo_ids), chunk_size, timeout=timeout)
+
+    async def getTodoItemById(self, todo_id: int, timeout: Optional[float] = None) -> Optional[TodoItem]:
+        """
+        Retrieves a todo item by its ID.
+
+        Parameters:
+        todo_id (int): The ID of the todo item to retrieve.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        Optional[TodoItem]: The TodoItem object if found, None otherwise.
+        """
+        return await self.executor.read(self.service.getTodoItemById, todo_id, timeout=timeout)
+
+    async def getAllTodoItemsByProjectId(self, project_id: int, timeout: Optional[float] = None) -> List[TodoItem]:
+        """
+        Retrieves all todo items associated with a specific project.
+
+        Parameters:
+        project_id (int): The ID of the project.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[TodoItem]: A list of TodoItem objects associated with the project.
+        """
+        return await self.executor.read(self.service.getAllTodoItemsByProjectId, project_id, timeout=timeout)
+
+    async def getAllTodoItemsByProjectTitle(self, project_title: str, timeout: Optional[float] = None) -> List[TodoItem]:
+        """
+        Retrieves all todo items associated with a specific project title.
+
+        Parameters:
+        project_title (str): The title of the project.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[TodoItem]: A list of TodoItem objects associated with the project.
+        """
+        return await self.executor.read(self.service.getAllTodoItemsByProjectTitle, project_title, timeout=timeout)
+
+    async def getAllTodoItems(self, timeout: Optional[float] = None) -> List[TodoItem]:
+        """
+        Retrieves all todo items.
+
+        Parameters:
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[TodoItem]: A list of all TodoItem objects.
+        """
+        return await self.executor.read(self.service.getAllTodoItems, timeout=timeout)
+
+    async def iterTodoItems(self, project_id: Optional[int] = None, batch_size: int = FETCH_BATCH_SIZE,
+                            timeout: Optional[float] = None) -> AsyncIterator[TodoItem]:
+        """
+        Streams todo items ordered by priority, one page per executor call.
+
+        Parameters:
+        project_id (Optional[int]): The ID of the project to filter by, or None for all todos.
+        batch_size (int): Items fetched per executor call.
+        timeout (Optional[float]): Seconds allowed per page.
+
+        Returns:
+        AsyncIterator[TodoItem]: TodoItem objects ordered by (priority, todo_id).
+        """
+        after = None
+        while True:
+            page = await self.getTodoItemsPage(project_id, after, batch_size, timeout=timeout)
+            for item in page:
+                yield item
+            if len(page) < batch_size:
+                return
+            after = (page[-1].priority, page[-1].todo_id)
+
+    async def getTodoItemsPage(self, project_id: Optional[int] = None, after: Optional[Tuple[int, int]] = None,
+                               limit: int = 50, timeout: Optional[float] = None) -> List[TodoItem]:
+        """
+        Retrieves one page of todo items ordered by priority.
+
+        Parameters:
+        project_id (Optional[int]): The ID of the project to filter by, or None for all todos.
+        after (Optional[Tuple[int, int]]): The (priority, todo_id) of the last item of the previous page.
+        limit (int): The maximum number of items to return.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[TodoItem]: Up to `limit` TodoItem objects; empty once past the last page.
+        """
+        return await self.executor.read(self.service.getTodoItemsPage, project_id, after, limit, timeout=timeout)
+
+    async def nextTodos(self, k: int = NEXT_LIMIT, project_id: Optional[int] = None, include_completed: bool = False,
+                        timeout: Optional[float] = None) -> List[TodoItem]:
+        """
+        Retrieves the todo items to work on next: the top k by priority, oldest first within a priority.
+
+        Parameters:
+        k (int): The number of todo items to return.
+        project_id (Optional[int]): The ID of the project to pick from, or None for all projects.
+        include_completed (bool): Whether completed todo items are considered too.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[TodoItem]: Up to k TodoItem objects; empty if k is less than 1.
+        """
+        return await self.executor.read(self.service.nextTodos, k, project_id, include_completed, timeout=timeout)
+
+    async def searchTodoItems(self, query: str, project_id: Optional[int] = None, limit: int = SEARCH_LIMIT,
+                              timeout: Optional[float] = None) -> List[SearchResult]:
+        """
+        Searches todo descriptions and project titles for all of the given terms.
+
+        Parameters:
+        query (str): The search terms; a term ending in `*` matches as a prefix.
+        project_id (Optional[int]): The ID of the project to search within, or None for all todos.
+        limit (int): The maximum number of results to return.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        List[SearchResult]: Matching todos, best match first, each with a highlighted snippet.
+        """
+        return await self.executor.read(self.service.searchTodoItems, query, project_id, limit, timeout=timeout)
+
+    async def updateTodoItem(self, todo: TodoItem, timeout: Optional[float] = None) -> bool:
+        """
+        Updates an existing todo item.
+
+        Parameters:
+        todo (TodoItem): The TodoItem object containing updated information.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        bool: True if the update was successful, False otherwise.
+        """
+        return await self.executor.write(self.service.updateTodoItem, todo, timeout=timeout)
+
+    async def deleteTodoItem(self, todo_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Deletes a todo item by its ID.
+
+        Parameters:
+        todo_id (int): The ID of the todo item to delete.
+        timeout (Optional[float]): Seconds to wait before giving up.
+
+        Returns:
+        bool: True if the deletion was successful, False otherwise.
+        """
+        return await self.executor.write(self.service.deleteTodoItem, todo_id, timeout=timeout)
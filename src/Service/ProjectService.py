@@ -1,12 +1,30 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from DAO.ProjectDAO import ProjectDAO
+from DAO.ChangeLogDAO import CHANGES_LIMIT, ChangeLogDAO
+from DAO.ProjectDAO import PURGE_CHUNK_SIZE, ProjectDAO
+from DAO.ShardedProjectDAO import ShardedProjectDAO
+from Models.BatchResult import BatchResult
+from Models.ChangeSet import ChangeSet
 from Models.Project import Project
+from Models.ProjectStats import ProjectStats
+from Models.PurgeProgress import PurgeProgress
+from Utils.db_connection import BATCH_CHUNK_SIZE, UnitOfWork
+from Utils.purge_worker import PURGE_PAUSE, VACUUM_PAGES, PurgeWorker
+from Utils.sharding import get_router
 
 
 class ProjectService:
-    def __init__(self):
-        self.dao = ProjectDAO()
+    def __init__(self, dao: Optional[ProjectDAO] = None):
+        if dao is None:
+            # a sharded layout (TODOLIST_SHARDS) routes every call through the shard router
+            router = get_router()
+            if router is not None:
+                dao = ShardedProjectDAO(router)
+        self.dao = dao or ProjectDAO()
+        # each shard keeps its own Change_Log, with its own seq numbers
+        self.change_log = None if isinstance(self.dao, ShardedProjectDAO) else ChangeLogDAO()
+        # purges large deleted projects in the background once started (see startPurgeWorker)
+        self.purge_worker: Optional[PurgeWorker] = None
 
     def validate_title(self, title: str) -> bool:
         """
@@ -42,6 +60,30 @@ class ProjectService:
             return None
         return self.dao.createProject(title.strip())
 
+    def createProjects(self, titles: Iterable[str], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """
+        Creates many projects in a single transaction.
+
+        Parameters:
+        titles (Iterable[str]): The titles of the projects to create.
+        chunk_size (int): Rows sent to the database per batch.
+
+        Returns:
+        BatchResult: The new project ID per title, with invalid or duplicate titles reported in `errors`.
+        """
+        titles = list(titles)
+        positions: List[int] = []
+        rejected = {}
+        for i, title in enumerate(titles):
+            if self.validate_title(title):
+                positions.append(i)
+            else:
+                rejected[i] = "invalid project title"
+        result = self.dao.createProjects(
+            (Project(project_id=None, title=titles[i].strip()) for i in positions), chunk_size
+        )
+        return result.scatter(positions, len(titles), rejected)
+
     def getProjectbById(self, project_id: int) -> Optional[Project]:
         """
         Retrieves a project by its ID.
@@ -108,7 +150,10 @@ class ProjectService:
         Returns:
         bool: True if the deletion was successful, False otherwise.
         """
-        return self.dao.deleteProjectById(project_id)
+        deleted = self.dao.deleteProjectById(project_id)
+        if deleted and self.purge_worker is not None:
+            self.purge_worker.wake()
+        return deleted
     
     def deleteProjectByTitle(self, title: str) -> bool:
         """
@@ -120,11 +165,150 @@ class ProjectService:
         Returns:
         bool: True if the deletion was successful, False otherwise.
         """
-        project = self.getProjectByTitle(title)
-        if not project:
-            return False
-        # ensure project_id is not None before calling DAO
-        if project.project_id is None:
-            return False
-        return self.dao.deleteProjectById(project.project_id)
-    
\ No newline at end of file
+        # lookup and delete commit together, so the title cannot be reused in between
+        with UnitOfWork():
+            project = self.getProjectByTitle(title)
+            if not project:
+                return False
+            # ensure project_id is not None before calling DAO
+            if project.project_id is None:
+                return False
+            deleted = self.dao.deleteProjectById(project.project_id)
+        # woken after the commit, so the worker finds the project waiting
+        if deleted and self.purge_worker is not None:
+            self.purge_worker.wake()
+        return deleted
+
+    def getPurgeProgress(self) -> List[PurgeProgress]:
+        """
+        Retrieves the deleted projects whose todo items are still being removed in the background.
+
+        Returns:
+        List[PurgeProgress]: The number of todo items each project had and how many are gone so far.
+        """
+        return self.dao.getPurgeProgress()
+
+    def purgeDeletedProjects(self, chunk_size: int = PURGE_CHUNK_SIZE) -> int:
+        """
+        Removes the todo items of every deleted project now, one chunk per transaction,
+        then returns the freed space to the file system.
+
+        Parameters:
+        chunk_size (int): The most todo items removed per transaction.
+
+        Returns:
+        int: The number of projects whose purge was completed.
+        """
+        finished = 0
+        while True:
+            progress = self.dao.purgeStep(chunk_size)
+            if progress is None:
+                break
+            finished += progress.done
+        self.dao.incrementalVacuum()
+        return finished
+
+    def startPurgeWorker(self, chunk_size: int = PURGE_CHUNK_SIZE, pause: float = PURGE_PAUSE,
+                         vacuum_pages: int = VACUUM_PAGES) -> PurgeWorker:
+        """
+        Starts the background thread that purges deleted projects, unless it is already running.
+        It picks up purges left unfinished by an earlier run at once.
+
+        Parameters:
+        chunk_size (int): The most todo items removed per transaction.
+        pause (float): Seconds between chunks, leaving the database to other writers.
+        vacuum_pages (int): The most free pages returned to the file system after each chunk.
+
+        Returns:
+        PurgeWorker: The running worker.
+        """
+        if self.purge_worker is None:
+            self.purge_worker = PurgeWorker(self.dao, chunk_size, pause, vacuum_pages)
+        return self.purge_worker
+
+    def stopPurgeWorker(self) -> None:
+        """
+        Stops the background purge after its current chunk; unfinished purges resume with the next worker.
+        """
+        worker, self.purge_worker = self.purge_worker, None
+        if worker is not None:
+            worker.close()
+
+    def getProjectStats(self, project_id: Optional[int] = None) -> List[ProjectStats]:
+        """
+        Retrieves total, open, completed and per-priority todo counts per project.
+
+        Parameters:
+        project_id (Optional[int]): If provided, only this project's counts are returned.
+
+        Returns:
+        List[ProjectStats]: The counts, ordered by project ID.
+        """
+        return self.dao.getProjectStats(project_id)
+
+    def checkProjectStats(self, repair: bool = False) -> List[Dict[str, Any]]:
+        """
+        Verifies the project summary counts against the todos they summarise.
+
+        Parameters:
+        repair (bool): Rebuild the summary if any counts differ.
+
+        Returns:
+        List[Dict[str, Any]]: The projects whose stored counts differ from the recomputed ones.
+        """
+        return self.dao.checkProjectStats(repair)
+
+    def getShardStats(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Retrieves the number of projects and todos on each shard.
+
+        Returns:
+        Optional[List[Dict[str, Any]]]: One entry per shard, or None if the database is not sharded.
+        """
+        if not isinstance(self.dao, ShardedProjectDAO):
+            return None
+        return self.dao.shardStats()
+
+    def moveProjectToShard(self, project_id: int, shard: int) -> Optional[Dict[int, int]]:
+        """
+        Moves a project and its todo items to another shard; the todo items get new IDs.
+
+        Parameters:
+        project_id (int): The ID of the project to move.
+        shard (int): The number of the destination shard.
+
+        Returns:
+        Optional[Dict[int, int]]: Old todo ID -> new todo ID, or None if the database is not sharded,
+        the project does not exist or the shard is out of range.
+        """
+        if not isinstance(self.dao, ShardedProjectDAO):
+            return None
+        try:
+            return self.dao.moveProject(project_id, shard)
+        except (KeyError, ValueError):
+            return None
+
+    def changesSince(self, seq: int = 0, limit: int = CHANGES_LIMIT) -> Optional[ChangeSet]:
+        """
+        Retrieves the projects created, renamed or deleted since a change log cursor.
+
+        Parameters:
+        seq (int): The cursor returned by the previous call, or 0 for all changes.
+        limit (int): The maximum number of change log entries to read.
+
+        Returns:
+        Optional[ChangeSet]: The net change per project and the cursor to continue from,
+        or None if the database is sharded or the arguments are invalid.
+        """
+        if self.change_log is None or seq < 0 or limit < 1:
+            return None
+        return self.change_log.changesSince(seq, limit, "project")
+
+    def getCacheStats(self) -> Dict[str, int]:
+        """
+        Retrieves hit/miss counters of the project lookup cache.
+
+        Returns:
+        Dict[str, int]: Counters `hits`, `misses`, `evictions` and the current `size`.
+        """
+        return self.dao.cacheStats()
@@ -1,14 +1,30 @@
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, timezone
 
-from DAO.TodoItemDAO import TodoItemDAO
+from DAO.ChangeLogDAO import CHANGES_LIMIT, ChangeLogDAO
+from DAO.ShardedTodoItemDAO import ShardedTodoItemDAO
+from DAO.TodoItemDAO import NEXT_LIMIT, SEARCH_LIMIT, TodoItemDAO
 from Service.ProjectService import ProjectService
+from Models.BatchResult import BatchResult
+from Models.ChangeSet import ChangeSet
+from Models.Project import Project
+from Models.SearchResult import SearchResult
 from Models.TodoItem import TodoItem
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE, UnitOfWork
+from Utils.sharding import get_router
 
 class TodoItemService:
-    def __init__(self):
-        self.dao = TodoItemDAO()
-        self.project_service = ProjectService()
+    def __init__(self, project_service: Optional[ProjectService] = None, dao: Optional[TodoItemDAO] = None):
+        if dao is None:
+            # a sharded layout (TODOLIST_SHARDS) routes every call through the shard router
+            router = get_router()
+            if router is not None:
+                dao = ShardedTodoItemDAO(router)
+        self.dao = dao or TodoItemDAO()
+        # each shard keeps its own Change_Log, with its own seq numbers
+        self.change_log = None if isinstance(self.dao, ShardedTodoItemDAO) else ChangeLogDAO()
+        # share the caller's ProjectService rather than building a second one
+        self.project_service = project_service or ProjectService()
 
     def validate_priority(self, priority: int) -> bool:
         """
@@ -43,10 +59,10 @@ class TodoItemService:
         Creates a new todo item.
 
         Parameters:
-        title (str): The title of the todo item.
+        title (str): The title of the project the todo item belongs to.
         description (str): The description of the todo item.
         priority (int): The priority level of the todo item (1-5).
-        project_id (int): The ID of the associated project.
+        project_id (int): The ID of the associated project; looked up from the title if None.
 
         Returns:
         Optional[TodoItem]: The created TodoItem object if successful, None otherwise.
@@ -57,19 +73,163 @@ class TodoItemService:
             return None
         if not self.validate_priority(priority):
             return None
-        # if project_id provided, verify it exists
-        if self.project_service.getProjectByTitle(title) is None:
-            return None
+        # the title names the owning project; it is not stored on the todo.
+        # Lookup and insert share one transaction, so the project cannot vanish in between.
+        with UnitOfWork():
+            project = self.project_service.getProjectByTitle(title)
+            if project is None:
+                return None
+
+            todoObj = TodoItem(
+                todo_id=None,
+                title=title.strip(),
+                description=description.strip(),
+                priority=int(priority),
+                completed=False,
+                project_id=project_id if project_id is not None else project.project_id,
+            )
+            return self.dao.createTodoItem(todoObj)
+
+    def _validate_batch(self, items: List[TodoItem], require_id: bool) -> Tuple[Dict[int, str], Dict[int, int]]:
+        """
+        Validates todo items in bulk, resolving project titles with a single query.
+
+        The items are left unchanged. An item's project is the one named by its title;
+        an item whose `project_id` names a different project is rejected.
+
+        Parameters:
+        items (List[TodoItem]): The todo items to validate.
+        require_id (bool): Whether each item must carry a `todo_id` (updates).
+
+        Returns:
+        Tuple[Dict[int, str], Dict[int, int]]: Index -> reason for every invalid item,
+        and index -> project ID for every valid one.
+        """
+        projects = {p.title: p.project_id for p in self.project_service.getAllProjects()}
+        rejected = {}
+        project_ids = {}
+        for i, item in enumerate(items):
+            if require_id and item.todo_id is None:
+                rejected[i] = "missing todo_id"
+            elif not item.title or not isinstance(item.title, str) or not item.title.strip():
+                rejected[i] = "invalid title"
+            elif not self.validate_description(item.description):
+                rejected[i] = "invalid description"
+            elif not self.validate_priority(item.priority):
+                rejected[i] = "invalid priority"
+            elif item.title.strip() not in projects:
+                rejected[i] = "project not found"
+            elif item.project_id is not None and item.project_id != projects[item.title.strip()]:
+                rejected[i] = "project_id does not match title"
+            else:
+                project_ids[i] = projects[item.title.strip()]
+        return rejected, project_ids
+
+    def createTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """
+        Creates many todo items in a single transaction.
+
+        Parameters:
+        items (Iterable[TodoItem]): The todo items to create; `todo_id` is ignored.
+        chunk_size (int): Rows sent to the database per batch.
 
-        todoObj = TodoItem(
-            todo_id=None,
-            title=title.strip(),
-            description=description.strip(),
-            priority=int(priority),
-            completed=False,
+        Returns:
+        BatchResult: The new todo ID per item, with invalid or rejected items reported in `errors`.
+        """
+        items = list(items)
+        rejected, project_ids = self._validate_batch(items, require_id=False)
+        positions = list(project_ids)
+        todos = (self._clean(items[i], project_ids[i], todo_id=None) for i in positions)
+        return self.dao.createTodoItems(todos, chunk_size).scatter(positions, len(items), rejected)
+
+    @staticmethod
+    def _clean(item: TodoItem, project_id: int, todo_id: Optional[int]) -> TodoItem:
+        """Return a stripped copy of a validated item, leaving the caller's object as it was."""
+        return TodoItem(
+            todo_id=todo_id,
+            title=item.title.strip(),
+            description=item.description.strip(),
+            priority=int(item.priority),
+            completed=bool(item.completed),
             project_id=project_id,
         )
-        return self.dao.createTodoItem(todoObj)
+
+    def createProjectWithTodos(self, title: str, items: Iterable[TodoItem],
+                               chunk_size: int = BATCH_CHUNK_SIZE) -> Optional[Tuple[Project, BatchResult]]:
+        """
+        Creates a project together with its initial todo items, all or nothing.
+
+        The project and every todo are written in one transaction with one commit.
+        If the title is taken or any todo is invalid, nothing is created.
+
+        Parameters:
+        title (str): The title of the new project.
+        items (Iterable[TodoItem]): The initial todo items; `todo_id`, `title` and `project_id` are ignored.
+        chunk_size (int): Rows sent to the database per batch.
+
+        Returns:
+        Optional[Tuple[Project, BatchResult]]: The new project and the IDs of its todos, or None if nothing was created.
+        """
+        if not self.project_service.validate_title(title):
+            return None
+        items = list(items)
+        if not all(self.validate_description(t.description) and self.validate_priority(t.priority) for t in items):
+            return None
+        title = title.strip()
+        with UnitOfWork() as uow:
+            if self.project_service.getProjectByTitle(title) is not None:
+                return None
+            project = self.project_service.createProject(title)
+            if project is None:
+                uow.rollback()
+                return None
+            todos = (
+                TodoItem(
+                    todo_id=None,
+                    title=title,
+                    description=t.description.strip(),
+                    priority=int(t.priority),
+                    completed=bool(t.completed),
+                    project_id=project.project_id,
+                )
+                for t in items
+            )
+            result = self.dao.createTodoItems(todos, chunk_size)
+            if not result.ok:
+                uow.rollback()
+                return None
+        return project, result
+
+    def updateTodoItems(self, items: Iterable[TodoItem], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """
+        Updates many existing todo items in a single transaction.
+
+        Parameters:
+        items (Iterable[TodoItem]): The todo items to update, each with `todo_id` set.
+        chunk_size (int): Rows sent to the database per batch.
+
+        Returns:
+        BatchResult: The todo ID per item, with invalid or rejected items reported in `errors`.
+        """
+        items = list(items)
+        rejected, project_ids = self._validate_batch(items, require_id=True)
+        positions = list(project_ids)
+        todos = (self._clean(items[i], project_ids[i], todo_id=items[i].todo_id) for i in positions)
+        result = self.dao.updateTodoItems(todos, chunk_size)
+        return result.scatter(positions, len(items), rejected)
+
+    def deleteTodoItems(self, todo_ids: Iterable[int], chunk_size: int = BATCH_CHUNK_SIZE) -> BatchResult:
+        """
+        Deletes many todo items in a single transaction.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to delete.
+        chunk_size (int): Rows sent to the database per batch.
+
+        Returns:
+        BatchResult: The requested IDs, with the number of deleted rows in `affected`.
+        """
+        return self.dao.deleteTodoItemsByIds(todo_ids, chunk_size)
 
     def getTodoItemById(self, todo_id: int) -> Optional[TodoItem]:
         """
@@ -116,6 +276,103 @@ class TodoItemService:
         """
         return self.dao.getAllTodoItems()
 
+    def iterTodoItems(self, project_id: Optional[int] = None, batch_size: int = FETCH_BATCH_SIZE) -> Iterator[TodoItem]:
+        """
+        Streams todo items ordered by priority, optionally for one project.
+
+        Parameters:
+        project_id (Optional[int]): The ID of the project to filter by, or None for all todos.
+        batch_size (int): Rows fetched from the database per round trip.
+
+        Returns:
+        Iterator[TodoItem]: TodoItem objects ordered by (priority, todo_id).
+        """
+        return self.dao.iterTodoItems(project_id, batch_size)
+
+    def getTodoItemsPage(self, project_id: Optional[int] = None, after: Optional[Tuple[int, int]] = None, limit: int = 50) -> List[TodoItem]:
+        """
+        Retrieves one page of todo items ordered by priority.
+
+        Parameters:
+        project_id (Optional[int]): The ID of the project to filter by, or None for all todos.
+        after (Optional[Tuple[int, int]]): The (priority, todo_id) of the last item of the previous page.
+        limit (int): The maximum number of items to return.
+
+        Returns:
+        List[TodoItem]: Up to `limit` TodoItem objects; empty once past the last page.
+        """
+        return self.dao.getTodoItemsPage(project_id, after, limit)
+
+    def nextTodos(self, k: int = NEXT_LIMIT, project_id: Optional[int] = None, include_completed: bool = False) -> List[TodoItem]:
+        """
+        Retrieves the todo items to work on next: the top k by priority, oldest first within a priority.
+
+        Parameters:
+        k (int): The number of todo items to return.
+        project_id (Optional[int]): The ID of the project to pick from, or None for all projects.
+        include_completed (bool): Whether completed todo items are considered too.
+
+        Returns:
+        List[TodoItem]: Up to k TodoItem objects; empty if k is less than 1.
+        """
+        if k < 1:
+            return []
+        return self.dao.nextTodoItems(k, project_id, include_completed)
+
+    def changesSince(self, seq: int = 0, limit: int = CHANGES_LIMIT) -> Optional[ChangeSet]:
+        """
+        Retrieves the todo items created, changed or deleted since a change log cursor.
+
+        Renaming a project counts as a change of each of its todo items, since their
+        `title` changes with it.
+
+        Parameters:
+        seq (int): The cursor returned by the previous call, or 0 for all changes.
+        limit (int): The maximum number of change log entries to read.
+
+        Returns:
+        Optional[ChangeSet]: The net change per todo item and the cursor to continue from,
+        or None if the database is sharded or the arguments are invalid.
+        """
+        if self.change_log is None or seq < 0 or limit < 1:
+            return None
+        return self.change_log.changesSince(seq, limit, "todo")
+
+    def compactChangeLog(self, retention_days: Optional[float] = None) -> Optional[Dict[str, int]]:
+        """
+        Drops superseded change log entries and, with a retention, delete entries older than it.
+
+        Parameters:
+        retention_days (Optional[float]): How many days delete entries are kept, or None to keep them all.
+        Consumers whose cursor is older than the dropped entries are told to reload.
+
+        Returns:
+        Optional[Dict[str, int]]: Counts `superseded` and `expired` and the new `pruned_through` cursor,
+        or None if the database is sharded or the retention is negative.
+        """
+        if self.change_log is None or (retention_days is not None and retention_days < 0):
+            return None
+        retention = None if retention_days is None else retention_days * 86400
+        return self.change_log.compactChangeLog(retention)
+
+    def searchTodoItems(self, query: str, project_id: Optional[int] = None, limit: int = SEARCH_LIMIT) -> List[SearchResult]:
+        """
+        Searches todo descriptions and project titles for all of the given terms.
+
+        Parameters:
+        query (str): The search terms; a term ending in `*` matches as a prefix.
+        project_id (Optional[int]): The ID of the project to search within, or None for all todos.
+        limit (int): The maximum number of results to return.
+
+        Returns:
+        List[SearchResult]: Matching todos, best match first, each with a highlighted snippet.
+        """
+        if not query or not isinstance(query, str) or not query.strip():
+            return []
+        if limit < 1:
+            return []
+        return self.dao.searchTodoItems(query.strip(), project_id, limit)
+
     def updateTodoItem(self, todo: TodoItem) -> bool:
         """
         Updates an existing todo item.
@@ -132,9 +389,54 @@ class TodoItemService:
             return False
         if not self.validate_priority(todo.priority):
             return False
-        if todo.project_id is not None and self.project_service.getProjectByTitle(todo.title) is None:
-            return False
-        return self.dao.updateTodoItemById(todo)
+        with UnitOfWork():
+            if todo.project_id is not None and self.project_service.getProjectByTitle(todo.title) is None:
+                return False
+            return self.dao.updateTodoItemById(todo)
+
+    def completeTodoItems(self, todo_ids: Iterable[int], completed: bool = True) -> int:
+        """
+        Marks many todo items completed (or open again) without reading them first.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to change.
+        completed (bool): The state to set.
+
+        Returns:
+        int: The number of todo items whose state changed.
+        """
+        return self.dao.completeTodoItems(todo_ids, completed)
+
+    def setPriority(self, todo_ids: Iterable[int], priority: int) -> Optional[int]:
+        """
+        Sets the priority of many todo items.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to change.
+        priority (int): The new priority level (1-5).
+
+        Returns:
+        Optional[int]: The number of todo items changed, or None if the priority is invalid.
+        """
+        if not self.validate_priority(priority):
+            return None
+        return self.dao.setPriority(todo_ids, int(priority))
+
+    def moveToProject(self, todo_ids: Iterable[int], project_id: int) -> Optional[int]:
+        """
+        Moves many todo items to another project.
+
+        Parameters:
+        todo_ids (Iterable[int]): The IDs of the todo items to move.
+        project_id (int): The ID of the destination project.
+
+        Returns:
+        Optional[int]: The number of todo items moved, or None if the project does not exist.
+        """
+        with UnitOfWork():
+            if self.project_service.getProjectbById(project_id) is None:
+                return None
+            return self.dao.moveToProject(todo_ids, project_id)
 
     def deleteTodoItem(self, todo_id: int) -> bool:
         """
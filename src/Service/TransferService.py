@@ -0,0 +1,320 @@
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+from Models.Project import Project
+from Models.TodoItem import TodoItem
+from Models.TransferResult import TransferResult
+from Service.ProjectService import ProjectService
+from Service.TodoItemService import TodoItemService
+from Utils.db_connection import BATCH_CHUNK_SIZE, FETCH_BATCH_SIZE, _chunks, transaction
+
+FORMATS = ("csv", "jsonl")
+
+# record fields, in column order for CSV; `title` is the owning project's title
+PROJECT_FIELDS = ("project_id", "title")
+TODO_FIELDS = ("todo_id", "title", "description", "priority", "completed", "project_id")
+
+_TRUE = {"1", "true", "yes", "y", "x"}
+_FALSE = {"", "0", "false", "no", "n"}
+
+
+def format_for_path(path: str) -> str:
+    """
+    Picks the transfer format from a file name.
+
+    Parameters:
+    path (str): The file name; `.csv` selects CSV, `.jsonl`, `.ndjson` and `.json` select JSON lines.
+
+    Returns:
+    str: One of `FORMATS`.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    raise ValueError(f"cannot tell the format of {path!r}; use a .csv or .jsonl file")
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    # checked before any row is read, so a bad size cannot stop an import part way
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+
+
+def _write_records(stream: TextIO, fmt: str, fields: Tuple[str, ...], records: Iterable[Dict[str, Any]]) -> int:
+    count = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(stream, fieldnames=fields, lineterminator="\n")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            count += 1
+    else:
+        for record in records:
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _read_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], str]]:
+    # yields (line number, record, error); record is None when the line could not be parsed
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, ""
+        return
+    for lineno, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield lineno, None, f"invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield lineno, None, "expected a JSON object"
+            continue
+        yield lineno, record, ""
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value if value is not None else "").strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"invalid completed value {value!r}")
+
+
+class TransferService:
+    def __init__(self, project_service: Optional[ProjectService] = None,
+                 todo_service: Optional[TodoItemService] = None):
+        self.project_service = project_service or ProjectService()
+        self.todo_service = todo_service or TodoItemService(self.project_service)
+
+    def exportProjects(self, stream: TextIO, fmt: str = "csv") -> TransferResult:
+        """
+        Writes every project to a stream.
+
+        Parameters:
+        stream (TextIO): The text stream to write to (open CSV files with `newline=""`).
+        fmt (str): "csv" or "jsonl".
+
+        Returns:
+        TransferResult: The number of projects written and the time taken.
+        """
+        _check_format(fmt)
+        started = time.perf_counter()
+        rows = _write_records(stream, fmt, PROJECT_FIELDS,
+                              (p.to_dict() for p in self.project_service.getAllProjects()))
+        return TransferResult(rows=rows, seconds=time.perf_counter() - started)
+
+    def exportTodoItems(self, stream: TextIO, fmt: str = "csv", project_id: Optional[int] = None,
+                        batch_size: int = FETCH_BATCH_SIZE) -> TransferResult:
+        """
+        Streams todo items to a stream without loading them all into memory.
+
+        The rows are read inside one read transaction, so the export is a consistent
+        snapshot even while other connections keep writing.
+
+        Parameters:
+        stream (TextIO): The text stream to write to (open CSV files with `newline=""`).
+        fmt (str): "csv" or "jsonl".
+        project_id (Optional[int]): If provided, only this project's todos are exported.
+        batch_size (int): Rows fetched from the database per round trip.
+
+        Returns:
+        TransferResult: The number of todo items written and the time taken.
+        """
+        _check_format(fmt)
+        started = time.perf_counter()
+        with transaction(immediate=False):
+            records = (
+                {
+                    "todo_id": t.todo_id,
+                    "title": t.title,
+                    "description": t.description,
+                    "priority": t.priority,
+                    "completed": 1 if t.completed else 0,
+                    "project_id": t.project_id,
+                }
+                for t in self.todo_service.iterTodoItems(project_id, batch_size)
+            )
+            rows = _write_records(stream, fmt, TODO_FIELDS, records)
+        return TransferResult(rows=rows, seconds=time.perf_counter() - started)
+
+    def importProjects(self, stream: TextIO, fmt: str = "csv", chunk_size: int = BATCH_CHUNK_SIZE) -> TransferResult:
+        """
+        Creates projects from a stream of records with a `title` field.
+
+        Titles that already exist are counted as skipped, so re-importing an export is harmless.
+
+        Parameters:
+        stream (TextIO): The text stream to read from.
+        fmt (str): "csv" or "jsonl".
+        chunk_size (int): Projects inserted per transaction.
+
+        Returns:
+        TransferResult: Rows read and written, with rejected rows in `errors` by line number.
+        """
+        _check_format(fmt)
+        _check_chunk_size(chunk_size)
+        started = time.perf_counter()
+        result = TransferResult()
+        known = {p.title for p in self.project_service.getAllProjects()}
+
+        def valid_rows() -> Iterator[Tuple[int, Project]]:
+            for lineno, record, error in _read_records(stream, fmt):
+                result.rows += 1
+                title = (record or {}).get("title")
+                if record is None:
+                    result.errors[lineno] = error
+                elif not self.project_service.validate_title(title):
+                    result.errors[lineno] = "invalid title"
+                elif title.strip() in known:
+                    result.skipped += 1
+                else:
+                    known.add(title.strip())
+                    yield lineno, Project(project_id=None, title=title.strip())
+
+        for chunk in _chunks(valid_rows(), chunk_size):
+            batch = self.project_service.dao.createProjects((p for _, p in chunk), chunk_size)
+            for index, reason in batch.errors.items():
+                result.errors[chunk[index][0]] = reason
+            result.written += batch.affected
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def importTodoItems(self, stream: TextIO, fmt: str = "csv", chunk_size: int = BATCH_CHUNK_SIZE,
+                        create_projects: bool = False) -> TransferResult:
+        """
+        Creates todo items from a stream of records, such as an earlier export.
+
+        Each record names its project by `title` or, failing that, by `project_id`. All
+        project titles are resolved through one map loaded up front rather than a query
+        per row. `todo_id` is ignored; imported todos get new IDs.
+
+        Parameters:
+        stream (TextIO): The text stream to read from.
+        fmt (str): "csv" or "jsonl".
+        chunk_size (int): Todo items inserted per transaction.
+        create_projects (bool): Create projects named by the records that do not exist yet
+            instead of rejecting their rows.
+
+        Returns:
+        TransferResult: Rows read and written, with rejected rows in `errors` by line number.
+        """
+        _check_format(fmt)
+        _check_chunk_size(chunk_size)
+        started = time.perf_counter()
+        result = TransferResult()
+        projects = {p.title: p.project_id for p in self.project_service.getAllProjects()}
+        project_ids = set(projects.values())
+
+        def resolve(record: Dict[str, Any]) -> Optional[int]:
+            title = record.get("title")
+            if isinstance(title, str) and title.strip():
+                title = title.strip()
+                if title not in projects and create_projects and self.project_service.validate_title(title):
+                    created = self.project_service.createProject(title)
+                    if created is not None:
+                        projects[title] = created.project_id
+                        project_ids.add(created.project_id)
+                return projects.get(title)
+            try:
+                project_id = int(record.get("project_id"))
+            except (TypeError, ValueError):
+                return None
+            return project_id if project_id in project_ids else None
+
+        def valid_rows() -> Iterator[Tuple[int, TodoItem]]:
+            for lineno, record, error in _read_records(stream, fmt):
+                result.rows += 1
+                if record is None:
+                    result.errors[lineno] = error
+                    continue
+                description, priority = record.get("description"), record.get("priority")
+                if not self.todo_service.validate_description(description):
+                    result.errors[lineno] = "invalid description"
+                    continue
+                if not self.todo_service.validate_priority(priority):
+                    result.errors[lineno] = "invalid priority"
+                    continue
+                try:
+                    completed = _parse_bool(record.get("completed"))
+                except ValueError as e:
+                    result.errors[lineno] = str(e)
+                    continue
+                project_id = resolve(record)
+                if project_id is None:
+                    result.errors[lineno] = "project not found"
+                    continue
+                yield lineno, TodoItem(
+                    todo_id=None,
+                    title="",
+                    description=description.strip(),
+                    priority=int(priority),
+                    completed=completed,
+                    project_id=project_id,
+                )
+
+        for chunk in _chunks(valid_rows(), chunk_size):
+            batch = self.todo_service.dao.createTodoItems((t for _, t in chunk), chunk_size)
+            for index, reason in batch.errors.items():
+                result.errors[chunk[index][0]] = reason
+            result.written += batch.affected
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def exportToFile(self, kind: str, path: str, project_id: Optional[int] = None) -> TransferResult:
+        """
+        Exports projects or todo items to a file whose extension picks the format.
+
+        Parameters:
+        kind (str): "projects" or "todos".
+        path (str): The file to write; `.csv` or `.jsonl`.
+        project_id (Optional[int]): For todos, only export this project's todos.
+
+        Returns:
+        TransferResult: The number of rows written and the time taken.
+        """
+        fmt = format_for_path(path)
+        # checked before opening, so an unknown kind leaves the file alone
+        if kind not in ("projects", "todos"):
+            raise ValueError(f"unknown export kind {kind!r}")
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if kind == "projects":
+                return self.exportProjects(f, fmt)
+            return self.exportTodoItems(f, fmt, project_id)
+
+    def importFromFile(self, kind: str, path: str, chunk_size: int = BATCH_CHUNK_SIZE) -> TransferResult:
+        """
+        Imports projects or todo items from a file whose extension picks the format.
+
+        Parameters:
+        kind (str): "projects" or "todos".
+        path (str): The file to read; `.csv` or `.jsonl`.
+        chunk_size (int): Rows inserted per transaction.
+
+        Returns:
+        TransferResult: Rows read and written, with rejected rows in `errors` by line number.
+        """
+        fmt = format_for_path(path)
+        with open(path, encoding="utf-8", newline="") as f:
+            if kind == "projects":
+                return self.importProjects(f, fmt, chunk_size)
+            if kind == "todos":
+                return self.importTodoItems(f, fmt, chunk_size)
+        raise ValueError(f"unknown import kind {kind!r}")
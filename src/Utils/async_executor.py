@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from Utils.db_connection import POOL_SIZE, cancel_scope
+
+T = TypeVar("T")
+
+# reader threads; one pooled connection is left over for the writer
+READER_THREADS = max(1, POOL_SIZE - 1)
+
+# calls that may be queued or running per side before submitters have to wait
+MAX_PENDING = 256
+
+
+def _run_cancellable(event: threading.Event, fn: Callable[..., T], args: tuple, kwargs: dict) -> T:
+    with cancel_scope(event):
+        return fn(*args, **kwargs)
+
+
+class _Side:
+    """One thread pool plus the counters and admission bound that go with it."""
+
+    def __init__(self, name: str, threads: int, max_pending: int):
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix=f"todolist-db-{name}")
+        self.threads = threads
+        self.max_pending = max_pending
+        # asyncio semaphores belong to one event loop, so keep one per loop
+        self.slots: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.timeouts = 0
+
+
+class DatabaseExecutor:
+    """Runs blocking DAO and service calls off the event loop.
+
+    Reads are spread over `readers` threads, each checking out its own pooled
+    connection, so concurrent lookups run in parallel under WAL instead of
+    queueing on one connection. Writes all go through a single writer thread:
+    they run in submission order and never compete with each other for
+    SQLite's write lock. Each side admits at most `max_pending` queued or
+    running calls per event loop; further callers wait for a slot.
+
+    A call that times out or whose coroutine is cancelled is dropped if it has
+    not started yet, and interrupted through `Utils.db_connection.cancel_scope`
+    if it has, so abandoned queries do not keep a thread or a lock busy.
+    """
+
+    def __init__(self, readers: int = READER_THREADS, max_pending: int = MAX_PENDING,
+                 timeout: Optional[float] = None):
+        """Start the reader and writer thread pools.
+
+        Parameters:
+            readers (int): reader threads; keep below the connection pool size
+                so the writer can always get a connection.
+            max_pending (int): bound on queued plus running calls per side.
+            timeout (Optional[float]): default seconds a call may take, queueing
+                included; None waits indefinitely.
+        """
+        if readers < 1 or max_pending < 1:
+            raise ValueError("readers and max_pending must be at least 1")
+        self.timeout = timeout
+        self._reader = _Side("reader", readers, max_pending)
+        self._writer = _Side("writer", 1, max_pending)
+        self._closed = False
+
+    async def read(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """Run a read-only call `fn(*args, **kwargs)` on a reader thread.
+
+        Parameters:
+            fn (Callable): blocking function that only reads.
+            timeout (Optional[float]): overrides the executor's default timeout.
+
+        Returns:
+            The value returned by `fn`.
+
+        Raises:
+            asyncio.TimeoutError: if the call did not finish within the timeout.
+        """
+        return await self._submit(self._reader, fn, args, kwargs, timeout)
+
+    async def write(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """Run a call that writes, `fn(*args, **kwargs)`, on the writer thread.
+
+        Parameters:
+            fn (Callable): blocking function that may write.
+            timeout (Optional[float]): overrides the executor's default timeout.
+
+        Returns:
+            The value returned by `fn`.
+
+        Raises:
+            asyncio.TimeoutError: if the call did not finish within the timeout.
+        """
+        return await self._submit(self._writer, fn, args, kwargs, timeout)
+
+    async def _submit(self, side: _Side, fn: Callable[..., T], args: tuple, kwargs: dict,
+                      timeout: Optional[float]) -> T:
+        if self._closed:
+            raise RuntimeError("DatabaseExecutor is shut down")
+        timeout = self.timeout if timeout is None else timeout
+        event = threading.Event()
+        try:
+            return await asyncio.wait_for(self._dispatch(side, event, fn, args, kwargs), timeout)
+        except asyncio.TimeoutError:
+            event.set()
+            with side.lock:
+                side.timeouts += 1
+            raise
+        except asyncio.CancelledError:
+            event.set()
+            with side.lock:
+                side.cancelled += 1
+            raise
+
+    async def _dispatch(self, side: _Side, event: threading.Event, fn: Callable[..., T], args: tuple,
+                        kwargs: dict) -> T:
+        loop = asyncio.get_running_loop()
+        with side.lock:
+            slots = side.slots.get(loop)
+            if slots is None:
+                slots = side.slots[loop] = asyncio.Semaphore(side.max_pending)
+        await slots.acquire()
+        try:
+            future: Future = side.executor.submit(_run_cancellable, event, fn, args, kwargs)
+        except BaseException:
+            slots.release()
+            raise
+        with side.lock:
+            side.submitted += 1
+
+        def done(f: Future) -> None:
+            # the slot is held until the thread is really finished with the call
+            with side.lock:
+                side.completed += 1
+            try:
+                loop.call_soon_threadsafe(slots.release)
+            except RuntimeError:
+                pass  # the loop has been closed; its semaphore goes with it
+
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting calls and shut both thread pools down.
+
+        Parameters:
+            wait (bool): block until running calls have finished.
+        """
+        self._closed = True
+        self._reader.executor.shutdown(wait=wait, cancel_futures=True)
+        self._writer.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return counters per side.
+
+        Returns:
+            Dict[str, Dict[str, int]]: for `reader` and `writer`: `threads`,
+            `submitted`, `completed`, `cancelled`, `timeouts` and `pending`.
+        """
+        result = {}
+        for name, side in (("reader", self._reader), ("writer", self._writer)):
+            with side.lock:
+                result[name] = {
+                    "threads": side.threads,
+                    "submitted": side.submitted,
+                    "completed": side.completed,
+                    "cancelled": side.cancelled,
+                    "timeouts": side.timeouts,
+                    "pending": side.submitted - side.completed,
+                }
+        return result
+
+
+_executor: Optional[DatabaseExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> DatabaseExecutor:
+    """Return the process-wide executor used by the async DAOs and services, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DatabaseExecutor()
+        return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Shut the process-wide executor down; the next `get_executor()` starts a fresh one."""
+    global _executor
+    with _executor_lock:
+        old, _executor = _executor, None
+    if old is not None:
+        old.shutdown(wait)
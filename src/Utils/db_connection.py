@@ -1,26 +1,1138 @@
+import atexit
+import os
 import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
+import hashlib
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from Utils.instrumentation import InstrumentedConnection
+from Utils.migrations import migrate
 
 
 DB_PATH = "../Databases/TodoList.db"
 
+# environment variables selecting the database: a file path or MEMORY, whether
+# to run the file in memory, and seconds between snapshots back to the file
+DB_ENV_VAR = "TODOLIST_DB"
+MEMORY_ENV_VAR = "TODOLIST_DB_MEMORY"
+SNAPSHOT_INTERVAL_ENV_VAR = "TODOLIST_DB_SNAPSHOT_INTERVAL"
+
+# database location naming a fresh in-memory database with no backing file
+MEMORY = ":memory:"
+
+# the memdb VFS shares one in-memory database between connections with normal
+# file locking (busy_timeout applies); shared-cache databases, the fallback on
+# older SQLite, use table locks that fail at once with "database table is locked"
+_MEMDB_VFS = sqlite3.sqlite_version_info >= (3, 36, 0)
+
+# default bounds for the shared connection pool
+POOL_SIZE = 5
+POOL_TIMEOUT = 30.0
+
+# rows handed to a single executemany() call by the bulk DAO methods
+BATCH_CHUNK_SIZE = 500
+
+# rows pulled per fetchmany() call by the streaming DAO methods
+FETCH_BATCH_SIZE = 256
+
+# errors caused by the data in one row rather than the connection or database
+_ROW_ERRORS = (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError, sqlite3.DataError)
+
+# SQLite VM steps between checks of a cancel scope's event
+CANCEL_CHECK_STEPS = 1000
+
+# per-thread cancellation event installed by `cancel_scope`
+_cancel_state = threading.local()
+
+# per-thread state of the open `transaction()` block
+_tx_state = threading.local()
+
+# per-thread pool selected by `use_pool`
+_route_state = threading.local()
+
+# open routers needing lazy transactions (see `set_lazy_transactions`)
+_lazy_transactions = 0
+
+# callables run whenever a `transaction()` block (or a nested savepoint) rolls back
+_rollback_hooks: List[Callable[[], None]] = []
+
+# environment variable selecting an entry of STORAGE_PROFILES
+PROFILE_ENV_VAR = "TODOLIST_DB_PROFILE"
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """SQLite storage settings applied to every pooled connection when opened.
+
+    Attributes:
+        journal_mode (str): `WAL` lets readers proceed while a writer commits.
+        synchronous (str): fsync level (`OFF`, `NORMAL`, `FULL`).
+        cache_size (int): page cache size; negative values are KiB.
+        mmap_size (int): bytes of the file to memory-map (0 disables).
+        temp_store (str): where temp tables and sort spills live.
+        busy_timeout (int): milliseconds to wait on a locked database.
+        wal_autocheckpoint (int): WAL pages that trigger an automatic checkpoint.
+        journal_size_limit (int): bytes the WAL is truncated to after a checkpoint.
+        checkpoint_interval (int): committed write transactions between explicit
+            passive checkpoints run by the pool (0 disables).
+        auto_vacuum (str): `INCREMENTAL` keeps freed pages on a list that
+            `incremental_vacuum` hands back to the file system. Only takes
+            effect on a new database; an existing one needs a `vacuum()` first.
+    """
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -16000
+    mmap_size: int = 64 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+    wal_autocheckpoint: int = 1000
+    journal_size_limit: int = 64 * 1024 * 1024
+    checkpoint_interval: int = 500
+    auto_vacuum: str = "INCREMENTAL"
+
+    def pragmas(self) -> List[str]:
+        """Return the PRAGMA statements implementing this profile.
+
+        Returns:
+            List[str]: statements to execute on a freshly opened connection.
+        """
+        return [
+            # before journal_mode, which writes the header of a new database
+            f"PRAGMA auto_vacuum = {self.auto_vacuum}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA wal_autocheckpoint = {int(self.wal_autocheckpoint)}",
+            f"PRAGMA journal_size_limit = {int(self.journal_size_limit)}",
+        ]
+
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    # WAL with NORMAL sync: durable against application crashes, fast commits
+    "default": StorageProfile(),
+    # every commit is fsynced, for machines where power loss must not lose writes
+    "durable": StorageProfile(synchronous="FULL"),
+    # throwaway databases (tests, benchmarks): no fsync at all
+    "test": StorageProfile(synchronous="OFF", mmap_size=0, checkpoint_interval=0),
+    # SQLite's stock behaviour, as the application ran before profiles existed
+    "legacy": StorageProfile(
+        journal_mode="DELETE", synchronous="FULL", cache_size=-2000, mmap_size=0,
+        temp_store="DEFAULT", wal_autocheckpoint=1000, journal_size_limit=-1, checkpoint_interval=0,
+        auto_vacuum="NONE",
+    ),
+}
+
+
+def get_storage_profile(name: Optional[str] = None) -> StorageProfile:
+    """Look up a storage profile by name.
+
+    Parameters:
+        name (Optional[str]): profile name; defaults to the `TODOLIST_DB_PROFILE`
+            environment variable, then to `default`.
+
+    Returns:
+        StorageProfile: the selected profile.
+
+    Raises:
+        ValueError: if the name is not a key of `STORAGE_PROFILES`.
+    """
+    name = name or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    try:
+        return STORAGE_PROFILES[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown storage profile {name!r}; expected one of {sorted(STORAGE_PROFILES)}")
+
+
 def _get_db_path() -> Path:
     """Return the file system path to the SQLite database file.
 
     Returns:
-        Path: absolute path to the database file in the repository root.
+        Path: the `TODOLIST_DB` environment variable if set (`:memory:` for a
+        fresh in-memory database), else the database file in the repository root.
     """
+    location = os.environ.get(DB_ENV_VAR)
+    if location:
+        return Path(location)
     # repository root is parent of this DAO folder
     return Path(__file__).resolve().parents[1] / DB_PATH
 
 
+def _env_in_memory() -> bool:
+    return os.environ.get(MEMORY_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_snapshot_interval() -> float:
+    value = os.environ.get(SNAPSHOT_INTERVAL_ENV_VAR)
+    try:
+        return float(value) if value else 0.0
+    except ValueError:
+        raise ValueError(f"{SNAPSHOT_INTERVAL_ENV_VAR} must be a number of seconds, not {value!r}")
+
+
+def _is_healthy(conn: sqlite3.Connection) -> bool:
+    """Return True if `conn` is still open and usable."""
+    try:
+        conn.total_changes
+    except sqlite3.ProgrammingError:
+        return False
+    return True
+
+
+def _is_broken(error: BaseException) -> bool:
+    """Return True if `error` means the connection handle itself is unusable.
+
+    Constraint violations, lock timeouts and bad SQL leave the handle intact;
+    interface/internal errors and generic database errors (e.g. a corrupt or
+    replaced file) do not.
+    """
+    if isinstance(error, (sqlite3.InterfaceError, sqlite3.InternalError)):
+        return True
+    return type(error) is sqlite3.DatabaseError
+
+
+def _close_quietly(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
+
+def _clear_cancel(conn: sqlite3.Connection) -> bool:
+    """Remove a cancel scope's progress handler so cleanup cannot be interrupted.
+
+    Returns:
+        bool: False if the handle turned out to be unusable.
+    """
+    if getattr(conn, "cancel_event", None) is None:
+        return True
+    conn.cancel_event = None
+    try:
+        conn.set_progress_handler(None, 0)
+    except sqlite3.Error:
+        return False
+    return True
+
+
+@contextmanager
+def cancel_scope(event: threading.Event) -> Iterator[threading.Event]:
+    """Make SQLite work started by this thread abort once `event` is set.
+
+    Connections checked out inside the block poll `event` every
+    `CANCEL_CHECK_STEPS` VM steps; once it is set the running statement fails
+    with `sqlite3.OperationalError` ("interrupted") and the transaction is
+    rolled back by `ConnectionPool.connection`. Used by `Utils.async_executor`
+    to cancel work whose caller has gone away.
+
+    Parameters:
+        event (threading.Event): set from any thread to cancel.
+    """
+    previous = getattr(_cancel_state, "event", None)
+    _cancel_state.event = event
+    try:
+        yield event
+    finally:
+        _cancel_state.event = previous
+
+
+class ConnectionPool:
+    """Bounded pool of long-lived sqlite3 connections to one database file.
+
+    Connections are opened lazily up to `max_size`, configured once with the
+    pool's `StorageProfile` when they are opened and then handed out with
+    checkout/return semantics. Callers that find every connection checked out
+    wait up to `timeout` seconds for one to be returned. Broken handles are
+    discarded and transparently replaced. In WAL mode the pool also runs a
+    passive checkpoint every `profile.checkpoint_interval` write transactions so
+    the WAL file stays bounded under sustained writes.
+
+    In memory mode the connections share one in-memory database instead. It is
+    loaded from `path` (with `VACUUM INTO`, which also takes WAL files) when the
+    pool is created, if the file exists, and copied back by `snapshot()`: every
+    `snapshot_interval` seconds if anything was written, and when the pool is
+    closed. A `path` of `:memory:` gives a fresh database that is never saved.
+    Pools for the same location in one process share its in-memory database,
+    which lives until the last of them closes.
+    """
+
+    def __init__(self, path, max_size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT,
+                 profile: Optional[StorageProfile] = None, run_migrations: bool = False,
+                 in_memory: bool = False, snapshot_interval: float = 0.0):
+        """Create an empty pool.
+
+        Parameters:
+            path (str | Path): database file the pooled connections point to,
+                or `:memory:`.
+            max_size (int): maximum number of open connections.
+            timeout (float): seconds to wait for a free connection before failing.
+            profile (Optional[StorageProfile]): storage settings; defaults to the
+                profile selected by `get_storage_profile()`.
+            run_migrations (bool): bring the schema up to date (see
+                `Utils.migrations`) when the first connection is opened.
+            in_memory (bool): run `path` as an in-memory database (see above).
+            snapshot_interval (float): in memory mode, seconds between snapshots
+                back to `path`; 0 only snapshots on close.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.path = str(path)
+        self.max_size = max_size
+        self.timeout = timeout
+        self.profile = profile or get_storage_profile()
+        self.in_memory = in_memory or self.path == MEMORY
+        # file the in-memory database is loaded from and saved to
+        self.snapshot_path = self.path if self.in_memory and self.path != MEMORY else None
+        self.snapshot_interval = snapshot_interval
+        self._wal = self.profile.journal_mode.upper() == "WAL" and not self.in_memory
+        self._writes_since_checkpoint = 0
+        self._checkpoints = 0
+        self._idle: List[sqlite3.Connection] = []
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._opens = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._discards = 0
+        self._run_migrations = run_migrations
+        self._migrate_lock = threading.Lock()
+        self._writes = 0
+        self._snapshot_writes = 0
+        self._snapshots = 0
+        self._snapshot_errors = 0
+        self._snapshot_lock = threading.Lock()
+        self._anchor: Optional[sqlite3.Connection] = None
+        self._target = self.path
+        if self.in_memory:
+            name = "todolist-" + (hashlib.sha1(str(Path(self.snapshot_path).resolve()).encode()).hexdigest()[:16]
+                                  if self.snapshot_path else "memory")
+            self._target = f"file:/{name}?vfs=memdb" if _MEMDB_VFS else f"file:{name}?mode=memory&cache=shared"
+            self._anchor = self._open_memory()
+            if self.snapshot_path and snapshot_interval > 0:
+                self._stop_snapshots = threading.Event()
+                threading.Thread(target=self._snapshot_loop, name="todolist-db-snapshot", daemon=True).start()
+
+    def _open_memory(self) -> sqlite3.Connection:
+        """Open the in-memory database, filling it from `snapshot_path` if it is new and the file exists.
+
+        Returns:
+            sqlite3.Connection: connection that keeps the database alive until the pool closes.
+        """
+        anchor = sqlite3.connect(self._target, uri=True, check_same_thread=False)
+        # a database another pool already holds is in use, not loaded again
+        fresh = anchor.execute("PRAGMA page_count").fetchone()[0] == 0
+        if fresh and self.snapshot_path and os.path.exists(self.snapshot_path):
+            source = sqlite3.connect(Path(self.snapshot_path).resolve().as_uri(), uri=True)
+            try:
+                if _MEMDB_VFS:
+                    # a backup copies the header of a WAL file as is, and memdb
+                    # cannot open a WAL database: every connection would fail on
+                    # its first PRAGMA. VACUUM INTO writes a rollback-journal copy
+                    source.execute("VACUUM INTO ?", (self._target,))
+                else:
+                    source.backup(anchor)
+            except BaseException:
+                _close_quietly(anchor)
+                raise
+            finally:
+                source.close()
+        return anchor
+
+    def snapshot(self, path=None) -> Optional[str]:
+        """Copy the in-memory database to a file with the sqlite3 backup API.
+
+        The copy is written beside the target and renamed over it, so a crash
+        mid-copy never leaves a torn file behind.
+
+        Parameters:
+            path (str | Path | None): file to write; defaults to the file the
+                database was loaded from.
+
+        Returns:
+            Optional[str]: the file written, or None if the pool is not in
+            memory mode or has no file to write to.
+        """
+        target = str(path) if path is not None else self.snapshot_path
+        if not self.in_memory or target is None:
+            return None
+        with self._snapshot_lock:
+            if self._anchor is None:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            writes = self._writes
+            partial = f"{target}.snapshot"
+            dest = sqlite3.connect(partial)
+            try:
+                self._anchor.backup(dest)
+            finally:
+                dest.close()
+            os.replace(partial, target)
+            with self._cond:
+                self._snapshots += 1
+                if path is None:
+                    self._snapshot_writes = writes
+        return target
+
+    def _snapshot_loop(self) -> None:
+        while not self._stop_snapshots.wait(self.snapshot_interval):
+            if self._writes == self._snapshot_writes:
+                continue
+            try:
+                self.snapshot()
+            except (sqlite3.Error, OSError):
+                with self._cond:
+                    self._snapshot_errors += 1
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a new connection.
+
+        Returns:
+            sqlite3.Connection: connection with row_factory and PRAGMAs applied.
+        """
+        conn = sqlite3.connect(
+            self._target, timeout=self.profile.busy_timeout / 1000.0, check_same_thread=False,
+            factory=InstrumentedConnection, uri=self.in_memory,
+        )
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            for pragma in self.profile.pragmas():
+                conn.execute(pragma)
+            if self._run_migrations:
+                with self._migrate_lock:
+                    if self._run_migrations:
+                        migrate(conn)
+                        self._run_migrations = False
+        except BaseException:
+            _close_quietly(conn)
+            raise
+        with self._cond:
+            self._opens += 1
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check a connection out of the pool, opening one if allowed.
+
+        Returns:
+            sqlite3.Connection: a connection owned by the caller until `release`.
+
+        Raises:
+            TimeoutError: if no connection became available within `timeout`.
+        """
+        started = time.perf_counter()
+        conn = None
+        deadline = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise sqlite3.ProgrammingError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                now = time.monotonic()
+                if deadline is None:
+                    self._waits += 1
+                    deadline = now + self.timeout
+                remaining = deadline - now
+                if remaining <= 0:
+                    raise TimeoutError(f"No database connection available after {self.timeout}s")
+                self._cond.wait(remaining)
+                self._wait_time += time.monotonic() - now
+            self._checkouts += 1
+
+        if conn is not None and not _is_healthy(conn):
+            with self._cond:
+                self._discards += 1
+            conn = None
+        if conn is None:
+            try:
+                conn = self._open_connection()
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+        conn.acquire_time = time.perf_counter() - started
+        event = getattr(_cancel_state, "event", None)
+        if event is not None:
+            # a set event makes the running statement fail with "interrupted"
+            conn.set_progress_handler(event.is_set, CANCEL_CHECK_STEPS)
+            conn.cancel_event = event
+        return conn
+
+    def release(self, conn: sqlite3.Connection, broken: bool = False) -> None:
+        """Return a checked-out connection to the pool.
+
+        Parameters:
+            conn (sqlite3.Connection): connection previously returned by `acquire`.
+            broken (bool): discard the connection instead of reusing it.
+        """
+        if not broken and not _clear_cancel(conn):
+            broken = True
+        if not broken:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                broken = True
+        with self._cond:
+            if broken or self._closed:
+                if broken:
+                    self._discards += 1
+                self._size -= 1
+                _close_quietly(conn)
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for one transaction.
+
+        Commits when the block exits normally, rolls back on error and always
+        returns the connection to the pool.
+        """
+        conn = self.acquire()
+        broken = False
+        changes = conn.total_changes
+        try:
+            yield conn
+            conn.commit()
+            if conn.total_changes != changes:
+                with self._cond:
+                    self._writes += 1
+                if self._wal:
+                    self._after_write(conn)
+        except BaseException as e:
+            broken = _is_broken(e) or not _clear_cancel(conn)
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def _after_write(self, conn: sqlite3.Connection) -> None:
+        """Count a committed write and checkpoint once the interval is reached."""
+        interval = self.profile.checkpoint_interval
+        if interval <= 0:
+            return
+        with self._cond:
+            self._writes_since_checkpoint += 1
+            if self._writes_since_checkpoint < interval:
+                return
+            self._writes_since_checkpoint = 0
+        self.checkpoint(conn=conn)
+
+    def checkpoint(self, mode: str = "PASSIVE", conn: Optional[sqlite3.Connection] = None) -> Optional[tuple]:
+        """Copy committed WAL frames back into the database file.
+
+        Parameters:
+            mode (str): `PASSIVE` never blocks writers; `TRUNCATE` waits for
+                readers and then resets the WAL file to zero bytes.
+            conn (Optional[sqlite3.Connection]): connection to use; one is
+                checked out when omitted.
+
+        Returns:
+            Optional[tuple]: `(busy, wal_frames, checkpointed_frames)` as reported
+            by SQLite, or None when the database is not in WAL mode.
+        """
+        if not self._wal:
+            return None
+        if mode.upper() not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode {mode!r}")
+        if conn is None:
+            conn = self.acquire()
+            try:
+                return self.checkpoint(mode, conn)
+            finally:
+                self.release(conn)
+        row = conn.execute(f"PRAGMA wal_checkpoint({mode.upper()})").fetchone()
+        with self._cond:
+            self._checkpoints += 1
+        return tuple(row)
+
+    def incremental_vacuum(self, pages: int = 0) -> int:
+        """Return free pages at the end of the file to the file system.
+
+        Runs in a transaction of its own, so a small `pages` bounds how long
+        it holds the write lock. Does nothing unless the database uses
+        `auto_vacuum = INCREMENTAL` (see `StorageProfile.auto_vacuum`).
+
+        Parameters:
+            pages (int): most pages to release; 0 releases every free page.
+
+        Returns:
+            int: number of pages released.
+        """
+        conn = self.acquire()
+        broken = False
+        try:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if before:
+                # the sqlite3 module steps a statement without result columns only
+                # once, which releases a single page; executescript runs it to the end
+                conn.executescript(f"PRAGMA incremental_vacuum({int(pages)})")
+            return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        except BaseException as e:
+            broken = _is_broken(e)
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def vacuum(self) -> None:
+        """Rebuild the database file, dropping every free page.
+
+        Also switches an existing database to the profile's `auto_vacuum`
+        mode, which a plain PRAGMA cannot do once tables exist. Rewrites the
+        whole file and blocks every other writer while it runs.
+        """
+        conn = self.acquire()
+        broken = False
+        try:
+            conn.executescript(f"PRAGMA auto_vacuum = {self.profile.auto_vacuum}; VACUUM;")
+        except BaseException as e:
+            broken = _is_broken(e)
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def close(self) -> None:
+        """Close idle connections and refuse further checkouts.
+
+        Connections still checked out are closed when they are released. In
+        memory mode the database is snapshotted to its file first if anything
+        was written since the last snapshot.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+        if self._anchor is not None:
+            if hasattr(self, "_stop_snapshots"):
+                self._stop_snapshots.set()
+            try:
+                if self.snapshot_path and self._writes != self._snapshot_writes:
+                    self.snapshot()
+            finally:
+                with self._snapshot_lock:
+                    anchor, self._anchor = self._anchor, None
+                if anchor is not None:
+                    _close_quietly(anchor)
+
+    def stats(self) -> Dict[str, float]:
+        """Return a snapshot of pool counters.
+
+        Returns:
+            Dict[str, float]: `opens`, `checkouts`, `waits`, `wait_time`,
+            `discards`, `checkpoints`, committed `writes`, `snapshots` and
+            failed periodic `snapshot_errors`, plus the current `size` and
+            number of `idle` connections.
+        """
+        with self._cond:
+            return {
+                "opens": self._opens,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "wait_time": self._wait_time,
+                "discards": self._discards,
+                "checkpoints": self._checkpoints,
+                "writes": self._writes,
+                "snapshots": self._snapshots,
+                "snapshot_errors": self._snapshot_errors,
+                "size": self._size,
+                "idle": len(self._idle),
+                "max_size": self.max_size,
+            }
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use.
+
+    Returns:
+        ConnectionPool: pool bound to the configured database file.
+    """
+    global _pool
+    pool = _pool
+    if pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(_get_db_path(), run_migrations=True, in_memory=_env_in_memory(),
+                                       snapshot_interval=_env_snapshot_interval())
+            pool = _pool
+    return pool
+
+
+def configure_pool(path=None, max_size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT,
+                   profile: Optional[StorageProfile] = None, in_memory: Optional[bool] = None,
+                   snapshot_interval: Optional[float] = None) -> ConnectionPool:
+    """Replace the process-wide pool, closing the previous one.
+
+    Parameters:
+        path (str | Path | None): database file or `:memory:`; defaults to `_get_db_path()`.
+        max_size (int): maximum number of open connections.
+        timeout (float): seconds to wait for a free connection.
+        profile (Optional[StorageProfile]): storage settings; defaults to the
+            profile named by `TODOLIST_DB_PROFILE`.
+        in_memory (Optional[bool]): run the database in memory (see
+            `ConnectionPool`); defaults to `TODOLIST_DB_MEMORY`.
+        snapshot_interval (Optional[float]): seconds between snapshots in memory
+            mode; defaults to `TODOLIST_DB_SNAPSHOT_INTERVAL`, else on close only.
+
+    Returns:
+        ConnectionPool: the newly installed pool.
+    """
+    global _pool
+    if in_memory is None:
+        in_memory = _env_in_memory()
+    if snapshot_interval is None:
+        snapshot_interval = _env_snapshot_interval()
+    with _pool_lock:
+        if _pool is not None:
+            # closed first so an in-memory database is saved before it can be loaded again
+            _pool.close()
+        _pool = ConnectionPool(path or _get_db_path(), max_size=max_size, timeout=timeout, profile=profile,
+                               run_migrations=True, in_memory=in_memory, snapshot_interval=snapshot_interval)
+        return _pool
+
+
+def close_pool() -> None:
+    """Close the process-wide pool; the next `_get_conn()` opens a fresh one."""
+    global _pool
+    with _pool_lock:
+        old, _pool = _pool, None
+    if old is not None:
+        old.close()
+
+
+def pool_stats() -> Dict[str, float]:
+    """Return counters for the process-wide pool (see `ConnectionPool.stats`)."""
+    return get_pool().stats()
+
+
+def checkpoint(mode: str = "PASSIVE") -> Optional[tuple]:
+    """Checkpoint the process-wide pool's WAL (see `ConnectionPool.checkpoint`)."""
+    return get_pool().checkpoint(mode)
+
+
+def snapshot(path=None) -> Optional[str]:
+    """Save the process-wide in-memory database to disk (see `ConnectionPool.snapshot`)."""
+    return get_pool().snapshot(path)
+
+
+def incremental_vacuum(pages: int = 0) -> int:
+    """Release free pages of the database calls are routed to (see `ConnectionPool.incremental_vacuum`)."""
+    return _current_pool().incremental_vacuum(pages)
+
+
+def vacuum() -> None:
+    """Rebuild the database file this thread is routed to (see `ConnectionPool.vacuum`)."""
+    _current_pool().vacuum()
+
+
+@contextmanager
+def _savepoint(conn: sqlite3.Connection, name: str = "sp") -> Iterator[sqlite3.Connection]:
+    """Run a block inside a SAVEPOINT, undoing only its changes on error.
+
+    Parameters:
+        conn (sqlite3.Connection): connection with an open transaction.
+        name (str): savepoint name.
+    """
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {name}")
+        conn.execute(f"RELEASE {name}")
+        raise
+    conn.execute(f"RELEASE {name}")
+
+
+def add_rollback_hook(hook: Callable[[], None]) -> None:
+    """Call `hook()` whenever a `transaction()` block or nested block rolls back.
+
+    Lets in-process caches drop entries that were filled from writes which
+    were later undone.
+    """
+    if hook not in _rollback_hooks:
+        _rollback_hooks.append(hook)
+
+
+def remove_rollback_hook(hook: Callable[[], None]) -> None:
+    """Unregister a hook added with `add_rollback_hook`."""
+    if hook in _rollback_hooks:
+        _rollback_hooks.remove(hook)
+
+
+def _run_rollback_hooks() -> None:
+    for hook in list(_rollback_hooks):
+        hook()
+
+
+class _Transaction:
+    """This thread's open `transaction()` block: one connection per pool it has touched."""
+
+    def __init__(self, immediate: bool):
+        self.immediate = immediate
+        self.depth = 0
+        # pool -> (pool.connection() context manager, its connection), in binding order
+        self.conns: Dict[ConnectionPool, Tuple[Any, sqlite3.Connection]] = {}
+
+    def bind(self, pool: "ConnectionPool") -> sqlite3.Connection:
+        """Return the block's connection to `pool`, beginning a transaction on it first if needed."""
+        entry = self.conns.get(pool)
+        if entry is not None:
+            return entry[1]
+        block = pool.connection()
+        conn = block.__enter__()
+        try:
+            conn.execute("BEGIN IMMEDIATE" if self.immediate else "BEGIN")
+            # a pool joined inside nested blocks gets their savepoints too
+            for level in range(1, self.depth + 1):
+                conn.execute(f"SAVEPOINT tx_{level}")
+        except BaseException:
+            block.__exit__(*sys.exc_info())
+            raise
+        self.conns[pool] = (block, conn)
+        return conn
+
+    def end_savepoint(self, failed: bool) -> None:
+        for _, conn in self.conns.values():
+            if failed:
+                conn.execute(f"ROLLBACK TO tx_{self.depth}")
+            conn.execute(f"RELEASE tx_{self.depth}")
+
+    def finish(self, exc_info: tuple) -> None:
+        """Commit every bound connection, or roll them all back if `exc_info` holds an error.
+
+        Pools commit in the order they were bound; if one commit fails, the
+        pools not yet committed are rolled back and the error is raised.
+        """
+        error: Optional[BaseException] = None
+        for block, _ in self.conns.values():
+            if exc_info[0] is None:
+                try:
+                    block.__exit__(None, None, None)
+                except BaseException as e:
+                    error, exc_info = e, sys.exc_info()
+            else:
+                try:
+                    block.__exit__(*exc_info)
+                except BaseException:
+                    pass
+        if error is not None:
+            raise error
+
+
+def _current_pool() -> "ConnectionPool":
+    return getattr(_route_state, "pool", None) or get_pool()
+
+
+@contextmanager
+def use_pool(pool: "ConnectionPool") -> Iterator["ConnectionPool"]:
+    """Send this thread's `_get_conn()` and `transaction()` calls to `pool` inside the block.
+
+    Lets a routing layer (see `Utils.sharding`) run the ordinary DAO methods
+    against one of several databases.
+
+    Parameters:
+        pool (ConnectionPool): pool to use instead of the process-wide one.
+    """
+    previous = getattr(_route_state, "pool", None)
+    _route_state.pool = pool
+    try:
+        yield pool
+    finally:
+        _route_state.pool = previous
+
+
+def set_lazy_transactions(enabled: bool) -> None:
+    """Let `transaction()` blocks opened outside `use_pool` wait for their first statement.
+
+    Such a block then takes no connection up front; each pool its DAO calls
+    are routed to joins it when first used. Turned on while a shard router is
+    open, where the database is only known once a DAO has routed the call.
+    Calls are counted, so every `True` needs a matching `False`.
+    """
+    global _lazy_transactions
+    with _pool_lock:
+        _lazy_transactions = max(0, _lazy_transactions + (1 if enabled else -1))
+
+
+@contextmanager
+def transaction(immediate: bool = True) -> Iterator[Optional[sqlite3.Connection]]:
+    """Group every DAO call made by this thread inside the block into one transaction.
+
+    While the block is open, `_get_conn()` on this thread hands out the same
+    connection without committing, so the calls share one BEGIN/COMMIT (and
+    one fsync) instead of one each. The transaction commits when the outermost
+    block exits normally and rolls back on error. Nested blocks become
+    savepoints: an error inside one undoes only that block's changes.
+
+    Calls routed to another pool with `use_pool` get a connection of their own
+    in the same block, committed or rolled back with the rest; the commits of
+    different databases are not atomic with each other.
+
+    Parameters:
+        immediate (bool): take the write lock at BEGIN rather than at the first
+            write, so the block cannot fail half way with SQLITE_BUSY.
+
+    Returns:
+        ContextManager[Optional[sqlite3.Connection]]: the connection bound to
+        the block; None for a lazy block (see `set_lazy_transactions`).
+    """
+    lazy = _lazy_transactions and getattr(_route_state, "pool", None) is None
+    tx: Optional[_Transaction] = getattr(_tx_state, "tx", None)
+    if tx is not None:
+        tx.depth += 1
+        try:
+            for _, conn in tx.conns.values():
+                conn.execute(f"SAVEPOINT tx_{tx.depth}")
+            yield None if lazy else tx.bind(_current_pool())
+        except BaseException:
+            try:
+                tx.end_savepoint(failed=True)
+            finally:
+                _run_rollback_hooks()
+            raise
+        else:
+            tx.end_savepoint(failed=False)
+        finally:
+            tx.depth -= 1
+        return
+    tx = _Transaction(immediate)
+    try:
+        conn = None if lazy else tx.bind(_current_pool())
+        _tx_state.tx = tx
+        try:
+            yield conn
+        finally:
+            _tx_state.tx = None
+    except BaseException:
+        try:
+            tx.finish(sys.exc_info())
+        finally:
+            _run_rollback_hooks()
+        raise
+    try:
+        tx.finish((None, None, None))
+    except BaseException:
+        _run_rollback_hooks()
+        raise
+
+
+def in_transaction() -> bool:
+    """Return True if this thread is inside a `transaction()` block."""
+    return getattr(_tx_state, "tx", None) is not None
+
+
+def joined_connection(pool: "ConnectionPool") -> Optional[sqlite3.Connection]:
+    """Return this thread's `transaction()` connection to `pool`, or None if the block has not touched `pool`.
+
+    Lets a lookup read through the block when the block may have written
+    what it looks for, and through a pooled connection of its own otherwise.
+    """
+    tx = getattr(_tx_state, "tx", None)
+    entry = tx.conns.get(pool) if tx is not None else None
+    return entry[1] if entry is not None else None
+
+
+class _Rollback(Exception):
+    """Thrown into a `transaction()` block to undo it without an error escaping."""
+
+
+class UnitOfWork:
+    """One explicit transaction shared by every DAO and service call made inside it.
+
+    A thin handle on `transaction()`: on entry this thread's DAOs start
+    sharing one connection, and the whole unit commits once when the block
+    exits (one BEGIN/COMMIT and one fsync for a multi-step action). An error
+    rolls it back. A unit opened inside another unit, or inside any
+    `transaction()` block, becomes a savepoint of the enclosing one.
+
+        with UnitOfWork() as uow:
+            project = project_dao.createProject(title)
+            with uow.savepoint() as step:
+                todo_dao.createTodoItems(items)
+                if not ok:
+                    step.rollback()
+    """
+
+    def __init__(self, immediate: bool = True):
+        """
+        Parameters:
+            immediate (bool): take the write lock at BEGIN (see `transaction`);
+                ignored when the unit is nested.
+        """
+        self.immediate = immediate
+        self.conn: Optional[sqlite3.Connection] = None
+        self.nested = False
+        self._block = None
+        self._rollback = False
+
+    def __enter__(self) -> "UnitOfWork":
+        if self._block is not None:
+            raise RuntimeError("UnitOfWork is already open")
+        self.nested = in_transaction()
+        self._rollback = False
+        self._block = transaction(self.immediate)
+        self.conn = self._block.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        block, self._block, self.conn = self._block, None, None
+        if exc_type is None and self._rollback:
+            try:
+                block.__exit__(_Rollback, _Rollback(), None)
+            except _Rollback:
+                pass
+            return False
+        return bool(block.__exit__(exc_type, exc, tb))
+
+    @property
+    def active(self) -> bool:
+        """True while the unit's block is open."""
+        return self._block is not None
+
+    def savepoint(self) -> "UnitOfWork":
+        """Return a nested unit; entering it opens a savepoint inside this one."""
+        if not self.active:
+            raise RuntimeError("UnitOfWork is not open")
+        return UnitOfWork(self.immediate)
+
+    def rollback(self) -> None:
+        """Undo the unit's changes when its block exits, without raising.
+
+        For a nested unit only the savepoint's changes are undone; the
+        enclosing unit carries on.
+        """
+        if not self.active:
+            raise RuntimeError("UnitOfWork is not open")
+        self._rollback = True
+
+
+@contextmanager
+def _joined(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    # the enclosing transaction() block owns commit and rollback
+    yield conn
+
+
+def _execute_as(conn: sqlite3.Connection, row_factory, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+    """Execute `sql` on a fresh cursor whose rows are built by `row_factory`.
+
+    Lets DAOs construct model objects directly from result tuples instead of
+    going through `sqlite3.Row` and `dict`.
+    """
+    cur = conn.cursor()
+    cur.row_factory = row_factory
+    return cur.execute(sql, params)
+
+
+def _chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of at most `size` items from `rows`."""
+    if size < 1:
+        raise ValueError("chunk size must be at least 1")
+    it = iter(rows)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _execute_batch(conn: sqlite3.Connection, sql: str, rows: Iterable[Sequence[Any]],
+                   chunk_size: int = BATCH_CHUNK_SIZE, key_index: Optional[int] = None,
+                   ) -> Tuple[List[Optional[int]], Dict[int, str], int]:
+    """Execute `sql` once per parameter row inside the caller's transaction.
+
+    Rows are sent through `executemany` in chunks of `chunk_size`. If a chunk
+    fails because of the data in some row, the chunk is rolled back to its
+    savepoint and replayed row by row so only the offending rows are skipped.
+    Errors that are not row specific (locking, I/O) propagate and abort the
+    whole batch.
+
+    Parameters:
+        conn (sqlite3.Connection): connection to execute on.
+        sql (str): single-row INSERT/UPDATE/DELETE statement.
+        rows (Iterable[Sequence]): parameters for each execution.
+        chunk_size (int): rows per `executemany` call.
+        key_index (Optional[int]): position of the row's id within its
+            parameters (UPDATE/DELETE); when None the rowid assigned by each
+            INSERT is reported instead.
+
+    Returns:
+        Tuple[List[Optional[int]], Dict[int, str], int]: per-row ids (None for
+        failed rows), a map of failed row index to error message, and the total
+        affected row count.
+    """
+    if not conn.in_transaction:
+        # take the write lock up front instead of upgrading mid-batch
+        conn.execute("BEGIN IMMEDIATE")
+    ids: List[Optional[int]] = []
+    errors: Dict[int, str] = {}
+    affected = 0
+    start = 0
+    for chunk in _chunks(rows, chunk_size):
+        try:
+            with _savepoint(conn, "batch_chunk"):
+                cur = conn.executemany(sql, chunk)
+            affected += max(cur.rowcount, 0)
+            if key_index is None:
+                # the chunk holds the write lock, so its rowids are consecutive
+                last = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                ids.extend(range(last - len(chunk) + 1, last + 1))
+            else:
+                ids.extend(params[key_index] for params in chunk)
+        except _ROW_ERRORS:
+            for offset, params in enumerate(chunk):
+                try:
+                    with _savepoint(conn, "batch_row"):
+                        cur = conn.execute(sql, params)
+                except _ROW_ERRORS as e:
+                    errors[start + offset] = str(e)
+                    ids.append(None)
+                    continue
+                affected += max(cur.rowcount, 0)
+                ids.append(cur.lastrowid if key_index is None else params[key_index])
+        start += len(chunk)
+    return ids, errors, affected
+
+
 def _get_conn():
-    """Create and return a sqlite3.Connection to the configured DB.
+    """Check out a pooled connection to the configured DB.
+
+    Use as `with _get_conn() as conn:`; the transaction is committed when the
+    block exits normally, rolled back on error, and the connection is returned
+    to the pool either way. Inside a `transaction()` block the block's
+    connection is returned instead and committing is left to the block.
 
     Returns:
-        sqlite3.Connection: connection object with row_factory set to sqlite3.Row
+        ContextManager[sqlite3.Connection]: connection with row_factory set to sqlite3.Row
     """
-    p = _get_db_path()
-    conn = sqlite3.connect(str(p))
-    conn.row_factory = sqlite3.Row
-    return conn
\ No newline at end of file
+    tx = getattr(_tx_state, "tx", None)
+    if tx is not None:
+        return _joined(tx.bind(_current_pool()))
+    return _current_pool().connection()
+
+
+atexit.register(close_pool)
@@ -0,0 +1,392 @@
+import contextlib
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# environment variables controlling the instrumentation
+ENABLED_ENV_VAR = "TODOLIST_INSTRUMENT"
+SLOW_QUERY_MS_ENV_VAR = "TODOLIST_SLOW_QUERY_MS"
+SLOW_QUERY_LOG_ENV_VAR = "TODOLIST_SLOW_QUERY_LOG"
+
+DEFAULT_SLOW_QUERY_MS = 100.0
+
+# upper bounds (ms) of the latency histogram buckets; a final bucket catches the rest
+BUCKETS_MS = (0.1, 0.5, 1.0, 5.0, 10.0, 50.0, 100.0, 500.0, 1000.0)
+
+slow_query_logger = logging.getLogger("todolist.slow_queries")
+slow_query_logger.addHandler(logging.NullHandler())
+
+# source files whose frames are skipped when attributing a statement to a DAO method;
+# contextlib's, so the BEGIN and COMMIT of `with transaction():` count for the method using it
+_INTERNAL_FILES = {
+    str(Path(__file__).resolve()),
+    str(Path(__file__).resolve().with_name("db_connection.py")),
+    contextlib.__file__,
+}
+# pool methods that issue statements of their own; reported under ConnectionPool
+_POOL_METHODS = {"_open_connection", "checkpoint", "release"}
+
+
+class QueryRecord:
+    """One executed statement, as passed to instrumentation hooks.
+
+    Attributes:
+        label (str): calling method, e.g. `TodoItemDAO.getTodoItemById`.
+        sql (str): statement text.
+        params (str): shape of the bound parameters, e.g. `(5)` or `500 x (5)`.
+        rows (int): rows returned (SELECT) or changed (DML).
+        elapsed (float): seconds spent executing and fetching.
+        acquire (float): seconds spent checking the connection out of the pool,
+            charged to the first statement run after each checkout.
+        error (Optional[str]): exception class name if the statement failed.
+    """
+
+    __slots__ = ("label", "sql", "params", "rows", "elapsed", "acquire", "error")
+
+    def __init__(self, label: str, sql: str, params: str, acquire: float = 0.0):
+        self.label = label
+        self.sql = sql
+        self.params = params
+        self.rows = 0
+        self.elapsed = 0.0
+        self.acquire = acquire
+        self.error: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return (f"QueryRecord(label={self.label!r}, rows={self.rows}, elapsed_ms={self.elapsed * 1000:.3f}, "
+                f"params={self.params!r}, sql={self.sql!r})")
+
+
+class _LabelStats:
+    __slots__ = ("count", "total", "max", "rows", "acquire", "errors", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.acquire = 0.0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def percentile_ms(self, pct: float) -> float:
+        """Upper bound of the histogram bucket holding the `pct` percentile."""
+        target = self.count * pct / 100.0
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target and n:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max * 1000.0
+        return 0.0
+
+
+class QueryStats:
+    """Aggregates `QueryRecord`s into per-method counters and latency histograms."""
+
+    def __init__(self, recent_slow: int = 50):
+        self._lock = threading.Lock()
+        self._by_label: Dict[str, _LabelStats] = {}
+        self.slow: Deque[QueryRecord] = deque(maxlen=recent_slow)
+
+    def record(self, rec: QueryRecord) -> None:
+        ms = rec.elapsed * 1000.0
+        bucket = len(BUCKETS_MS)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                bucket = i
+                break
+        with self._lock:
+            s = self._by_label.get(rec.label)
+            if s is None:
+                s = self._by_label[rec.label] = _LabelStats()
+            s.count += 1
+            s.total += rec.elapsed
+            s.max = max(s.max, rec.elapsed)
+            s.rows += rec.rows
+            s.acquire += rec.acquire
+            s.errors += rec.error is not None
+            s.buckets[bucket] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-method aggregates.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: label -> `count`, `total_ms`, `mean_ms`,
+            `p50_ms`, `p99_ms` (histogram bucket bounds), `max_ms`, `rows`,
+            `acquire_ms`, `errors` and the raw `histogram`.
+        """
+        with self._lock:
+            return {
+                label: {
+                    "count": s.count,
+                    "total_ms": s.total * 1000.0,
+                    "mean_ms": s.total * 1000.0 / s.count,
+                    "p50_ms": s.percentile_ms(50),
+                    "p99_ms": s.percentile_ms(99),
+                    "max_ms": s.max * 1000.0,
+                    "rows": s.rows,
+                    "acquire_ms": s.acquire * 1000.0,
+                    "errors": s.errors,
+                    "histogram": dict(zip([f"<={b:g}ms" for b in BUCKETS_MS] + ["slower"], s.buckets)),
+                }
+                for label, s in self._by_label.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._by_label.clear()
+            self.slow.clear()
+
+
+class _Settings:
+    def __init__(self):
+        self.enabled = os.environ.get(ENABLED_ENV_VAR, "1").lower() not in ("0", "false", "no", "off")
+        self.slow_query_seconds = float(os.environ.get(SLOW_QUERY_MS_ENV_VAR, DEFAULT_SLOW_QUERY_MS)) / 1000.0
+
+
+_settings = _Settings()
+_stats = QueryStats()
+
+
+def _log_slow_query(rec: QueryRecord) -> None:
+    if rec.elapsed >= _settings.slow_query_seconds:
+        _stats.slow.append(rec)
+        slow_query_logger.warning("slow query %.1f ms in %s rows=%d params=%s sql=%s",
+                                  rec.elapsed * 1000.0, rec.label, rec.rows, rec.params, rec.sql)
+
+
+_hooks: List[Callable[[QueryRecord], None]] = [_stats.record, _log_slow_query]
+
+if os.environ.get(SLOW_QUERY_LOG_ENV_VAR):
+    _handler = logging.FileHandler(os.environ[SLOW_QUERY_LOG_ENV_VAR])
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    slow_query_logger.addHandler(_handler)
+    slow_query_logger.setLevel(logging.WARNING)
+
+
+def add_hook(hook: Callable[[QueryRecord], None]) -> None:
+    """Register `hook` to be called with every finished `QueryRecord`."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[QueryRecord], None]) -> None:
+    """Unregister a hook previously passed to `add_hook`."""
+    _hooks.remove(hook)
+
+
+def set_enabled(enabled: bool) -> None:
+    """Turn statement instrumentation on or off for the whole process."""
+    _settings.enabled = bool(enabled)
+
+
+def set_slow_query_threshold(ms: float) -> None:
+    """Log statements that take at least `ms` milliseconds."""
+    _settings.slow_query_seconds = ms / 1000.0
+
+
+def get_query_stats() -> Dict[str, Dict[str, Any]]:
+    """Return per-method aggregates (see `QueryStats.snapshot`)."""
+    return _stats.snapshot()
+
+
+def recent_slow_queries() -> List[QueryRecord]:
+    """Return the most recent statements that exceeded the slow-query threshold."""
+    return list(_stats.slow)
+
+
+def reset_query_stats() -> None:
+    """Discard all aggregated statistics."""
+    _stats.reset()
+
+
+def report() -> str:
+    """Format the aggregated statistics as a table, slowest methods first.
+
+    Returns:
+        str: human readable report.
+    """
+    snapshot = get_query_stats()
+    if not snapshot:
+        return "No queries recorded" + ("" if _settings.enabled else " (instrumentation disabled)")
+    lines = [f"{'method':<44} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>9} {'rows':>9} {'acquire ms':>11}"]
+    for label, s in sorted(snapshot.items(), key=lambda kv: -kv[1]["total_ms"]):
+        lines.append(
+            f"{label:<44} {s['count']:>7} {s['total_ms']:>10.2f} {s['mean_ms']:>9.3f} {s['p50_ms']:>8g} "
+            f"{s['p99_ms']:>8g} {s['max_ms']:>9.3f} {s['rows']:>9} {s['acquire_ms']:>11.3f}"
+        )
+    slow = recent_slow_queries()
+    if slow:
+        lines.append("")
+        lines.append(f"Slow queries (>= {_settings.slow_query_seconds * 1000:g} ms, most recent last):")
+        for rec in slow:
+            lines.append(f"  {rec.elapsed * 1000:9.2f} ms  {rec.label}  rows={rec.rows}  {rec.sql}")
+    return "\n".join(lines)
+
+
+def _caller_label() -> str:
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _INTERNAL_FILES:
+        if frame.f_code.co_name in _POOL_METHODS:
+            return f"ConnectionPool.{frame.f_code.co_name}"
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    owner = frame.f_locals.get("self")
+    prefix = type(owner).__name__ if owner is not None else Path(frame.f_code.co_filename).stem
+    return f"{prefix}.{frame.f_code.co_name}"
+
+
+def _params_shape(parameters: Any) -> str:
+    if isinstance(parameters, dict):
+        return "{" + ",".join(parameters) + "}"
+    try:
+        return f"({len(parameters)})"
+    except TypeError:
+        return "(?)"
+
+
+def _dispatch(rec: QueryRecord) -> None:
+    for hook in list(_hooks):
+        hook(rec)
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times each statement, including fetching its rows.
+
+    A SELECT's record is finished when its rows are exhausted, when the cursor
+    is reused or closed, or when it is garbage collected.
+    """
+
+    _record: Optional[QueryRecord] = None
+
+    def _start(self, sql: str, params: str) -> Optional[QueryRecord]:
+        self._finish()
+        if not _settings.enabled:
+            return None
+        conn = self.connection
+        acquire = getattr(conn, "acquire_time", 0.0)
+        if acquire:
+            conn.acquire_time = 0.0
+        return QueryRecord(_caller_label(), sql, params, acquire)
+
+    def _run(self, rec: Optional[QueryRecord], run: Callable[[], Any],
+             finalise: Optional[Callable[[QueryRecord], None]] = None):
+        if rec is None:
+            return run()
+        start = time.perf_counter()
+        try:
+            run()
+        except BaseException as e:
+            rec.elapsed = time.perf_counter() - start
+            rec.error = type(e).__name__
+            if finalise is not None:
+                finalise(rec)
+            _dispatch(rec)
+            raise
+        rec.elapsed = time.perf_counter() - start
+        if finalise is not None:
+            finalise(rec)
+        if self.description is None:
+            rec.rows = max(self.rowcount, 0)
+            _dispatch(rec)
+        else:
+            self._record = rec
+        return self
+
+    def _finish(self) -> None:
+        rec = self._record
+        if rec is not None:
+            self._record = None
+            _dispatch(rec)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        rec = self._start(sql, _params_shape(parameters)) if _settings.enabled else None
+        return self._run(rec, lambda: super(InstrumentedCursor, self).execute(sql, parameters))
+
+    def executemany(self, sql: str, seq_of_parameters: Any):
+        if not _settings.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        shape = {"rows": 0, "width": "?"}
+
+        def counted():
+            for params in seq_of_parameters:
+                if not shape["rows"]:
+                    shape["width"] = _params_shape(params)
+                shape["rows"] += 1
+                yield params
+
+        def finalise(rec: QueryRecord) -> None:
+            # the parameters are streamed, so their shape is known only once they have run
+            rec.params = f"{shape['rows']} x {shape['width']}"
+
+        rec = self._start(sql, "")
+        return self._run(rec, lambda: super(InstrumentedCursor, self).executemany(sql, counted()), finalise)
+
+    def _timed_fetch(self, fetch: Callable[[], Any], exhausted: Callable[[Any], bool], count: Callable[[Any], int]):
+        rec = self._record
+        if rec is None:
+            return fetch()
+        start = time.perf_counter()
+        result = fetch()
+        rec.elapsed += time.perf_counter() - start
+        rec.rows += count(result)
+        if exhausted(result):
+            self._finish()
+        return result
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone, lambda r: r is None, lambda r: r is not None)
+
+    def fetchmany(self, size: Optional[int] = None):
+        size = self.arraysize if size is None else size
+        return self._timed_fetch(lambda: super(InstrumentedCursor, self).fetchmany(size),
+                                 lambda rows: len(rows) < size, len)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall, lambda rows: True, len)
+
+    def __next__(self):
+        rec = self._record
+        if rec is None:
+            return super().__next__()
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            rec.elapsed += time.perf_counter() - start
+            self._finish()
+            raise
+        rec.elapsed += time.perf_counter() - start
+        rec.rows += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose statements all go through `InstrumentedCursor`.
+
+    `acquire_time` is set by the connection pool on each checkout.
+    """
+
+    acquire_time = 0.0
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = ()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,363 @@
+import sqlite3
+from typing import Callable, List, NamedTuple, Optional
+
+
+class Migration(NamedTuple):
+    """One schema version step.
+
+    `apply` runs inside a write transaction; when `rebuilds_tables` is set,
+    foreign key enforcement is switched off around the transaction as SQLite
+    requires for table rebuilds.
+    """
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+    rebuilds_tables: bool = False
+
+
+def _run(conn: sqlite3.Connection, statements: List[str]) -> None:
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _v1_baseline(conn: sqlite3.Connection) -> None:
+    # the schema shipped in TodoListSetup.sql before versioning existed
+    _run(conn, [
+        """CREATE TABLE IF NOT EXISTS Project (
+            project_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL UNIQUE
+        )""",
+        """CREATE TABLE IF NOT EXISTS Todo_Item (
+            todo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5),
+            completed TEXT NOT NULL CHECK (completed IN ('yes', 'no')),
+            project_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE,
+            FOREIGN KEY (title) REFERENCES Project(title) ON DELETE CASCADE
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_todo_project ON Todo_Item(project_id)",
+        "CREATE INDEX IF NOT EXISTS idx_todo_priority ON Todo_Item(priority)",
+    ])
+
+
+def _rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str, columns: str, select_sql: str) -> None:
+    """Replace `table` with the definition in `create_sql`, copying rows via `select_sql`.
+
+    Follows SQLite's documented 12-step procedure; the AUTOINCREMENT high-water
+    mark is carried over so ids of deleted rows are never reused.
+    """
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    seq = row[0] if row else 0
+    _run(conn, [
+        create_sql.format(table=f"{table}_new"),
+        f"INSERT INTO {table}_new ({columns}) {select_sql}",
+        f"DROP TABLE {table}",
+        f"ALTER TABLE {table}_new RENAME TO {table}",
+    ])
+    conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (seq, table))
+    if conn.execute("SELECT changes()").fetchone()[0] == 0 and seq:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (table, seq))
+
+
+def _v2_integer_completed(conn: sqlite3.Connection) -> None:
+    # completed moves from TEXT 'yes'/'no' to INTEGER 0/1; the single-column
+    # indexes are replaced by composites that also satisfy ORDER BY priority
+    _rebuild_table(
+        conn, "Todo_Item",
+        """CREATE TABLE {table} (
+            todo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5),
+            completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)),
+            project_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE,
+            FOREIGN KEY (title) REFERENCES Project(title) ON DELETE CASCADE
+        )""",
+        "todo_id, description, priority, completed, project_id, title",
+        "SELECT todo_id, description, priority, "
+        "CASE WHEN lower(completed) IN ('yes', '1', 'true') THEN 1 ELSE 0 END, project_id, title FROM Todo_Item",
+    )
+    _run(conn, [
+        "CREATE INDEX IF NOT EXISTS idx_todo_project_priority ON Todo_Item(project_id, priority, todo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_todo_project_open ON Todo_Item(project_id, completed, priority, todo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_todo_priority ON Todo_Item(priority, todo_id)",
+        "ANALYZE",
+    ])
+
+
+def _v3_drop_todo_title(conn: sqlite3.Connection) -> None:
+    # Todo_Item.title duplicated Project.title; titles are now joined in on read
+    # so renaming a project touches a single row
+    _rebuild_table(
+        conn, "Todo_Item",
+        """CREATE TABLE {table} (
+            todo_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5),
+            completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)),
+            project_id INTEGER NOT NULL,
+            FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE
+        )""",
+        "todo_id, description, priority, completed, project_id",
+        "SELECT todo_id, description, priority, completed, project_id FROM Todo_Item",
+    )
+    _run(conn, [
+        "CREATE INDEX IF NOT EXISTS idx_todo_project_priority ON Todo_Item(project_id, priority, todo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_todo_project_open ON Todo_Item(project_id, completed, priority, todo_id)",
+        "CREATE INDEX IF NOT EXISTS idx_todo_priority ON Todo_Item(priority, todo_id)",
+        "ANALYZE",
+    ])
+
+
+def _v4_todo_search(conn: sqlite3.Connection) -> None:
+    # FTS5 index over todo descriptions and their project titles; rowid is
+    # todo_id. Triggers keep it in step with Todo_Item and project renames.
+    _run(conn, [
+        "DROP TABLE IF EXISTS Todo_Search",
+        """CREATE VIRTUAL TABLE Todo_Search USING fts5(
+            description, title, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS trg_todo_search_insert AFTER INSERT ON Todo_Item BEGIN
+            INSERT INTO Todo_Search (rowid, description, title)
+            VALUES (new.todo_id, new.description, (SELECT title FROM Project WHERE project_id = new.project_id));
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_todo_search_update AFTER UPDATE OF description, project_id ON Todo_Item BEGIN
+            UPDATE Todo_Search
+            SET description = new.description, title = (SELECT title FROM Project WHERE project_id = new.project_id)
+            WHERE rowid = new.todo_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_todo_search_delete AFTER DELETE ON Todo_Item BEGIN
+            DELETE FROM Todo_Search WHERE rowid = old.todo_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_search_rename AFTER UPDATE OF title ON Project BEGIN
+            UPDATE Todo_Search SET title = new.title
+            WHERE rowid IN (SELECT todo_id FROM Todo_Item WHERE project_id = new.project_id);
+        END""",
+        """INSERT INTO Todo_Search (rowid, description, title)
+            SELECT ti.todo_id, ti.description, p.title FROM Todo_Item ti JOIN Project p ON p.project_id = ti.project_id""",
+        "INSERT INTO Todo_Search (Todo_Search) VALUES ('optimize')",
+    ])
+
+
+# priorities counted per project in Project_Stats (columns p1 .. p5)
+PRIORITIES = (1, 2, 3, 4, 5)
+
+# Project_Stats rows computed from scratch; shared by the migration and the consistency check
+PROJECT_STATS_QUERY = (
+    "SELECT p.project_id, COUNT(ti.todo_id), COALESCE(SUM(ti.completed), 0), "
+    + ", ".join(f"COALESCE(SUM(ti.priority = {n}), 0)" for n in PRIORITIES)
+    + " FROM Project p LEFT JOIN Todo_Item ti ON ti.project_id = p.project_id GROUP BY p.project_id"
+)
+
+
+def _stats_delta(row: str, sign: str) -> str:
+    # SET list adding (sign "+") or removing (sign "-") one todo's contribution
+    return ", ".join(
+        [f"total = total {sign} 1", f"completed = completed {sign} {row}.completed"]
+        + [f"p{n} = p{n} {sign} ({row}.priority = {n})" for n in PRIORITIES]
+    )
+
+
+def rebuild_project_stats(conn: sqlite3.Connection) -> None:
+    """Recompute every Project_Stats row from Todo_Item, inside the caller's transaction."""
+    conn.execute("DELETE FROM Project_Stats")
+    conn.execute(f"INSERT INTO Project_Stats {PROJECT_STATS_QUERY}")
+
+
+def _v5_project_stats(conn: sqlite3.Connection) -> None:
+    # per-project counters kept current by triggers, so summaries read one row
+    # per project instead of aggregating every todo
+    _run(conn, [
+        "DROP TABLE IF EXISTS Project_Stats",
+        f"""CREATE TABLE Project_Stats (
+            project_id INTEGER PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            {", ".join(f"p{n} INTEGER NOT NULL DEFAULT 0" for n in PRIORITIES)}
+        )""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_stats_create AFTER INSERT ON Project BEGIN
+            INSERT OR REPLACE INTO Project_Stats (project_id) VALUES (new.project_id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_stats_drop AFTER DELETE ON Project BEGIN
+            DELETE FROM Project_Stats WHERE project_id = old.project_id;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_todo_stats_insert AFTER INSERT ON Todo_Item BEGIN
+            UPDATE Project_Stats SET {_stats_delta("new", "+")} WHERE project_id = new.project_id;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_todo_stats_delete AFTER DELETE ON Todo_Item BEGIN
+            UPDATE Project_Stats SET {_stats_delta("old", "-")} WHERE project_id = old.project_id;
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_todo_stats_update AFTER UPDATE OF completed, priority, project_id ON Todo_Item BEGIN
+            UPDATE Project_Stats SET {_stats_delta("old", "-")} WHERE project_id = old.project_id;
+            UPDATE Project_Stats SET {_stats_delta("new", "+")} WHERE project_id = new.project_id;
+        END""",
+    ])
+    rebuild_project_stats(conn)
+
+
+def _v6_open_priority_index(conn: sqlite3.Connection) -> None:
+    # open todos across all projects in (priority, todo_id) order, so the
+    # "next up" queue reads k index entries instead of sorting every todo
+    _run(conn, [
+        "CREATE INDEX IF NOT EXISTS idx_todo_open_priority ON Todo_Item(completed, priority, todo_id)",
+        "ANALYZE",
+    ])
+
+
+# Todo_Item columns whose change is logged; writes that leave them all as they were are not
+_LOGGED_TODO_COLUMNS = ("description", "priority", "completed", "project_id")
+
+
+def _v7_change_log(conn: sqlite3.Connection) -> None:
+    # append-only log of row changes for incremental sync: consumers read the
+    # entries after their last seq instead of rescanning both tables. Existing
+    # rows are logged as inserts so a consumer starting from seq 0 sees them
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in _LOGGED_TODO_COLUMNS)
+    _run(conn, [
+        "DROP TABLE IF EXISTS Change_Log",
+        "DROP TABLE IF EXISTS Change_Log_Meta",
+        """CREATE TABLE Change_Log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity TEXT NOT NULL CHECK (entity IN ('project', 'todo')),
+            op TEXT NOT NULL CHECK (op IN ('insert', 'update', 'delete')),
+            row_id INTEGER NOT NULL,
+            changed_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )""",
+        # finds the newer entries of a row when compacting
+        "CREATE INDEX IF NOT EXISTS idx_change_log_row ON Change_Log(entity, row_id, seq)",
+        # pruned_through: highest seq dropped by retention; older cursors must resync
+        "CREATE TABLE Change_Log_Meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_log_insert AFTER INSERT ON Project BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'insert', new.project_id);
+        END""",
+        # a rename changes the title every todo of the project is read with
+        """CREATE TRIGGER IF NOT EXISTS trg_project_log_update AFTER UPDATE OF title ON Project
+        WHEN old.title IS NOT new.title BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'update', new.project_id);
+            INSERT INTO Change_Log (entity, op, row_id)
+            SELECT 'todo', 'update', todo_id FROM Todo_Item WHERE project_id = new.project_id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_project_log_delete AFTER DELETE ON Project BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'delete', old.project_id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_todo_log_insert AFTER INSERT ON Todo_Item BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'insert', new.todo_id);
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_todo_log_update AFTER UPDATE ON Todo_Item
+        WHEN {changed} BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'update', new.todo_id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS trg_todo_log_delete AFTER DELETE ON Todo_Item BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('todo', 'delete', old.todo_id);
+        END""",
+        "INSERT INTO Change_Log (entity, op, row_id) SELECT 'project', 'insert', project_id FROM Project ORDER BY project_id",
+        "INSERT INTO Change_Log (entity, op, row_id) SELECT 'todo', 'insert', todo_id FROM Todo_Item ORDER BY todo_id",
+    ])
+
+
+# reads of projects and todos skip projects whose deletion is still being purged
+LIVE_PROJECT = "p.project_id NOT IN (SELECT project_id FROM Project_Purge)"
+
+
+def _v8_project_purge(conn: sqlite3.Connection) -> None:
+    # a deleted project with many todos is hidden at once and its todos are
+    # removed in short chunks, instead of one cascade holding the write lock.
+    # Its title is swapped for a placeholder to free the real one, so the
+    # rename triggers must not rewrite the index and log for those todos
+    _run(conn, [
+        "DROP TABLE IF EXISTS Project_Purge",
+        """CREATE TABLE Project_Purge (
+            project_id INTEGER PRIMARY KEY REFERENCES Project(project_id) ON DELETE CASCADE,
+            title TEXT NOT NULL,
+            todos INTEGER NOT NULL,
+            purged INTEGER NOT NULL DEFAULT 0,
+            requested_at INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        )""",
+        "DROP TRIGGER IF EXISTS trg_project_search_rename",
+        """CREATE TRIGGER trg_project_search_rename AFTER UPDATE OF title ON Project
+        WHEN new.project_id NOT IN (SELECT project_id FROM Project_Purge) BEGIN
+            UPDATE Todo_Search SET title = new.title
+            WHERE rowid IN (SELECT todo_id FROM Todo_Item WHERE project_id = new.project_id);
+        END""",
+        "DROP TRIGGER IF EXISTS trg_project_log_update",
+        """CREATE TRIGGER trg_project_log_update AFTER UPDATE OF title ON Project
+        WHEN old.title IS NOT new.title AND new.project_id NOT IN (SELECT project_id FROM Project_Purge) BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'update', new.project_id);
+            INSERT INTO Change_Log (entity, op, row_id)
+            SELECT 'todo', 'update', todo_id FROM Todo_Item WHERE project_id = new.project_id;
+        END""",
+        # the project is gone for readers as soon as it is hidden; its todos
+        # are logged as deleted as they are purged
+        """CREATE TRIGGER IF NOT EXISTS trg_project_purge_log AFTER INSERT ON Project_Purge BEGIN
+            INSERT INTO Change_Log (entity, op, row_id) VALUES ('project', 'delete', new.project_id);
+        END""",
+    ])
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline Project and Todo_Item schema", _v1_baseline),
+    Migration(2, "store Todo_Item.completed as INTEGER, composite indexes", _v2_integer_completed, rebuilds_tables=True),
+    Migration(3, "drop denormalised Todo_Item.title", _v3_drop_todo_title, rebuilds_tables=True),
+    Migration(4, "FTS5 search index over todo descriptions and project titles", _v4_todo_search),
+    Migration(5, "trigger-maintained Project_Stats summary", _v5_project_stats),
+    Migration(6, "index on open todos by priority", _v6_open_priority_index),
+    Migration(7, "trigger-fed Change_Log for incremental sync", _v7_change_log),
+    Migration(8, "Project_Purge queue for chunked deletion of large projects", _v8_project_purge),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    """Return the schema version recorded in `PRAGMA user_version`."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> int:
+    """Bring the database up to `target` (default: latest) schema version.
+
+    Each migration runs in its own IMMEDIATE transaction and bumps
+    `PRAGMA user_version` in the same transaction, so a failed step leaves the
+    database at the previous version and concurrent migrators serialise.
+
+    Parameters:
+        conn (sqlite3.Connection): connection with no open transaction.
+        target (Optional[int]): version to stop at.
+
+    Returns:
+        int: the schema version after migrating.
+
+    Raises:
+        sqlite3.ProgrammingError: if `conn` has an open transaction.
+    """
+    if conn.in_transaction:
+        raise sqlite3.ProgrammingError("migrate() needs a connection without an open transaction")
+    target = LATEST_VERSION if target is None else target
+    for migration in MIGRATIONS:
+        if migration.version > target or migration.version <= current_version(conn):
+            continue
+        fk_enabled = conn.execute("PRAGMA foreign_keys").fetchone()[0]
+        if migration.rebuilds_tables and fk_enabled:
+            conn.execute("PRAGMA foreign_keys = OFF")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # another process may have migrated while we waited for the lock
+                if current_version(conn) < migration.version:
+                    migration.apply(conn)
+                    if migration.rebuilds_tables:
+                        violation = conn.execute("PRAGMA foreign_key_check").fetchone()
+                        if violation:
+                            raise sqlite3.IntegrityError(f"migration {migration.version} left a foreign key violation: {tuple(violation)}")
+                    conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        finally:
+            if migration.rebuilds_tables and fk_enabled:
+                conn.execute("PRAGMA foreign_keys = ON")
+    return current_version(conn)
@@ -0,0 +1,117 @@
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+# seconds the worker sleeps between chunks, so other writers get the write lock
+PURGE_PAUSE = 0.05
+# free pages handed back to the file system after each chunk
+VACUUM_PAGES = 1000
+# seconds between checks for deleted projects when nobody wakes the worker
+# (another process may have deleted one)
+IDLE_POLL = 60.0
+# seconds to wait after a failed chunk before trying again
+RETRY_DELAY = 1.0
+
+logger = logging.getLogger("todolist.purge")
+logger.addHandler(logging.NullHandler())
+
+
+class PurgeWorker:
+    """Background thread that purges the todos of deleted projects.
+
+    `ProjectDAO.deleteProjectById` only hides a large project; this thread
+    then calls `dao.purgeStep(chunk_size)` until no deleted project is left,
+    pausing `pause` seconds between chunks so each transaction holds the
+    write lock only briefly. After every chunk it runs
+    `dao.incrementalVacuum(vacuum_pages)` so the freed pages are returned to
+    the file system instead of bloating it, and keeps doing so while idle
+    until the free list is empty.
+
+    The queue of deleted projects lives in the database (`Project_Purge`), so
+    a purge interrupted by a restart continues when the next worker starts.
+    """
+
+    def __init__(self, dao: Any, chunk_size: int, pause: float = PURGE_PAUSE,
+                 vacuum_pages: int = VACUUM_PAGES, idle_poll: float = IDLE_POLL):
+        """Start the worker thread.
+
+        Parameters:
+            dao (ProjectDAO): DAO whose `purgeStep` and `incrementalVacuum` are called.
+            chunk_size (int): most todos removed per transaction.
+            pause (float): seconds between chunks.
+            vacuum_pages (int): most pages released after each chunk; 0 disables vacuuming.
+            idle_poll (float): seconds between checks for work while idle.
+        """
+        if chunk_size < 1 or pause < 0 or vacuum_pages < 0:
+            raise ValueError("chunk_size must be at least 1 and pause and vacuum_pages not negative")
+        self.dao = dao
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.vacuum_pages = vacuum_pages
+        self.idle_poll = idle_poll
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._chunks = 0
+        self._projects = 0
+        self._pages = 0
+        self._errors = 0
+        self._last_error: Optional[str] = None
+        self._current = None
+        self._thread = threading.Thread(target=self._run, name="todolist-purge", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        """Tell the worker that a project was deleted, so it starts purging at once."""
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                progress = self.dao.purgeStep(self.chunk_size)
+                freed = self.dao.incrementalVacuum(self.vacuum_pages) if self.vacuum_pages else 0
+            except sqlite3.Error as e:
+                logger.warning("purging deleted projects failed: %s", e)
+                with self._lock:
+                    self._errors += 1
+                    self._last_error = str(e)
+                self._stop.wait(RETRY_DELAY)
+                continue
+            with self._lock:
+                self._pages += freed
+                self._current = progress if progress is not None and not progress.done else None
+                if progress is not None:
+                    self._chunks += 1
+                    self._projects += progress.done
+            if progress is None and (not self.vacuum_pages or freed < self.vacuum_pages):
+                # nothing left to purge, and the free list is empty
+                self._wake.wait(self.idle_poll)
+                self._wake.clear()
+            else:
+                self._stop.wait(self.pause)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the worker's counters.
+
+        Returns:
+            Dict[str, Any]: `chunks` run, `projects` fully purged, vacuumed
+            `pages`, failed chunks (`errors`, with the `last_error` message) and
+            the project being purged right now (`current`, a `PurgeProgress`
+            dict, or None).
+        """
+        with self._lock:
+            return {
+                "chunks": self._chunks,
+                "projects": self._projects,
+                "pages": self._pages,
+                "errors": self._errors,
+                "last_error": self._last_error,
+                "current": self._current.to_dict() if self._current is not None else None,
+            }
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop the worker after its current chunk; the rest of the purge resumes with the next worker."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
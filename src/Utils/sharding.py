@@ -0,0 +1,346 @@
+import atexit
+import heapq
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar
+
+from Utils.db_connection import (
+    POOL_SIZE, ConnectionPool, StorageProfile, _get_conn, in_transaction, joined_connection, set_lazy_transactions,
+    transaction, use_pool,
+)
+
+T = TypeVar("T")
+
+# environment variables selecting a sharded layout: the directory holding the
+# shard files, and how many shards to spread projects over
+SHARDS_ENV_VAR = "TODOLIST_SHARDS"
+SHARD_COUNT_ENV_VAR = "TODOLIST_SHARD_COUNT"
+SHARD_COUNT = 4
+
+DIRECTORY_FILE = "directory.db"
+SHARD_FILE = "shard_{}.db"
+
+# todo ids handed out per shard: shard k numbers its todos from k * SHARD_ID_SPAN + 1,
+# so a todo id names its shard without a directory lookup
+SHARD_ID_SPAN = 1 << 40
+
+_DIRECTORY_SCHEMA = [
+    # every project's id and title, and the shard holding it; ids are allocated
+    # here so they stay unique across shards
+    """CREATE TABLE IF NOT EXISTS Shard_Directory (
+        project_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL UNIQUE,
+        shard INTEGER NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_shard_directory_shard ON Shard_Directory(shard)",
+    "CREATE TABLE IF NOT EXISTS Shard_Meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+]
+
+
+class ShardRouter:
+    """Spreads projects, with their todos, over several SQLite files.
+
+    A shard directory holds `directory.db`, which maps every project to the
+    shard that stores it, and `shard_0.db` ... `shard_{n-1}.db`, each a normal
+    todo list database. A project lives wholly on one shard, so writes to
+    projects on different shards take different write locks and run in
+    parallel. New projects go to the shard with the fewest projects.
+
+    The router owns one `ConnectionPool` per file. `use(k)` sends the ordinary
+    DAO calls of this thread to shard `k` (see `use_pool`); the sharded DAOs
+    in `DAO.ShardedProjectDAO` and `DAO.ShardedTodoItemDAO` do the routing.
+    A `transaction()` block spanning several shards commits each shard in
+    turn; commits on different shards are not atomic with each other.
+
+    The shard count may be raised for an existing directory (new shards start
+    empty and are filled by placement and `moveProject`); it is never lowered.
+    """
+
+    def __init__(self, path, shard_count: int = SHARD_COUNT, max_size: int = POOL_SIZE,
+                 profile: Optional[StorageProfile] = None):
+        """Open (creating if needed) the shard directory at `path`.
+
+        Parameters:
+            path (str | Path): directory holding the directory and shard files.
+            shard_count (int): number of shards; an existing directory keeps a
+                larger count it already has.
+            max_size (int): maximum open connections per shard.
+            profile (Optional[StorageProfile]): storage settings for every file.
+        """
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.directory = ConnectionPool(self.path / DIRECTORY_FILE, max_size=max_size, profile=profile)
+        with self.directory.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for sql in _DIRECTORY_SCHEMA:
+                conn.execute(sql)
+            row = conn.execute("SELECT value FROM Shard_Meta WHERE key = 'shard_count'").fetchone()
+            self.shard_count = max(shard_count, row[0] if row else 0)
+            conn.execute("INSERT OR REPLACE INTO Shard_Meta (key, value) VALUES ('shard_count', ?)", (self.shard_count,))
+        self.pools: List[ConnectionPool] = []
+        for k in range(self.shard_count):
+            pool = ConnectionPool(self.path / SHARD_FILE.format(k), max_size=max_size, profile=profile,
+                                  run_migrations=True)
+            with pool.connection() as conn:
+                # start the shard's todo ids at the bottom of its range
+                conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'Todo_Item'", (k * SHARD_ID_SPAN,))
+                if conn.execute("SELECT changes()").fetchone()[0] == 0 and k:
+                    conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('Todo_Item', ?)", (k * SHARD_ID_SPAN,))
+            self.pools.append(pool)
+        self._executor = ThreadPoolExecutor(max_workers=self.shard_count, thread_name_prefix="todolist-shard")
+        self._closed = False
+        set_lazy_transactions(True)
+
+    def use(self, shard: int):
+        """Send this thread's DAO calls inside the block to `shard`.
+
+        Parameters:
+            shard (int): shard number.
+
+        Returns:
+            ContextManager[ConnectionPool]: the shard's pool.
+        """
+        return use_pool(self.pools[shard])
+
+    def use_directory(self):
+        """Send this thread's `_get_conn()` calls inside the block to the directory database."""
+        return use_pool(self.directory)
+
+    def _directory_query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Read the directory without joining an open `transaction()` block to it.
+
+        Joining would BEGIN IMMEDIATE on the directory and hold its write lock
+        until the block commits, so every write, whatever its shard, would
+        queue behind it. Only `place`, renames, deletes and `moveProject` take
+        that lock. A block that already holds it reads through its own
+        connection and sees its uncommitted rows.
+        """
+        conn = joined_connection(self.directory)
+        if conn is not None:
+            return conn.execute(sql, params).fetchall()
+        with self.directory.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def shard_for_project(self, project_id: int) -> Optional[int]:
+        """Return the shard holding a project, or None if there is no such project."""
+        rows = self._directory_query("SELECT shard FROM Shard_Directory WHERE project_id = ?", (project_id,))
+        return rows[0][0] if rows else None
+
+    def shard_for_title(self, title: str) -> Optional[int]:
+        """Return the shard holding the project titled `title`, or None."""
+        rows = self._directory_query("SELECT shard FROM Shard_Directory WHERE title = ?", (title,))
+        return rows[0][0] if rows else None
+
+    def shard_for_todo(self, todo_id: int) -> Optional[int]:
+        """Return the shard whose id range holds `todo_id`, or None if no shard has that range."""
+        shard = (todo_id - 1) // SHARD_ID_SPAN
+        return shard if 0 <= shard < self.shard_count else None
+
+    def place(self, title: str) -> Dict[str, int]:
+        """Register a new project in the directory on the shard with the fewest projects.
+
+        Joins the caller's `transaction()` block, so a failed create removes
+        the directory row too.
+
+        Parameters:
+            title (str): title of the new project.
+
+        Returns:
+            Dict[str, int]: the allocated `project_id` and the chosen `shard`.
+
+        Raises:
+            sqlite3.IntegrityError: if a project with this title exists on any shard.
+        """
+        with self.use_directory(), _get_conn() as conn:
+            counts = dict(conn.execute("SELECT shard, COUNT(*) FROM Shard_Directory GROUP BY shard").fetchall())
+            shard = min(range(self.shard_count), key=lambda k: (counts.get(k, 0), k))
+            cur = conn.execute("INSERT INTO Shard_Directory (title, shard) VALUES (?, ?)", (title, shard))
+            return {"project_id": cur.lastrowid, "shard": shard}
+
+    def fan_out(self, fn: Callable[[int], T]) -> List[T]:
+        """Run `fn(k)` against every shard `k` in parallel, with its DAO calls routed to `k`.
+
+        Inside a `transaction()` block the shards are visited one after the
+        other on the calling thread instead, so the reads join the block and
+        see its uncommitted writes.
+
+        Parameters:
+            fn (Callable[[int], T]): per-shard call, usually a DAO method.
+
+        Returns:
+            List[T]: the results, in shard order.
+        """
+        def routed(k: int) -> T:
+            with self.use(k):
+                return fn(k)
+
+        if in_transaction() or self.shard_count == 1:
+            return [routed(k) for k in range(self.shard_count)]
+        return list(self._executor.map(routed, range(self.shard_count)))
+
+    def merge(self, results: Iterable[Iterable[T]], key: Callable[[T], Any], limit: Optional[int] = None) -> List[T]:
+        """Merge per-shard results that are each sorted by `key` into one sorted list.
+
+        Parameters:
+            results (Iterable[Iterable[T]]): sorted results, one per shard.
+            key (Callable[[T], Any]): sort key the shards ordered by.
+            limit (Optional[int]): keep only the first `limit` items.
+
+        Returns:
+            List[T]: the merged items.
+        """
+        merged = heapq.merge(*results, key=key)
+        if limit is not None:
+            return [item for _, item in zip(range(limit), merged)]
+        return list(merged)
+
+    def moveProject(self, project_id: int, shard: int) -> Dict[int, int]:
+        """Move a project and all of its todos to another shard.
+
+        The todos get new ids from the target shard's range, since a todo id
+        names its shard. The copy is written to the target, the directory
+        updated and the source rows deleted inside one `transaction()` block;
+        unless an enclosing block touched them first, the target and directory
+        commit before the source, so a failure part way leaves at worst an
+        unreachable copy on the source shard.
+
+        Parameters:
+            project_id (int): id of the project to move.
+            shard (int): number of the destination shard.
+
+        Returns:
+            Dict[int, int]: old todo id -> new todo id (empty if the project
+            was already on `shard`).
+
+        Raises:
+            KeyError: if there is no such project.
+            ValueError: if `shard` is out of range.
+        """
+        if not 0 <= shard < self.shard_count:
+            raise ValueError(f"shard must be between 0 and {self.shard_count - 1}")
+        with transaction():
+            # the pools commit in the order the block first touches them: target, directory, source
+            with self.use(shard), _get_conn():
+                pass
+            with self.use_directory(), _get_conn() as conn:
+                row = conn.execute("SELECT title, shard FROM Shard_Directory WHERE project_id = ?", (project_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"no project with id {project_id}")
+            title, source = row
+            if source == shard:
+                return {}
+            with self.use(shard), _get_conn() as conn:
+                conn.execute("INSERT INTO Project (project_id, title) VALUES (?, ?)", (project_id, title))
+            with self.use_directory(), _get_conn() as conn:
+                conn.execute("UPDATE Shard_Directory SET shard = ? WHERE project_id = ?", (shard, project_id))
+            with self.use(source), _get_conn() as conn:
+                todos = conn.execute(
+                    "SELECT todo_id, description, priority, completed FROM Todo_Item WHERE project_id = ? ORDER BY todo_id",
+                    (project_id,),
+                ).fetchall()
+                conn.execute("DELETE FROM Project WHERE project_id = ?", (project_id,))
+            moved: Dict[int, int] = {}
+            with self.use(shard), _get_conn() as conn:
+                for todo_id, description, priority, completed in todos:
+                    cur = conn.execute(
+                        "INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, ?, ?)",
+                        (description, priority, completed, project_id),
+                    )
+                    moved[todo_id] = cur.lastrowid
+        return moved
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Return the size and pool counters of every shard.
+
+        Returns:
+            List[Dict[str, Any]]: per shard, in order: `shard`, `projects`,
+            `todos` and `pool` (see `ConnectionPool.stats`).
+        """
+        projects = dict(self._directory_query("SELECT shard, COUNT(*) FROM Shard_Directory GROUP BY shard"))
+
+        def count(k: int) -> int:
+            with _get_conn() as conn:
+                return conn.execute("SELECT COUNT(*) FROM Todo_Item").fetchone()[0]
+
+        todos = self.fan_out(count)
+        return [
+            {"shard": k, "projects": projects.get(k, 0), "todos": todos[k], "pool": self.pools[k].stats()}
+            for k in range(self.shard_count)
+        ]
+
+    def close(self) -> None:
+        """Close every pool; the router cannot be used afterwards."""
+        if self._closed:
+            return
+        self._closed = True
+        set_lazy_transactions(False)
+        self._executor.shutdown(wait=True)
+        for pool in self.pools:
+            pool.close()
+        self.directory.close()
+
+
+_router: Optional[ShardRouter] = None
+_router_loaded = False
+_router_lock = threading.Lock()
+
+
+def _env_shard_count() -> int:
+    value = os.environ.get(SHARD_COUNT_ENV_VAR)
+    try:
+        return int(value) if value else SHARD_COUNT
+    except ValueError:
+        raise ValueError(f"{SHARD_COUNT_ENV_VAR} must be a whole number, not {value!r}")
+
+
+def get_router() -> Optional[ShardRouter]:
+    """Return the process-wide shard router, or None when the database is not sharded.
+
+    The layout is sharded when `TODOLIST_SHARDS` names a shard directory; the
+    router is created on first use with `TODOLIST_SHARD_COUNT` shards.
+    """
+    global _router, _router_loaded
+    if not _router_loaded:
+        with _router_lock:
+            if not _router_loaded:
+                path = os.environ.get(SHARDS_ENV_VAR)
+                _router = ShardRouter(path, _env_shard_count()) if path else None
+                _router_loaded = True
+    return _router
+
+
+def configure_router(path, shard_count: int = SHARD_COUNT, max_size: int = POOL_SIZE) -> ShardRouter:
+    """Replace the process-wide shard router, closing the previous one.
+
+    Parameters:
+        path (str | Path): shard directory.
+        shard_count (int): number of shards (see `ShardRouter`).
+        max_size (int): maximum open connections per shard.
+
+    Returns:
+        ShardRouter: the newly installed router.
+    """
+    global _router, _router_loaded
+    with _router_lock:
+        if _router is not None:
+            _router.close()
+        _router = ShardRouter(path, shard_count, max_size)
+        _router_loaded = True
+        return _router
+
+
+def close_router() -> None:
+    """Close the process-wide router; the next `get_router()` reads the environment again."""
+    global _router, _router_loaded
+    with _router_lock:
+        old, _router, _router_loaded = _router, None, False
+    if old is not None:
+        old.close()
+
+
+atexit.register(close_router)
@@ -0,0 +1,233 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from Utils.db_connection import transaction
+from Utils.instrumentation import QueryRecord, QueryStats
+
+T = TypeVar("T")
+
+# most writes committed together
+GROUP_COMMIT_SIZE = 500
+# seconds a group is held open for more writes. 0 commits whatever has queued
+# up by the time the writer is free; writes arriving during a commit still
+# share the next one, and no write waits for a timer (a fixed 5 ms hold cut
+# bench/load_test.py write throughput by a third)
+GROUP_COMMIT_DELAY = 0.0
+
+# writes that may be queued before `submit` blocks the caller
+MAX_QUEUED = 10000
+
+# label the commit latency histogram is recorded under
+_COMMIT_LABEL = "WriteQueue.commit"
+
+# sentinel that tells the writer thread to finish the queue and exit
+_STOP = object()
+
+
+class WriteQueue:
+    """Write-behind queue that commits concurrent writes in groups.
+
+    Callers `submit` a blocking DAO or service call and get a
+    `concurrent.futures.Future` back. A single writer thread drains the queue
+    and runs the calls inside one `transaction()` per group, so a burst of
+    writes from many threads costs one BEGIN/COMMIT and one fsync per group
+    instead of one per write, and the writers never contend for SQLite's
+    write lock. A group takes every write queued by the time the writer is
+    free, up to `max_batch`, and optionally waits up to `max_delay` seconds
+    after its first write for more.
+
+    Every call runs in its own savepoint: a call that raises fails only its
+    own future and the rest of its group still commits. Futures are resolved
+    after the group has committed, so a result is never reported for a write
+    that could still be lost; if the commit itself fails, every future of the
+    group fails with that error.
+    """
+
+    def __init__(self, max_batch: int = GROUP_COMMIT_SIZE, max_delay: float = GROUP_COMMIT_DELAY,
+                 max_queued: int = MAX_QUEUED):
+        """Start the writer thread.
+
+        Parameters:
+            max_batch (int): most writes committed together.
+            max_delay (float): seconds a group waits for more writes after its
+                first; 0 commits whatever is queued at once.
+            max_queued (int): bound on queued writes; `submit` blocks when full.
+        """
+        if max_batch < 1 or max_queued < 1 or max_delay < 0:
+            raise ValueError("max_batch and max_queued must be at least 1 and max_delay not negative")
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: "queue.Queue" = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # held across the closed check and the put, and by close() while it
+        # queues _STOP, so no write can land behind _STOP
+        self._submit_lock = threading.Lock()
+        self._closed = False
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._max_batch_seen = 0
+        self._commits = QueryStats(recent_slow=0)
+        self._thread = threading.Thread(target=self._run, name="todolist-db-group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """Queue a call that writes, `fn(*args, **kwargs)`, for the next group commit.
+
+        Parameters:
+            fn (Callable): blocking DAO or service call.
+
+        Returns:
+            Future: resolved with the value returned by `fn` once its group has
+            committed, or with the exception it (or the commit) raised.
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError("WriteQueue is closed")
+            with self._lock:
+                self._submitted += 1
+            self._queue.put((future, fn, args, kwargs))
+        return future
+
+    def call(self, fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+        """Submit `fn(*args, **kwargs)` and wait for its result (see `submit`)."""
+        return self.submit(fn, *args, **kwargs).result(timeout)
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            group = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(group) < self.max_batch:
+                try:
+                    remaining = deadline - time.monotonic()
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                group.append(item)
+            self._commit(group)
+        self._fail_queued()
+
+    def _fail_queued(self) -> None:
+        """Fail whatever is still queued once the writer has stopped, so no caller waits forever."""
+        dropped = failed = 0
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                continue
+            dropped += 1
+            if item[0].set_running_or_notify_cancel():
+                failed += 1
+                item[0].set_exception(RuntimeError("WriteQueue is closed"))
+        with self._lock:
+            self._completed += dropped
+            self._failed += failed
+            self._idle.notify_all()
+
+    def _commit(self, group: List[Tuple[Future, Callable, tuple, dict]]) -> None:
+        outcomes: List[Tuple[bool, Any]] = []
+        started = time.perf_counter()
+        commit_error: Optional[BaseException] = None
+        try:
+            with transaction():
+                for future, fn, args, kwargs in group:
+                    if not future.set_running_or_notify_cancel():
+                        outcomes.append((False, None))
+                        continue
+                    try:
+                        with transaction():
+                            outcomes.append((True, fn(*args, **kwargs)))
+                    except BaseException as e:
+                        # even SystemExit or KeyboardInterrupt from a call only
+                        # fails its future; the writer thread must keep running
+                        outcomes.append((False, e))
+        except BaseException as e:
+            commit_error = e
+        rec = QueryRecord(_COMMIT_LABEL, "COMMIT", f"{len(group)} writes")
+        rec.rows = len(group)
+        rec.elapsed = time.perf_counter() - started
+        rec.error = type(commit_error).__name__ if commit_error is not None else None
+        self._commits.record(rec)
+
+        failed = 0
+        for (future, _, _, _), (ok, value) in zip(group, outcomes):
+            if ok and commit_error is None:
+                future.set_result(value)
+            elif future.running():
+                failed += 1
+                future.set_exception(commit_error or value)
+        for future, _, _, _ in group[len(outcomes):]:
+            # the group failed before these calls ran
+            if future.set_running_or_notify_cancel():
+                failed += 1
+                future.set_exception(commit_error)
+        with self._lock:
+            self._batches += 1
+            self._max_batch_seen = max(self._max_batch_seen, len(group))
+            self._completed += len(group)
+            self._failed += failed
+            self._idle.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write submitted so far has been committed or has failed.
+
+        Parameters:
+            timeout (Optional[float]): seconds to wait; None waits indefinitely.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._lock:
+            target = self._submitted
+            return self._idle.wait_for(lambda: self._completed >= target, timeout)
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting writes; the writes already queued are still committed.
+
+        Parameters:
+            wait (bool): block until the writer thread has finished them.
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        if wait:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return a snapshot of the queue's counters.
+
+        Returns:
+            Dict[str, Any]: `depth` (writes not yet committed), `submitted`, `completed`,
+            `failed`, `batches`, `mean_batch` and `max_batch` (writes per
+            commit), and `commit`: the commit latency histogram in the format
+            of `QueryStats.snapshot` (`mean_ms`, `p50_ms`, `p99_ms`, ...).
+        """
+        with self._lock:
+            result = {
+                "depth": self._submitted - self._completed,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "batches": self._batches,
+                "mean_batch": self._completed / self._batches if self._batches else 0.0,
+                "max_batch": self._max_batch_seen,
+            }
+        result["commit"] = self._commits.snapshot().get(_COMMIT_LABEL, {})
+        return result
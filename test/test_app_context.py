@@ -0,0 +1,50 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import unittest
+from src.Controller.AppContext import AppContext
+from src.Controller.TodoListController import TodoListController
+
+class TestAppContext(unittest.TestCase):
+
+    def test_nothing_is_created_until_used(self):
+        """Test that constructing the controller does not create services."""
+        context = AppContext()
+        TodoListController(context)
+        self.assertEqual(context.timings, {})
+        self.assertNotIn("project_service", vars(context))
+
+    def test_services_are_created_once_and_shared(self):
+        """Test that services are cached and share one ProjectService."""
+        context = AppContext()
+        controller = TodoListController(context)
+        self.assertIs(controller.todoItemService, context.todo_service)
+        self.assertIs(context.todo_service.project_service, context.project_service)
+        self.assertIs(context.transfer_service.project_service, context.project_service)
+        self.assertIs(controller.projectService, context.project_service)
+        self.assertEqual(list(context.timings), ["database", "project_service", "todo_service", "transfer_service"])
+        self.assertIn("todo_service", context.report())
+
+    def test_close_stops_the_purge_worker(self):
+        """Test that close() stops a started purge worker and creates nothing that was not used."""
+        idle = AppContext(background_purge=True)
+        idle.close()
+        self.assertNotIn("project_service", vars(idle))
+        context = AppContext(background_purge=True)
+        worker = context.project_service.purge_worker
+        self.assertIsNotNone(worker)
+        context.close()
+        self.assertIsNone(context.project_service.purge_worker)
+        self.assertFalse(worker._thread.is_alive())
+
+if __name__ == "__main__":
+    unittest.main()
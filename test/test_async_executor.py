@@ -0,0 +1,172 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import asyncio
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from src.DAO.AsyncTodoItemDAO import AsyncTodoItemDAO
+from src.Service.AsyncProjectService import AsyncProjectService
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+from Utils.async_executor import DatabaseExecutor
+from Utils.db_connection import ConnectionPool
+
+# a statement that keeps SQLite busy for far longer than any test timeout
+SLOW_SQL = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT COUNT(*) FROM (SELECT x FROM c LIMIT 1000000000)"
+
+class TestDatabaseExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmpdir.name, "async.db"), max_size=4)
+        self.executor = DatabaseExecutor(readers=3)
+
+    def tearDown(self):
+        self.executor.shutdown()
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def query(self, sql):
+        with self.pool.connection() as conn:
+            return conn.execute(sql).fetchone()[0]
+
+    def test_reads_run_concurrently(self):
+        """Test that reads are spread over several threads at once."""
+        barrier = threading.Barrier(3, timeout=2)
+
+        def read():
+            barrier.wait()
+            return self.query("SELECT 1")
+
+        async def main():
+            return await asyncio.gather(*(self.executor.read(read) for _ in range(3)))
+
+        self.assertEqual(asyncio.run(main()), [1, 1, 1])
+
+    def test_writes_share_one_thread_in_order(self):
+        """Test that writes run one at a time on the writer thread, in submission order."""
+        seen = []
+
+        def write(n):
+            seen.append((n, threading.current_thread().name))
+
+        async def main():
+            await asyncio.gather(*(self.executor.write(write, n) for n in range(20)))
+
+        asyncio.run(main())
+        self.assertEqual([n for n, _ in seen], list(range(20)))
+        self.assertEqual(len({name for _, name in seen}), 1)
+
+    def test_timeout_interrupts_running_query(self):
+        """Test that a timed-out call is interrupted inside SQLite and frees its thread."""
+        executor = DatabaseExecutor(readers=1)
+
+        async def main():
+            with self.assertRaises(asyncio.TimeoutError):
+                await executor.read(self.query, SLOW_SQL, timeout=0.1)
+            started = time.perf_counter()
+            self.assertEqual(await executor.read(self.query, "SELECT 2", timeout=5), 2)
+            return time.perf_counter() - started
+
+        try:
+            self.assertLess(asyncio.run(main()), 2)
+            self.assertEqual(executor.stats()["reader"]["timeouts"], 1)
+        finally:
+            executor.shutdown()
+        self.assertEqual(self.pool.stats()["discards"], 0)
+
+    def test_cancelled_call_raises_in_worker(self):
+        """Test that cancelling the awaiting task aborts the statement it started."""
+        errors = []
+
+        def slow():
+            try:
+                return self.query(SLOW_SQL)
+            except sqlite3.OperationalError as e:
+                errors.append(e)
+                raise
+
+        async def main():
+            task = asyncio.ensure_future(self.executor.read(slow))
+            await asyncio.sleep(0.1)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        self.executor.shutdown()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(self.executor.stats()["reader"]["cancelled"], 1)
+
+    def test_pending_calls_are_bounded(self):
+        """Test that no more than max_pending calls are handed to the threads at once."""
+        executor = DatabaseExecutor(readers=1, max_pending=2)
+        peak = []
+
+        def read():
+            peak.append(executor.stats()["reader"]["pending"])
+            time.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(executor.read(read) for _ in range(10)))
+
+        try:
+            asyncio.run(main())
+        finally:
+            executor.shutdown()
+        self.assertLessEqual(max(peak), 2)
+        self.assertEqual(executor.stats()["reader"]["completed"], 10)
+
+class TestAsyncLayer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the full schema and seed one project."""
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+        cls.executor = DatabaseExecutor(readers=2)
+        cls.dao = AsyncTodoItemDAO(executor=cls.executor)
+        cls.projects = AsyncProjectService(executor=cls.executor)
+        cls.projects.service.dao.cache.clear()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.executor.shutdown()
+
+    def test_concurrent_lookups(self):
+        """Test creating through the async service and DAO, then looking up concurrently."""
+        from src.Models.TodoItem import TodoItem
+
+        async def main():
+            project = await self.projects.createProject("Async")
+            created = await self.dao.createTodoItems(
+                TodoItem(todo_id=None, title="Async", description=f"async {n}", priority=1 + n % 5, project_id=project.project_id)
+                for n in range(30)
+            )
+            fetched = await asyncio.gather(*(self.dao.getTodoItemById(i) for i in created.ids))
+            streamed = [t async for t in self.dao.iterTodoItems(project.project_id, batch_size=7)]
+            return created, fetched, streamed
+
+        created, fetched, streamed = asyncio.run(main())
+        self.assertEqual([t.todo_id for t in fetched], created.ids)
+        self.assertEqual({t.title for t in fetched}, {"Async"})
+        self.assertEqual(len(streamed), 30)
+        self.assertEqual([(t.priority, t.todo_id) for t in streamed], sorted((t.priority, t.todo_id) for t in streamed))
+
+if __name__ == "__main__":
+    unittest.main()
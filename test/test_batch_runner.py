@@ -0,0 +1,128 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+from src.Controller.BatchRunner import BatchRunner
+from src.Controller.TodoListController import COMMANDS, CommandError, TodoListController, parse_command, parse_id_list
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+
+class TestParseCommand(unittest.TestCase):
+
+    def test_quoted_and_joined_arguments(self):
+        """Test that titles may be quoted or given as trailing words."""
+        self.assertEqual(parse_command('projects create "Home Office"'), ("projects create", ["Home Office"]))
+        self.assertEqual(parse_command("projects delete Home Office"), ("projects delete", ["Home Office"]))
+        self.assertEqual(parse_command('todos add Work 2 write the report'),
+                         ("todos add", ["Work", "2", "write the report"]))
+        self.assertEqual(parse_command("todos add"), ("todos add", []))
+        self.assertEqual(parse_command("?"), ("help", []))
+        self.assertEqual(parse_command("projects rebalance 2 Home Office"), ("projects rebalance", [2, "Home Office"]))
+        self.assertEqual(parse_command("todos changes 40 10"), ("todos changes", [40, 10]))
+        self.assertEqual(parse_command("todos compact-log 7"), ("todos compact-log", [7.0]))
+        self.assertEqual(parse_command("todos next 3 Home"), ("todos next", [3, "Home"]))
+
+    def test_id_lists_and_ranges(self):
+        """Test that todo ids may be given as lists and ranges."""
+        self.assertEqual(parse_id_list("3"), [3])
+        self.assertEqual(parse_id_list("1-3,8 10,2"), [1, 2, 3, 8, 10])
+        self.assertEqual(parse_command("todos complete 1-3, 5"), ("todos complete", [[1, 2, 3, 5]]))
+        self.assertEqual(parse_command("todos move 4,6 Home Office"), ("todos move", [[4, 6], "Home Office"]))
+        for spec in ("", "a", "5-2", "1-", "1-100000"):
+            with self.assertRaises(CommandError):
+                parse_id_list(spec)
+
+    def test_invalid_commands(self):
+        """Test that malformed commands raise CommandError."""
+        for line in ("bogus", "todos complete x", "todos add Work 2", "todos priority 1", "projects create", "projects rebalance Home", "todos changes x", "todos compact-log soon", 'todos search "open', "todos next 0"):
+            with self.assertRaises(CommandError):
+                parse_command(line)
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema on the application database."""
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+        self.out = io.StringIO()
+        self.runner = BatchRunner(group_size=2, out=self.out)
+        self.runner.projectService.dao.cache.clear()
+
+    def tearDown(self):
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM Todo_Item;")
+
+    def records(self):
+        return [json.loads(line) for line in self.out.getvalue().splitlines()]
+
+    def test_commands_emit_json_lines(self):
+        """Test that each command yields one JSON record and a final summary."""
+        summary = self.runner.run([
+            'projects create "Batch Project"',
+            "# a comment",
+            "",
+            'todos add "Batch Project" 2 first task',
+            'todos add "Batch Project" 4 second task',
+            'todos list "Batch Project"',
+        ])
+        records = self.records()
+        self.assertEqual(summary["commands"], 4)
+        self.assertEqual(summary["failed"], 0)
+        self.assertEqual([r["line"] for r in records[:-1]], [1, 4, 5, 6])
+        self.assertEqual([t["description"] for t in records[3]["result"]["todos"]], ["first task", "second task"])
+        self.assertEqual(records[-1], {"summary": summary})
+
+    def test_failed_command_rolls_back_alone(self):
+        """Test that a failing command is reported and the rest of its group commits."""
+        summary = self.runner.run([
+            "projects create Kept",
+            "todos add Kept 9 bad priority",
+            "todos add Missing 1 no project",
+            "todos add Kept 1 good",
+            "bogus",
+            "quit",
+            "projects create Ignored",
+        ])
+        self.assertEqual((summary["ok"], summary["failed"]), (2, 3))
+        errors = [r.get("error") for r in self.records()[:-1]]
+        self.assertEqual(errors[2], "project not found: Missing")
+        with _get_conn() as conn:
+            titles = [r[0] for r in conn.execute("SELECT title FROM Project")]
+            todos = [r[0] for r in conn.execute("SELECT description FROM Todo_Item")]
+        self.assertEqual(titles, ["Kept"])
+        self.assertEqual(todos, ["good"])
+
+    def test_controller_shares_the_handlers(self):
+        """Test that the prompt and batch mode cover the same commands and report the same errors."""
+        controller = TodoListController()
+        names = set(COMMANDS) | {"help", "stats"}
+        self.assertEqual(set(self.runner.handlers()), names)
+        self.assertEqual(set(controller._handlers()), names)
+        self.runner.run(["todos add Missing 1 no project"])
+        out = io.StringIO()
+        with redirect_stdout(out):
+            controller._handlers()["projects create"]("Shared")
+            controller._handlers()["todos add"]("Shared", "2", "from the prompt")
+            controller._list_todos("Shared")
+        self.assertIn("from the prompt Project: Shared", out.getvalue())
+        self.assertEqual(self.records()[0]["error"], "project not found: Missing")
+        with self.assertRaisesRegex(Exception, "project not found: Missing"):
+            controller.add_todo("Missing", "1", "no project")
+
+if __name__ == "__main__":
+    unittest.main()
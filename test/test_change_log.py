@@ -0,0 +1,102 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import unittest
+from src.Service.TodoItemService import TodoItemService
+from src.Models.Project import Project
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+
+class TestChangeLog(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema, change log triggers included, with one project and two todos."""
+        self.service = TodoItemService()
+        self.projects = self.service.project_service
+        self.projects.dao.cache.clear()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Home');")
+        self.first = self.service.createTodoItem("Home", "Water the plants", 3, None)
+        self.second = self.service.createTodoItem("Home", "Fix the tap", 2, None)
+
+    def changes(self, seq=0, limit=500):
+        result = self.service.changesSince(seq, limit)
+        return [(c.op, c.row_id) for c in result.changes], result
+
+    def test_changes_are_compacted_per_row(self):
+        """Test that several writes to a row come back as one upsert with its current state."""
+        _, start = self.changes()
+        self.assertEqual(start.cursor, 3)
+        self.service.completeTodoItems([self.first.todo_id])
+        self.service.setPriority([self.first.todo_id], 1)
+        delta, result = self.changes(start.cursor)
+        self.assertEqual(delta, [("upsert", self.first.todo_id)])
+        data = result.changes[0].data
+        self.assertEqual((data["completed"], data["priority"], data["title"]), ("yes", 1, "Home"))
+        self.assertEqual(self.changes(result.cursor)[0], [])
+
+    def test_deletes_and_short_lived_rows(self):
+        """Test that a delete is reported once and a row created and deleted in between is left out."""
+        _, start = self.changes()
+        temp = self.service.createTodoItem("Home", "Temporary", 3, None)
+        self.service.deleteTodoItem(temp.todo_id)
+        self.service.deleteTodoItem(self.second.todo_id)
+        delta, _ = self.changes(start.cursor)
+        self.assertEqual(delta, [("delete", self.second.todo_id)])
+
+    def test_project_rename_marks_its_todos(self):
+        """Test that renaming a project reports its todos with the new title, and the project itself."""
+        _, start = self.changes()
+        project_start = self.projects.changesSince(0).cursor
+        self.projects.updateProject(Project(project_id=1, title="House"))
+        delta, result = self.changes(start.cursor)
+        self.assertEqual(sorted(delta), [("upsert", self.first.todo_id), ("upsert", self.second.todo_id)])
+        self.assertEqual({c.data["title"] for c in result.changes}, {"House"})
+        projects = self.projects.changesSince(project_start)
+        self.assertEqual([(c.op, c.data["title"]) for c in projects.changes], [("upsert", "House")])
+
+    def test_paging_with_limit(self):
+        """Test that a small limit pages through the log without losing changes."""
+        self.service.setPriority([self.first.todo_id, self.second.todo_id], 4)
+        seen, seq, more = [], 0, True
+        while more:
+            delta, result = self.changes(seq, limit=2)
+            seen.extend(delta)
+            seq, more = result.cursor, result.has_more
+        self.assertEqual(seen[-2:], [("upsert", self.first.todo_id), ("upsert", self.second.todo_id)])
+        self.assertIsNone(self.service.changesSince(-1))
+
+    def test_compaction_and_retention(self):
+        """Test that compaction keeps one entry per row and expired deletes force a reload."""
+        _, start = self.changes()
+        self.service.completeTodoItems([self.first.todo_id])
+        self.service.deleteTodoItem(self.second.todo_id)
+        before, _ = self.changes(start.cursor)
+        result = self.service.compactChangeLog()
+        self.assertEqual((result["superseded"], result["expired"], result["pruned_through"]), (2, 0, 0))
+        self.assertEqual(self.changes(start.cursor)[0], before)
+        with _get_conn() as conn:
+            conn.execute("UPDATE Change_Log SET changed_at = changed_at - 10 * 86400 WHERE op = 'delete'")
+        result = self.service.compactChangeLog(retention_days=7)
+        self.assertEqual(result["expired"], 1)
+        stale = self.service.changesSince(0)
+        self.assertTrue(stale.reset)
+        self.assertEqual(stale.cursor, result["pruned_through"])
+        delta, _ = self.changes(stale.cursor)
+        self.assertNotIn(("delete", self.second.todo_id), delta)
+
+if __name__ == "__main__":
+    unittest.main()
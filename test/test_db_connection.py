@@ -0,0 +1,330 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from src.Utils.db_connection import ConnectionPool, StorageProfile, get_storage_profile
+from Utils import instrumentation
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        """Create a pool against a throwaway database file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmpdir.name, "pool.db"), max_size=2, timeout=0.2)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def tearDown(self):
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def test_connections_are_reused(self):
+        """Test that sequential checkouts reuse a single connection."""
+        for i in range(10):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t (x) VALUES (?)", (i,))
+        stats = self.pool.stats()
+        self.assertEqual(stats["opens"], 1)
+        self.assertEqual(stats["checkouts"], 11)
+
+    def test_pragmas_applied_at_open(self):
+        """Test that foreign keys are enabled on pooled connections."""
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+
+    def test_rollback_on_error(self):
+        """Test that a failing block is rolled back and the connection reused."""
+        with self.assertRaises(sqlite3.OperationalError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO t (x) VALUES (1)")
+                conn.execute("SELECT * FROM missing_table")
+        with self.pool.connection() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 0)
+        self.assertEqual(self.pool.stats()["discards"], 0)
+
+    def test_closed_handle_is_replaced(self):
+        """Test that a connection closed behind the pool's back is replaced."""
+        conn = self.pool.acquire()
+        conn.close()
+        self.pool.release(conn)
+        with self.pool.connection() as conn:
+            conn.execute("SELECT 1")
+        stats = self.pool.stats()
+        self.assertEqual(stats["discards"], 1)
+        self.assertEqual(stats["opens"], 2)
+
+    def test_exhausted_pool_waits_then_times_out(self):
+        """Test that checkouts beyond max_size wait and eventually fail."""
+        held = [self.pool.acquire(), self.pool.acquire()]
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire()
+        timer = threading.Timer(0.05, self.pool.release, args=(held.pop(),))
+        timer.start()
+        conn = self.pool.acquire()
+        timer.join()
+        self.pool.release(conn)
+        self.pool.release(held.pop())
+        self.assertEqual(self.pool.stats()["waits"], 2)
+        self.assertEqual(self.pool.stats()["size"], 2)
+
+class TestStorageProfile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "profile.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_profile_applied_to_connections(self):
+        """Test that the storage profile PRAGMAs are set on pooled connections."""
+        profile = StorageProfile(synchronous="OFF", cache_size=-4000, busy_timeout=1234)
+        pool = ConnectionPool(self.path, profile=profile)
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -4000)
+            self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], 1234)
+        pool.close()
+
+    def test_checkpoint_every_interval_writes(self):
+        """Test that the pool checkpoints the WAL after the configured number of writes."""
+        pool = ConnectionPool(self.path, profile=StorageProfile(checkpoint_interval=3))
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        for i in range(6):
+            with pool.connection() as conn:
+                conn.execute("INSERT INTO t (x) VALUES (?)", (i,))
+        with pool.connection() as conn:
+            conn.execute("SELECT COUNT(*) FROM t").fetchone()
+        self.assertEqual(pool.stats()["checkpoints"], 2)
+        self.assertEqual(pool.checkpoint("TRUNCATE")[0], 0)
+        self.assertEqual(os.path.getsize(self.path + "-wal"), 0)
+        pool.close()
+
+    def test_profile_selection(self):
+        """Test looking profiles up by name."""
+        self.assertEqual(get_storage_profile("legacy").journal_mode, "DELETE")
+        with self.assertRaises(ValueError):
+            get_storage_profile("no-such-profile")
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = ConnectionPool(os.path.join(self.tmpdir.name, "stats.db"))
+        self.records = []
+        instrumentation.add_hook(self.records.append)
+        with self.pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.executemany("INSERT INTO t (x) VALUES (?)", [(i,) for i in range(10)])
+
+    def tearDown(self):
+        instrumentation.remove_hook(self.records.append)
+        self.pool.close()
+        self.tmpdir.cleanup()
+
+    def lookup(self):
+        with self.pool.connection() as conn:
+            return conn.execute("SELECT x FROM t WHERE x > ?", (4,)).fetchall()
+
+    def test_statements_are_recorded_per_method(self):
+        """Test that statements are attributed to the calling method with row counts."""
+        self.lookup()
+        rec = self.records[-1]
+        self.assertEqual(rec.label, "TestInstrumentation.lookup")
+        self.assertEqual(rec.rows, 5)
+        self.assertEqual(rec.params, "(1)")
+        self.assertGreater(rec.elapsed, 0)
+        insert = [r for r in self.records if r.sql.startswith("INSERT")][0]
+        self.assertEqual((insert.rows, insert.params), (10, "10 x (1)"))
+        self.assertEqual(instrumentation.get_query_stats()["TestInstrumentation.lookup"]["rows"] % 5, 0)
+
+    def test_executemany_shape_reaches_hooks(self):
+        """Test that hooks see the shape of executemany parameters when they are called, failures included."""
+        seen = []
+        hook = lambda rec: seen.append((rec.sql.split()[0], rec.params, rec.error))
+        instrumentation.add_hook(hook)
+        try:
+            with self.pool.connection() as conn:
+                conn.executemany("INSERT INTO t (x) VALUES (?)", ((i,) for i in range(3)))
+            with self.assertRaises(sqlite3.OperationalError):
+                with self.pool.connection() as conn:
+                    conn.executemany("INSERT INTO missing (x) VALUES (?)", [(1,), (2,)])
+        finally:
+            instrumentation.remove_hook(hook)
+        self.assertIn(("INSERT", "3 x (1)", None), seen)
+        self.assertEqual([p for op, p, error in seen if error], ["0 x ?"])
+
+    def test_transaction_statements_are_labelled_by_method(self):
+        """Test that the BEGIN and savepoints of transaction() blocks count for the method that opened them."""
+        from Utils import db_connection
+        with db_connection.use_pool(self.pool):
+            with db_connection.transaction():
+                with db_connection.transaction():
+                    with db_connection._get_conn() as conn:
+                        conn.execute("INSERT INTO t (x) VALUES (1)")
+        labels = {r.sql.split()[0]: r.label for r in self.records}
+        name = "TestInstrumentation.test_transaction_statements_are_labelled_by_method"
+        self.assertEqual((labels["BEGIN"], labels["SAVEPOINT"], labels["RELEASE"]), (name, name, name))
+
+    def test_slow_queries_are_logged(self):
+        """Test that statements above the threshold reach the slow-query log."""
+        instrumentation.set_slow_query_threshold(0)
+        try:
+            with self.assertLogs("todolist.slow_queries", level="WARNING"):
+                self.lookup()
+        finally:
+            instrumentation.set_slow_query_threshold(instrumentation.DEFAULT_SLOW_QUERY_MS)
+        self.assertIn("TestInstrumentation.lookup", instrumentation.report())
+
+class TestTransaction(unittest.TestCase):
+
+    def setUp(self):
+        """Point the process-wide pool at a throwaway database file."""
+        from Utils import db_connection
+        self.db = db_connection
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_connection.configure_pool(os.path.join(self.tmpdir.name, "tx.db"), max_size=2)
+        with db_connection._get_conn() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+
+    def tearDown(self):
+        self.db.close_pool()
+        self.tmpdir.cleanup()
+
+    def count(self):
+        with self.db._get_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+    def test_calls_share_one_connection_and_commit(self):
+        """Test that _get_conn() inside a transaction joins it and commits at the end."""
+        with self.db.transaction() as tx:
+            self.assertTrue(self.db.in_transaction())
+            for i in range(3):
+                with self.db._get_conn() as conn:
+                    self.assertIs(conn, tx)
+                    conn.execute("INSERT INTO t (x) VALUES (?)", (i,))
+        self.assertFalse(self.db.in_transaction())
+        self.assertEqual(self.count(), 3)
+
+    def test_nested_block_rolls_back_alone(self):
+        """Test that an error in a nested block undoes only that block and runs rollback hooks."""
+        calls = []
+        hook = lambda: calls.append(1)
+        self.db.add_rollback_hook(hook)
+        try:
+            with self.db.transaction():
+                with self.db._get_conn() as conn:
+                    conn.execute("INSERT INTO t (x) VALUES (1)")
+                with self.assertRaises(ValueError):
+                    with self.db.transaction():
+                        with self.db._get_conn() as conn:
+                            conn.execute("INSERT INTO t (x) VALUES (2)")
+                        raise ValueError("boom")
+        finally:
+            self.db.remove_rollback_hook(hook)
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(calls, [1])
+
+    def test_outer_error_rolls_back_everything(self):
+        """Test that an error in the outer block discards all of its writes."""
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                with self.db._get_conn() as conn:
+                    conn.execute("INSERT INTO t (x) VALUES (1)")
+                raise ValueError("boom")
+        self.assertEqual(self.count(), 0)
+
+    def test_unit_of_work(self):
+        """Test that a unit commits once, and rollback() undoes a savepoint or the whole unit quietly."""
+        with self.db.UnitOfWork() as uow:
+            self.assertFalse(uow.nested)
+            with self.db._get_conn() as conn:
+                self.assertIs(conn, uow.conn)
+                conn.execute("INSERT INTO t (x) VALUES (1)")
+            with uow.savepoint() as step:
+                self.assertTrue(step.nested)
+                step.conn.execute("INSERT INTO t (x) VALUES (2)")
+                step.rollback()
+        self.assertFalse(uow.active)
+        self.assertEqual(self.count(), 1)
+        with self.db.UnitOfWork() as uow:
+            uow.conn.execute("INSERT INTO t (x) VALUES (3)")
+            uow.rollback()
+        self.assertFalse(self.db.in_transaction())
+        self.assertEqual(self.count(), 1)
+
+class TestInMemory(unittest.TestCase):
+
+    def setUp(self):
+        """Create a database file with one row to load into memory, as the application would (in WAL mode)."""
+        from Utils import db_connection
+        self.db = db_connection
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "mem.db")
+        pool = self.db.ConnectionPool(self.path, max_size=1, profile=self.db.STORAGE_PROFILES["default"])
+        with pool.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t (x) VALUES (1)")
+        pool.close()
+
+    def tearDown(self):
+        self.db.close_pool()
+        self.tmpdir.cleanup()
+
+    def on_disk(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_load_and_snapshot_on_close(self):
+        """Test that the file is loaded into memory and written back only by a snapshot."""
+        pool = self.db.configure_pool(self.path, max_size=2, in_memory=True)
+        self.assertEqual(pool.checkpoint(), None)
+        with self.db._get_conn() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "memory")
+            conn.execute("INSERT INTO t (x) VALUES (2)")
+        self.assertEqual(self.on_disk(), 1)
+        self.db.close_pool()
+        self.assertEqual(self.on_disk(), 2)
+        self.assertFalse(os.path.exists(self.path + ".snapshot"))
+
+    def test_periodic_snapshot(self):
+        """Test that writes are snapshotted to the file every interval."""
+        pool = self.db.configure_pool(self.path, in_memory=True, snapshot_interval=0.05)
+        with self.db._get_conn() as conn:
+            conn.execute("INSERT INTO t (x) VALUES (2)")
+        deadline = time.monotonic() + 5
+        while self.on_disk() != 2 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.on_disk(), 2)
+        self.assertGreaterEqual(pool.stats()["snapshots"], 1)
+
+    def test_memory_location_is_never_saved(self):
+        """Test that `:memory:` starts empty and leaves no file behind."""
+        self.db.configure_pool(self.db.MEMORY, max_size=2)
+        with self.db._get_conn() as conn:
+            conn.execute("CREATE TABLE u (x INTEGER)")
+        self.assertIsNone(self.db.snapshot())
+        self.db.close_pool()
+        self.assertFalse(os.path.exists(self.db.MEMORY))
+
+if __name__ == "__main__":
+    unittest.main()
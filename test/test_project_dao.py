@@ -7,10 +7,14 @@ SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
 import unittest
 from src.DAO.ProjectDAO import ProjectDAO
 from src.Models.Project import Project
 from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import PROJECT_STATS_QUERY, migrate
 
 class TestProjectDAO(unittest.TestCase):
 
@@ -18,6 +22,7 @@ class TestProjectDAO(unittest.TestCase):
     def setUpClass(cls):
         """Set up the test database and seed data."""
         cls.dao = ProjectDAO()
+        cls.dao.cache.clear()
         with _get_conn() as conn:
             conn.execute("DROP TABLE IF EXISTS Project;")
             conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
@@ -49,6 +54,13 @@ class TestProjectDAO(unittest.TestCase):
         updated_project = self.dao.getProjectById(1)
         self.assertEqual(updated_project.title, "Updated Project Title")
 
+    def test_create_projects(self):
+        """Test bulk creating projects, with a duplicate title rejected."""
+        result = self.dao.createProjects([Project(project_id=None, title="Bulk A"), Project(project_id=None, title="Test Project 2"), Project(project_id=None, title="Bulk B")])
+        self.assertEqual(list(result.errors), [1])
+        self.assertEqual(result.affected, 2)
+        self.assertEqual(self.dao.getProjectById(result.ids[2]).title, "Bulk B")
+
     def test_delete_project_by_id(self):
         """Test deleting a project by ID."""
         result = self.dao.deleteProjectById(1)
@@ -56,5 +68,100 @@ class TestProjectDAO(unittest.TestCase):
         deleted_project = self.dao.getProjectById(1)
         self.assertIsNone(deleted_project)
 
+class TestProjectDAOCache(unittest.TestCase):
+
+    def setUp(self):
+        """Recreate the Project table and start from an empty cache."""
+        self.dao = ProjectDAO()
+        self.dao.cache.clear()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
+            conn.execute("INSERT INTO Project (title) VALUES ('Cached');")
+
+    def test_repeated_lookups_hit_cache(self):
+        """Test that repeated lookups by id and title are served from the cache."""
+        before = self.dao.cacheStats()
+        self.assertEqual(self.dao.getProjectByTitle("Cached").project_id, 1)
+        self.assertEqual(self.dao.getProjectByTitle("Cached").project_id, 1)
+        self.assertEqual(self.dao.getProjectById(1).title, "Cached")
+        after = self.dao.cacheStats()
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 2)
+
+    def test_update_invalidates_cache(self):
+        """Test that renaming a project evicts its cached entries."""
+        self.dao.getProjectById(1)
+        self.assertTrue(self.dao.updateProjectTitleById(Project(project_id=1, title="Renamed")))
+        self.assertIsNone(self.dao.getProjectByTitle("Cached"))
+        self.assertEqual(self.dao.getProjectById(1).title, "Renamed")
+
+    def test_delete_invalidates_cache(self):
+        """Test that deleting a project evicts its cached entries."""
+        self.dao.getProjectByTitle("Cached")
+        self.assertTrue(self.dao.deleteProjectByTitle("Cached"))
+        self.assertIsNone(self.dao.getProjectById(1))
+        self.assertIsNone(self.dao.getProjectByTitle("Cached"))
+
+    def test_cached_results_are_copies(self):
+        """Test that mutating a returned project does not affect the cache."""
+        self.dao.getProjectById(1).title = "Mutated"
+        self.assertEqual(self.dao.getProjectById(1).title, "Cached")
+
+class TestProjectStats(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema, including Project_Stats and its triggers, with two projects."""
+        self.dao = ProjectDAO()
+        self.dao.cache.clear()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Home'), ('Work');")
+            conn.executemany(
+                "INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, ?, ?);",
+                [("a", 1, 0, 1), ("b", 1, 1, 1), ("c", 5, 0, 1), ("d", 3, 0, 2)],
+            )
+
+    def tearDown(self):
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM Todo_Item;")
+
+    def assertMatchesTodos(self):
+        with _get_conn() as conn:
+            actual = {r[0]: tuple(r[1:]) for r in conn.execute(PROJECT_STATS_QUERY)}
+        stored = {s.project_id: (s.total, s.completed) + s.by_priority for s in self.dao.getProjectStats()}
+        self.assertEqual(stored, actual)
+
+    def test_counts_follow_inserts_updates_and_deletes(self):
+        """Test that the triggers keep the summary equal to a full recount."""
+        home = self.dao.getProjectStats(1)[0]
+        self.assertEqual((home.title, home.total, home.open, home.completed, home.by_priority), ("Home", 3, 2, 1, (2, 0, 0, 0, 1)))
+        with _get_conn() as conn:
+            conn.execute("UPDATE Todo_Item SET completed = 1, priority = 2 WHERE todo_id = 1;")
+            conn.execute("UPDATE Todo_Item SET project_id = 2 WHERE todo_id = 3;")
+            conn.execute("DELETE FROM Todo_Item WHERE todo_id = 2;")
+        self.assertMatchesTodos()
+        work = self.dao.getProjectStats(2)[0]
+        self.assertEqual((work.total, work.open, work.by_priority), (2, 2, (0, 0, 1, 0, 1)))
+        self.dao.createProject("Empty")
+        self.assertEqual(self.dao.getProjectStats()[-1].to_dict()["total"], 0)
+        self.assertMatchesTodos()
+
+    def test_check_reports_and_repairs_drift(self):
+        """Test that the consistency check finds and rebuilds wrong counts."""
+        self.assertEqual(self.dao.checkProjectStats(), [])
+        with _get_conn() as conn:
+            conn.execute("UPDATE Project_Stats SET total = 10 WHERE project_id = 1;")
+            conn.execute("DELETE FROM Project_Stats WHERE project_id = 2;")
+        diffs = self.dao.checkProjectStats()
+        self.assertEqual([(d["project_id"], d["stored"], d["actual"]) for d in diffs],
+                         [(1, (10, 1, 2, 0, 0, 0, 1), (3, 1, 2, 0, 0, 0, 1)), (2, None, (1, 0, 0, 0, 1, 0, 0))])
+        self.assertEqual(len(self.dao.checkProjectStats(repair=True)), 2)
+        self.assertEqual(self.dao.checkProjectStats(), [])
+        self.assertMatchesTodos()
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
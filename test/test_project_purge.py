@@ -0,0 +1,109 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import time
+import unittest
+from src.Controller.TodoListController import parse_command
+from src.Models.TodoItem import TodoItem
+from src.Service.TodoItemService import TodoItemService
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+
+class TestProjectPurge(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema with a large project of ten todos and a small one of two."""
+        self.service = TodoItemService()
+        self.projects = self.service.project_service
+        self.projects.dao.cache.clear()
+        # anything above three todos counts as large here
+        self.projects.dao.purge_threshold = 3
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+        todos = [TodoItem(None, f"Task {i}", 3, "") for i in range(10)]
+        self.large, _ = self.service.createProjectWithTodos("Archive", todos)
+        self.small, _ = self.service.createProjectWithTodos("Home", todos[:2])
+
+    def tearDown(self):
+        self.projects.stopPurgeWorker()
+        self.projects.purgeDeletedProjects()
+
+    def todo_count(self, project_id):
+        with _get_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM Todo_Item WHERE project_id = ?", (project_id,)).fetchone()[0]
+
+    def test_small_project_is_deleted_at_once(self):
+        """Test that a project under the threshold is deleted with its todos in one go."""
+        self.assertTrue(self.projects.deleteProjectByTitle("Home"))
+        self.assertEqual(self.projects.getPurgeProgress(), [])
+        self.assertEqual(self.todo_count(self.small.project_id), 0)
+
+    def test_large_project_is_hidden_until_purged(self):
+        """Test that a large project disappears from reads at once and its title can be reused."""
+        self.assertTrue(self.projects.deleteProjectByTitle("Archive"))
+        self.assertIsNone(self.projects.getProjectByTitle("Archive"))
+        self.assertIsNone(self.projects.getProjectbById(self.large.project_id))
+        self.assertEqual([p.title for p in self.projects.getAllProjects()], ["Home"])
+        self.assertEqual(len(self.service.getAllTodoItems()), 2)
+        self.assertEqual(self.todo_count(self.large.project_id), 10)
+        [progress] = self.projects.getPurgeProgress()
+        self.assertEqual((progress.title, progress.todos, progress.purged), ("Archive", 10, 0))
+        self.assertFalse(self.projects.deleteProjectByTitle("Archive"))
+        self.assertIsNotNone(self.projects.createProject("Archive"))
+
+    def test_purge_step_removes_chunks(self):
+        """Test that each step removes one chunk and the last one deletes the project row."""
+        self.projects.deleteProjectById(self.large.project_id)
+        steps = []
+        while True:
+            progress = self.projects.dao.purgeStep(4)
+            if progress is None:
+                break
+            steps.append((progress.purged, progress.remaining, progress.done))
+        self.assertEqual(steps, [(4, 6, False), (8, 2, False), (10, 0, True)])
+        self.assertEqual(self.todo_count(self.large.project_id), 0)
+        with _get_conn() as conn:
+            self.assertIsNone(conn.execute("SELECT 1 FROM Project WHERE project_id = ?", (self.large.project_id,)).fetchone())
+        self.assertEqual(self.projects.getPurgeProgress(), [])
+        self.assertIsInstance(self.projects.dao.incrementalVacuum(), int)
+
+    def test_purge_is_logged_once(self):
+        """Test that the change log reports the project delete, not a rename, and the todo deletes."""
+        start = self.service.changesSince(0).cursor
+        project_start = self.projects.changesSince(0).cursor
+        self.projects.deleteProjectById(self.large.project_id)
+        self.assertEqual([(c.op, c.row_id) for c in self.projects.changesSince(project_start).changes],
+                         [("delete", self.large.project_id)])
+        self.assertEqual(self.projects.purgeDeletedProjects(chunk_size=3), 1)
+        self.assertEqual({c.op for c in self.service.changesSince(start).changes}, {"delete"})
+
+    def test_background_worker(self):
+        """Test that the worker purges a deleted project without being asked again."""
+        worker = self.projects.startPurgeWorker(chunk_size=3, pause=0)
+        self.projects.deleteProjectById(self.large.project_id)
+        deadline = time.monotonic() + 5
+        while self.projects.getPurgeProgress() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.projects.getPurgeProgress(), [])
+        self.assertEqual(self.todo_count(self.large.project_id), 0)
+        stats = worker.stats()
+        self.assertEqual((stats["projects"], stats["errors"]), (1, 0))
+        self.assertGreaterEqual(stats["chunks"], 4)
+
+    def test_parse_purge_command(self):
+        self.assertEqual(parse_command("projects purge"), ("projects purge", []))
+
+if __name__ == "__main__":
+    unittest.main()
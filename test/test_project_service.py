@@ -7,6 +7,9 @@ SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
 import unittest
 from src.Service.ProjectService import ProjectService
 from src.Models.Project import Project
@@ -18,6 +21,7 @@ class TestProjectService(unittest.TestCase):
     def setUpClass(cls):
         """Set up the test database and seed data."""
         cls.service = ProjectService()
+        cls.service.dao.cache.clear()
         with _get_conn() as conn:
             conn.execute("DROP TABLE IF EXISTS Project;")
             conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
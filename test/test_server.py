@@ -0,0 +1,203 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import http.client
+import json
+import socket
+import threading
+import unittest
+from src.Server.TodoListServer import ThreadPoolHTTPServer, TodoListApp, start_in_thread
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+from Utils.write_queue import WriteQueue
+
+class TestTodoListServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the full schema and start a server on a free port."""
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+        cls.app = TodoListApp()
+        cls.app.projects.dao.cache.clear()
+        cls.app.projects.startPurgeWorker()
+        cls.server = ThreadPoolHTTPServer(("127.0.0.1", 0), cls.app, workers=4)
+        cls.thread = start_in_thread(cls.server)
+        cls.port = cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+
+    def setUp(self):
+        self.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body) if body is not None else None
+        headers = {"Content-Type": "application/json"} if data else {}
+        self.conn.request(method, path, body=data, headers=headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_project_and_todo_crud_on_one_connection(self):
+        """Test the CRUD routes over a single keep-alive connection."""
+        status, project = self.request("POST", "/projects", {"title": "Server"})
+        self.assertEqual(status, 201)
+        pid = project["project_id"]
+        status, todo = self.request("POST", "/todos", {"project_id": pid, "description": "Serve it", "priority": 2})
+        self.assertEqual((status, todo["title"], todo["completed"]), (201, "Server", "no"))
+        status, todo = self.request("PUT", f"/todos/{todo['todo_id']}", {"completed": True})
+        self.assertEqual((status, todo["completed"]), (200, "yes"))
+        self.assertEqual(self.request("GET", f"/todos/{todo['todo_id']}")[1]["description"], "Serve it")
+        self.assertEqual(self.request("DELETE", f"/todos/{todo['todo_id']}")[0], 200)
+        self.assertEqual(self.request("GET", f"/todos/{todo['todo_id']}")[0], 404)
+        self.assertEqual(self.request("POST", "/projects", {"title": "Server"})[0], 409)
+        self.assertEqual(self.request("DELETE", f"/projects/{pid}")[0], 200)
+
+    def test_bulk_and_paging(self):
+        """Test bulk creation and keyset paging through the list route."""
+        status, project = self.request("POST", "/projects", {"title": "Paged"})
+        items = [{"title": "Paged", "description": f"page {n}", "priority": 1 + n % 5} for n in range(12)]
+        items.append({"title": "Paged", "description": "", "priority": 3})
+        status, result = self.request("POST", "/todos/bulk", {"items": items})
+        self.assertEqual(status, 200)
+        self.assertEqual(list(result["errors"]), ["12"])
+        seen, after = [], ""
+        while True:
+            status, page = self.request("GET", f"/todos?project_id={project['project_id']}&limit=5&after={after}")
+            seen.extend(t["todo_id"] for t in page["items"])
+            if not page["next"]:
+                break
+            after = page["next"]
+        self.assertEqual(sorted(seen), sorted(i for i in result["ids"] if i is not None))
+        status, deleted = self.request("DELETE", "/todos/bulk", {"ids": seen})
+        self.assertEqual(deleted["affected"], 12)
+
+    def test_changes_feed(self):
+        """Test that the change routes report writes after a cursor and reject bad cursors."""
+        status, start = self.request("GET", "/todos/changes?limit=1")
+        self.assertEqual(status, 200)
+        while start["has_more"]:
+            start = self.request("GET", f"/todos/changes?since={start['cursor']}")[1]
+        status, project = self.request("POST", "/projects", {"title": "Synced"})
+        status, todo = self.request("POST", "/todos", {"project_id": project["project_id"], "description": "Sync me"})
+        status, changes = self.request("GET", f"/todos/changes?since={start['cursor']}")
+        self.assertEqual([(c["op"], c["row_id"]) for c in changes["changes"]], [("upsert", todo["todo_id"])])
+        self.assertEqual(changes["changes"][0]["data"]["title"], "Synced")
+        status, changes = self.request("GET", "/projects/changes?since=0")
+        self.assertIn(project["project_id"], [c["row_id"] for c in changes["changes"]])
+        self.assertEqual(self.request("GET", "/todos/changes?since=-1")[0], 400)
+        self.request("DELETE", f"/projects/{project['project_id']}")
+
+    def test_errors_and_metrics(self):
+        """Test error statuses and per-route latency metrics."""
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+        self.assertEqual(self.request("POST", "/todos/1")[0], 405)
+        self.assertEqual(self.request("POST", "/projects", {"name": "x"})[0], 400)
+        self.assertEqual(self.request("GET", "/todos?limit=abc")[0], 400)
+        for path in ("/todos?limit=0", "/todos?limit=-1", "/todos/search?q=x&limit=0", "/todos/next?k=-1",
+                     "/todos/changes?limit=0"):
+            self.assertEqual(self.request("GET", path)[0], 400, path)
+        self.assertEqual(self.request("DELETE", "/todos/bulk", {"ids": [1, "two"]})[0], 400)
+        status, project = self.request("POST", "/projects", {"title": "Typed"})
+        status, todo = self.request("POST", "/todos", {"project_id": project["project_id"], "description": "typed"})
+        for bad in ([1], {"id": 1}, True):
+            self.assertEqual(self.request("POST", "/todos", {"project_id": bad, "description": "x"})[0], 400)
+            self.assertEqual(self.request("PUT", f"/todos/{todo['todo_id']}", {"project_id": bad})[0], 400)
+        self.request("DELETE", f"/projects/{project['project_id']}")
+        for length in ("abc", "-5"):
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+            try:
+                conn.putrequest("POST", "/projects")
+                conn.putheader("Content-Length", length)
+                conn.endheaders()
+                self.assertEqual(conn.getresponse().status, 400, length)
+            finally:
+                conn.close()
+        self.request("GET", "/projects/1")
+        self.request("GET", "/projects/2")
+        status, metrics = self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertGreaterEqual(metrics["routes"]["GET /projects/{id}"]["count"], 2)
+        self.assertIn("checkouts", metrics["pool"])
+        self.assertEqual(metrics["purge"]["errors"], 0)
+        self.assertEqual(self.request("GET", "/projects/purges"), (200, {"items": []}))
+
+    def test_group_commit_writes(self):
+        """Test that single-todo writes go through the write queue when one is given."""
+        app = TodoListApp(self.app.projects, write_queue=WriteQueue(max_delay=0))
+        try:
+            status, project = app.dispatch("POST", "/projects", {}, {"title": "Queued"})
+            self.assertEqual(status, 201)
+            status, todo = app.dispatch("POST", "/todos", {}, {"project_id": project["project_id"],
+                                                               "description": "Queue it", "priority": 1})
+            self.assertEqual(status, 201)
+            self.assertEqual(app.dispatch("DELETE", f"/todos/{todo['todo_id']}", {}, None)[0], 200)
+            self.assertEqual(app.dispatch("GET", "/metrics", {}, None)[1]["write_queue"]["completed"], 2)
+            self.assertEqual(app.dispatch("DELETE", f"/projects/{project['project_id']}", {}, None)[0], 200)
+        finally:
+            app.write_queue.close()
+
+    def test_close_shuts_queued_connections(self):
+        """Test that closing the server closes connections no worker has picked up yet."""
+        server = ThreadPoolHTTPServer(("127.0.0.1", 0), TodoListApp(), workers=1)
+        busy = threading.Event()
+        server._pool.submit(busy.wait)
+        ours, theirs = socket.socketpair()
+        try:
+            server.process_request(ours, ("127.0.0.1", 0))
+            closer = threading.Thread(target=server.server_close)
+            closer.start()
+            theirs.settimeout(5)
+            self.assertEqual(theirs.recv(1), b"")
+            busy.set()
+            closer.join(5)
+            self.assertFalse(closer.is_alive())
+        finally:
+            busy.set()
+            theirs.close()
+
+    def test_concurrent_clients(self):
+        """Test that many clients can be served at once."""
+        errors = []
+
+        def client():
+            conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+            try:
+                for _ in range(10):
+                    conn.request("GET", "/projects")
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status != 200:
+                        errors.append(response.status)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        threads = [threading.Thread(target=client) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import tempfile
+import threading
+import unittest
+from DAO.ShardedProjectDAO import ShardedProjectDAO
+from DAO.ShardedTodoItemDAO import ShardedTodoItemDAO
+from Models.TodoItem import TodoItem
+from Service.ProjectService import ProjectService
+from Service.TodoItemService import TodoItemService
+from Utils.db_connection import UnitOfWork, transaction
+from Utils.sharding import SHARD_ID_SPAN, ShardRouter
+
+class TestSharding(unittest.TestCase):
+
+    def setUp(self):
+        """Open a three-shard layout in a throwaway directory."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.router = ShardRouter(self.tmpdir.name, shard_count=3)
+        ShardedProjectDAO.cache.clear()
+        self.projectService = ProjectService(ShardedProjectDAO(self.router))
+        self.todoItemService = TodoItemService(self.projectService, ShardedTodoItemDAO(self.router))
+
+    def tearDown(self):
+        self.router.close()
+        self.tmpdir.cleanup()
+
+    def add(self, title, priorities):
+        project = self.projectService.createProject(title)
+        todos = [self.todoItemService.createTodoItem(title, f"{title} {i}", p, project.project_id)
+                 for i, p in enumerate(priorities)]
+        return project, todos
+
+    def test_projects_are_spread_over_shards(self):
+        """Test that new projects go to the emptiest shard and todo ids fall in their shard's range."""
+        projects = [self.add(title, [3])[0] for title in ("Home", "Work", "Garden", "Car")]
+        shards = [self.router.shard_for_project(p.project_id) for p in projects]
+        self.assertEqual(shards, [0, 1, 2, 0])
+        self.assertEqual([p.project_id for p in projects], [1, 2, 3, 4])
+        for project, shard in zip(projects, shards):
+            for todo in self.todoItemService.getAllTodoItemsByProjectId(project.project_id):
+                self.assertEqual(self.router.shard_for_todo(todo.todo_id), shard)
+                self.assertEqual(todo.title, project.title)
+        self.assertEqual(self.projectService.getProjectByTitle("Garden"), projects[2])
+        self.assertEqual(self.projectService.getAllProjects(), projects)
+        self.assertEqual([s["projects"] for s in self.router.stats()], [2, 1, 1])
+        with self.assertRaises(Exception):
+            self.projectService.createProject("Work")
+
+    def test_cross_shard_reads_are_merged_in_priority_order(self):
+        """Test that listing, top-k, paging and streaming across shards keep (priority, todo_id) order."""
+        self.add("Home", [5, 1, 3])
+        self.add("Work", [2, 4, 1])
+        self.add("Garden", [3, 3])
+        everything = self.todoItemService.getAllTodoItems()
+        self.assertEqual(len(everything), 8)
+        self.assertEqual(everything, sorted(everything, key=lambda t: (t.priority, t.todo_id)))
+        self.assertEqual(list(self.todoItemService.iterTodoItems(batch_size=1)), everything)
+        self.assertEqual(self.todoItemService.nextTodos(3), everything[:3])
+        page = self.todoItemService.getTodoItemsPage(limit=5)
+        rest = self.todoItemService.getTodoItemsPage(after=(page[-1].priority, page[-1].todo_id), limit=5)
+        self.assertEqual(page + rest, everything)
+        self.assertEqual([r.item.title for r in self.todoItemService.searchTodoItems("work")], ["Work"] * 3)
+
+    def test_writes_are_routed_by_todo_id(self):
+        """Test that single and bulk writes reach the shard each todo lives on."""
+        _, home = self.add("Home", [3, 3])
+        _, work = self.add("Work", [3])
+        ids = [home[0].todo_id, work[0].todo_id, 3 * SHARD_ID_SPAN + 1]
+        self.assertEqual(self.todoItemService.completeTodoItems(ids), 2)
+        self.assertEqual(self.todoItemService.setPriority(ids, 1), 2)
+        done = self.todoItemService.getTodoItemById(work[0].todo_id)
+        self.assertEqual((done.completed, done.priority), (True, 1))
+        self.assertIsNone(self.todoItemService.getTodoItemById(3 * SHARD_ID_SPAN + 1))
+        result = self.todoItemService.deleteTodoItems([home[1].todo_id, work[0].todo_id])
+        self.assertEqual(result.affected, 2)
+        self.assertEqual([t.todo_id for t in self.todoItemService.getAllTodoItems()], [home[0].todo_id])
+        home[0].project_id = work[0].project_id
+        with self.assertRaises(ValueError):
+            self.todoItemService.dao.updateTodoItemById(home[0])
+
+    def test_transaction_spans_shards(self):
+        """Test that one transaction block rolls back its writes on every shard and the directory."""
+        with self.assertRaises(RuntimeError):
+            with transaction():
+                self.add("Home", [1])
+                self.add("Work", [2])
+                self.assertEqual(len(self.todoItemService.getAllTodoItems()), 2)
+                raise RuntimeError("abort")
+        self.assertEqual(self.projectService.getAllProjects(), [])
+        self.assertEqual(self.todoItemService.getAllTodoItems(), [])
+        self.assertIsNone(self.router.shard_for_title("Home"))
+
+    def test_writes_to_different_shards_do_not_wait(self):
+        """Test that two open units writing to different shards run at the same time."""
+        home, _ = self.add("Home", [3])
+        work, _ = self.add("Work", [3])
+        both_open = threading.Barrier(2, timeout=2)
+        errors = []
+
+        def write(project):
+            try:
+                with UnitOfWork():
+                    self.todoItemService.createTodoItem(project.title, "concurrent", 2, project.project_id)
+                    # both units hold their shard's write lock here; a shared
+                    # directory lock would keep the second out until the first commits
+                    both_open.wait()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(p,)) for p in (home, work)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.todoItemService.getAllTodoItems()), 4)
+
+    def test_move_project_between_shards(self):
+        """Test that rebalancing moves a project with its todos and renumbers them into the target range."""
+        project, todos = self.add("Home", [2, 4])
+        self.add("Work", [1])
+        moved = self.router.moveProject(project.project_id, 2)
+        self.assertEqual(sorted(moved), [t.todo_id for t in todos])
+        self.assertEqual(self.router.shard_for_project(project.project_id), 2)
+        after = self.todoItemService.getAllTodoItemsByProjectId(project.project_id)
+        self.assertEqual([t.todo_id for t in after], [moved[t.todo_id] for t in todos])
+        self.assertTrue(all(self.router.shard_for_todo(t.todo_id) == 2 for t in after))
+        self.assertEqual([t.description for t in after], ["Home 0", "Home 1"])
+        self.assertEqual([s["todos"] for s in self.router.stats()], [0, 1, 2])
+        self.assertEqual(self.projectService.getProjectStats(project.project_id)[0].total, 2)
+        self.assertEqual(self.projectService.checkProjectStats(), [])
+        self.assertEqual(self.router.moveProject(project.project_id, 2), {})
+
+    def test_shard_count_only_grows(self):
+        """Test that reopening a directory keeps its shards and can add empty ones."""
+        self.add("Home", [1])
+        self.router.close()
+        self.router = ShardRouter(self.tmpdir.name, shard_count=2)
+        self.assertEqual(self.router.shard_count, 3)
+        self.router.close()
+        self.router = ShardRouter(self.tmpdir.name, shard_count=4)
+        self.assertEqual([s["projects"] for s in self.router.stats()], [1, 0, 0, 0])
+        dao = ShardedProjectDAO(self.router)
+        self.assertEqual(self.router.shard_for_project(dao.createProject("Work").project_id), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,11 +7,16 @@ SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
 import unittest
 from src.DAO.TodoItemDAO import TodoItemDAO
 from src.DAO.ProjectDAO import ProjectDAO
 from src.Models.TodoItem import TodoItem
 from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import LATEST_VERSION, current_version, migrate
+from Utils import instrumentation
 
 class TestTodoItemDAO(unittest.TestCase):
 
@@ -24,7 +29,7 @@ class TestTodoItemDAO(unittest.TestCase):
             conn.execute("DROP TABLE IF EXISTS Todo_Item;")
             conn.execute("DROP TABLE IF EXISTS Project;")
             conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
-            conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT NOT NULL, priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5), completed TEXT NOT NULL CHECK (completed IN ('yes', 'no')), project_id INTEGER NOT NULL, FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE);")
+            conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5), completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)), project_id INTEGER NOT NULL, FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE);")
             conn.execute("INSERT INTO Project (title) VALUES ('Test Project');")
 
     def test_create_todo_item(self):
@@ -61,5 +66,235 @@ class TestTodoItemDAO(unittest.TestCase):
         deleted_todo = self.dao.getTodoItemById(1)
         self.assertIsNone(deleted_todo)
 
+class TestTodoItemDAOBatch(unittest.TestCase):
+
+    def setUp(self):
+        """Recreate empty tables with one project before each test."""
+        self.dao = TodoItemDAO()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
+            conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5), completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)), project_id INTEGER NOT NULL, FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE);")
+            conn.execute("INSERT INTO Project (title) VALUES ('Test Project');")
+
+    def _count(self):
+        with _get_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM Todo_Item").fetchone()[0]
+
+    def _todo(self, n, priority=3):
+        return TodoItem(todo_id=None, title="Test Project", description=f"Bulk {n}", priority=priority, completed=False, project_id=1)
+
+    def test_create_todo_items(self):
+        """Test bulk inserting todo items returns their ids in order."""
+        result = self.dao.createTodoItems((self._todo(n) for n in range(25)), chunk_size=10)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.ids, list(range(1, 26)))
+        self.assertEqual(result.affected, 25)
+        self.assertEqual(self._count(), 25)
+
+    def test_create_todo_items_reports_failed_rows(self):
+        """Test that a rejected row does not abort the rest of the batch."""
+        items = [self._todo(0), self._todo(1, priority=9), self._todo(2)]
+        result = self.dao.createTodoItems(items, chunk_size=2)
+        self.assertEqual(list(result.errors), [1])
+        self.assertIsNone(result.ids[1])
+        self.assertEqual(result.affected, 2)
+        self.assertEqual(self._count(), 2)
+
+    def test_update_and_delete_todo_items(self):
+        """Test bulk updating and deleting todo items."""
+        created = self.dao.createTodoItems([self._todo(n) for n in range(5)])
+        updates = [TodoItem(todo_id=i, title="Test Project", description="Updated", priority=1, completed=True, project_id=1) for i in created.ids]
+        self.assertEqual(self.dao.updateTodoItems(updates).affected, 5)
+        with _get_conn() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM Todo_Item WHERE completed = 1 AND priority = 1").fetchone()[0], 5)
+        result = self.dao.deleteTodoItemsByIds(created.ids[:3] + [999])
+        self.assertEqual(result.affected, 3)
+        self.assertEqual(self._count(), 2)
+
+    def test_partial_updates_by_id_list(self):
+        """Test completing, reprioritising and moving todos by id with IN-list updates."""
+        self.dao.createTodoItems([self._todo(n) for n in range(6)])
+        with _get_conn() as conn:
+            conn.execute("INSERT INTO Project (title) VALUES ('Other');")
+        self.assertEqual(self.dao.completeTodoItems([1, 2, 3, 999], chunk_size=2), 3)
+        self.assertEqual(self.dao.completeTodoItems([2, 3, 4]), 1)
+        self.assertEqual(self.dao.completeTodoItems([1], completed=False), 1)
+        self.assertEqual(self.dao.setPriority(range(1, 7), 3), 0)
+        self.assertEqual(self.dao.setPriority([5, 6, 6], 1), 2)
+        self.assertEqual(self.dao.moveToProject([1, 6], 2), 2)
+        with _get_conn() as conn:
+            rows = conn.execute("SELECT todo_id, completed, priority, project_id FROM Todo_Item ORDER BY todo_id").fetchall()
+        self.assertEqual([tuple(r) for r in rows], [(1, 0, 3, 2), (2, 1, 3, 1), (3, 1, 3, 1), (4, 1, 3, 1), (5, 0, 1, 1), (6, 0, 1, 2)])
+
+    def test_next_todo_items(self):
+        """Test the top-k queue orders open todos by priority, then age."""
+        self.dao.createTodoItems([self._todo(n, priority=5 - n % 5) for n in range(10)])
+        with _get_conn() as conn:
+            conn.execute("INSERT INTO Project (title) VALUES ('Other');")
+            conn.execute("UPDATE Todo_Item SET completed = 1 WHERE todo_id = 5;")
+            conn.execute("UPDATE Todo_Item SET project_id = 2 WHERE todo_id = 10;")
+        self.assertEqual([t.todo_id for t in self.dao.nextTodoItems(3)], [10, 4, 9])
+        self.assertEqual([t.todo_id for t in self.dao.nextTodoItems(3, include_completed=True)], [5, 10, 4])
+        self.assertEqual([t.todo_id for t in self.dao.nextTodoItems(2, project_id=1)], [4, 9])
+        self.assertEqual(self.dao.nextTodoItems(3, project_id=2)[0].title, "Other")
+
+    def test_iter_todo_items(self):
+        """Test streaming todos in (priority, todo_id) order across fetch batches."""
+        self.dao.createTodoItems([self._todo(n, priority=5 - n % 5) for n in range(12)])
+        todos = list(self.dao.iterTodoItems(project_id=1, batch_size=5))
+        self.assertEqual(len(todos), 12)
+        keys = [(t.priority, t.todo_id) for t in todos]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(list(self.dao.iterTodoItems(project_id=2)), [])
+
+    def test_get_todo_items_page(self):
+        """Test keyset pagination visits every todo exactly once."""
+        self.dao.createTodoItems([self._todo(n, priority=1 + n % 3) for n in range(10)])
+        seen = []
+        after = None
+        while True:
+            page = self.dao.getTodoItemsPage(after=after, limit=4)
+            if not page:
+                break
+            seen.extend(t.todo_id for t in page)
+            after = (page[-1].priority, page[-1].todo_id)
+        self.assertEqual(sorted(seen), list(range(1, 11)))
+        self.assertEqual(len(seen), 10)
+        self.assertEqual([t.priority for t in self.dao.getTodoItemsPage(limit=4)], [1, 1, 1, 1])
+
+class TestTodoItemQueryPlans(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Rebuild the schema through the migrations and load enough rows for ANALYZE."""
+        cls.dao = TodoItemDAO()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn, target=1)
+            conn.execute("INSERT INTO Project (title) VALUES ('Plan A');")
+            conn.execute("INSERT INTO Project (title) VALUES ('Plan B');")
+            conn.executemany(
+                "INSERT INTO Todo_Item (description, priority, completed, title, project_id) VALUES (?, ?, ?, ?, ?)",
+                [(f"todo {n}", 1 + n % 5, "yes" if n % 3 == 0 else "no", "Plan A" if n % 2 else "Plan B", 1 + n % 2) for n in range(200)],
+            )
+        with _get_conn() as conn:
+            migrate(conn)
+
+    def test_migration_converts_completed(self):
+        """Test that the migration stored completed as 0/1 and bumped user_version."""
+        with _get_conn() as conn:
+            self.assertEqual(current_version(conn), LATEST_VERSION)
+            values = {r[0] for r in conn.execute("SELECT DISTINCT completed FROM Todo_Item")}
+            self.assertEqual(values, {0, 1})
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM Todo_Item WHERE completed = 1").fetchone()[0], 67)
+        self.assertTrue(self.dao.getTodoItemById(1).completed)
+        self.assertFalse(self.dao.getTodoItemById(2).completed)
+
+    def test_titles_are_joined_from_project(self):
+        """Test that the title column is gone and renames show up on every todo."""
+        with _get_conn() as conn:
+            columns = [r[1] for r in conn.execute("PRAGMA table_info(Todo_Item)")]
+            self.assertNotIn("title", columns)
+            conn.execute("UPDATE Project SET title = 'Plan B renamed' WHERE project_id = 2")
+        try:
+            todos = self.dao.getAllTodoItemsByProjectId(2)
+            self.assertEqual(len(todos), 100)
+            self.assertEqual({t.title for t in todos}, {"Plan B renamed"})
+            self.assertEqual(self.dao.getTodoItemById(1).title, "Plan A")
+        finally:
+            with _get_conn() as conn:
+                conn.execute("UPDATE Project SET title = 'Plan B' WHERE project_id = 2")
+
+    def test_list_queries_need_no_sort(self):
+        """Test that no list query plan builds a temp B-tree to sort."""
+        records = []
+        instrumentation.add_hook(records.append)
+        try:
+            self.dao.getAllTodoItems()
+            self.dao.getAllTodoItemsByProjectId(1)
+            self.dao.getAllTodoItemsByProjectTitle("Plan A")
+            self.dao.getTodoItemsPage(project_id=1, after=(2, 10), limit=5)
+            self.dao.getTodoItemsPage(after=(2, 10), limit=5)
+            list(self.dao.iterTodoItems(project_id=2))
+            for project_id in (None, 1):
+                for include_completed in (False, True):
+                    self.dao.nextTodoItems(5, project_id, include_completed)
+        finally:
+            instrumentation.remove_hook(records.append)
+        selects = [r for r in records if r.sql.startswith("SELECT")]
+        self.assertEqual(len(selects), 10)
+        with _get_conn() as conn:
+            for rec in selects:
+                params = [1] * int(rec.params.strip("()"))
+                plan = " | ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + rec.sql, params))
+                self.assertNotIn("TEMP B-TREE", plan, f"{rec.label}: {plan}")
+
+class TestTodoItemSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the full schema, including the search index and its triggers."""
+        cls.dao = TodoItemDAO()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Garden');")
+            conn.execute("INSERT INTO Project (title) VALUES ('Kitchen');")
+            conn.executemany(
+                "INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, 0, ?)",
+                [
+                    ("Water the tomatoes", 2, 1),
+                    ("Buy tomatoes, tomatoes and more tomatoes", 3, 2),
+                    ("Fix the leaking kitchen tap", 1, 2),
+                    ("Mow the lawn", 4, 1),
+                ],
+            )
+
+    def test_ranked_results_with_snippets(self):
+        """Test that matches are ranked by relevance and highlighted."""
+        results = self.dao.searchTodoItems("tomatoes")
+        self.assertEqual([r.item.todo_id for r in results], [2, 1])
+        self.assertIn("[tomatoes]", results[0].snippet)
+        self.assertEqual(results[0].item.title, "Kitchen")
+        self.assertLessEqual(results[0].score, results[1].score)
+
+    def test_project_filter_prefix_and_title(self):
+        """Test project filtering, prefix terms and matching on the project title."""
+        self.assertEqual([r.item.todo_id for r in self.dao.searchTodoItems("tomatoes", project_id=1)], [1])
+        self.assertEqual([r.item.todo_id for r in self.dao.searchTodoItems("leak*")], [3])
+        self.assertEqual({r.item.todo_id for r in self.dao.searchTodoItems("garden")}, {1, 4})
+        self.assertEqual(self.dao.searchTodoItems("tomatoes lawn"), [])
+
+    def test_user_input_is_not_parsed_as_fts_syntax(self):
+        """Test that FTS5 operators and punctuation in the query do not raise."""
+        for query in ['"unbalanced', "NOT", "tap)", "mow -lawn", "col:value", "*"]:
+            self.dao.searchTodoItems(query)
+        self.assertEqual([r.item.todo_id for r in self.dao.searchTodoItems("Fix the")], [3])
+
+    def test_index_follows_writes(self):
+        """Test that inserts, updates, deletes and project renames reach the index."""
+        created = self.dao.createTodoItem(TodoItem(todo_id=None, title="Garden", description="Prune the roses", priority=3, project_id=1))
+        self.assertEqual([r.item.todo_id for r in self.dao.searchTodoItems("roses")], [created.todo_id])
+        created.description = "Prune the hedges"
+        self.dao.updateTodoItemById(created)
+        self.assertEqual(self.dao.searchTodoItems("roses"), [])
+        self.assertEqual(len(self.dao.searchTodoItems("hedges")), 1)
+        with _get_conn() as conn:
+            conn.execute("UPDATE Project SET title = 'Allotment' WHERE project_id = 1")
+        try:
+            self.assertEqual(self.dao.searchTodoItems("garden"), [])
+            self.assertEqual(len(self.dao.searchTodoItems("allotment")), 3)
+        finally:
+            with _get_conn() as conn:
+                conn.execute("UPDATE Project SET title = 'Garden' WHERE project_id = 1")
+        self.dao.deleteTodoItemById(created.todo_id)
+        self.assertEqual(self.dao.searchTodoItems("hedges"), [])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -7,12 +7,16 @@ SRC = os.path.join(ROOT, "src")
 if SRC not in sys.path:
     sys.path.insert(0, SRC)
 
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
 
 import unittest
 from src.Service.TodoItemService import TodoItemService
 from src.Service.ProjectService import ProjectService
 from src.Models.TodoItem import TodoItem
 from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
 
 class TestTodoItemService(unittest.TestCase):
 
@@ -21,11 +25,12 @@ class TestTodoItemService(unittest.TestCase):
         """Set up the test database and seed data."""
         cls.service = TodoItemService()
         cls.project_service = ProjectService()
+        cls.project_service.dao.cache.clear()
         with _get_conn() as conn:
             conn.execute("DROP TABLE IF EXISTS Todo_Item;")
             conn.execute("DROP TABLE IF EXISTS Project;")
             conn.execute("CREATE TABLE Project (project_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);")
-            conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, description TEXT NOT NULL, priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5), completed TEXT NOT NULL CHECK (completed IN ('yes', 'no')), project_id INTEGER NOT NULL, FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE);")
+            conn.execute("CREATE TABLE Todo_Item (todo_id INTEGER PRIMARY KEY AUTOINCREMENT, description TEXT NOT NULL, priority INTEGER NOT NULL CHECK (priority BETWEEN 1 AND 5), completed INTEGER NOT NULL DEFAULT 0 CHECK (completed IN (0, 1)), project_id INTEGER NOT NULL, FOREIGN KEY (project_id) REFERENCES Project(project_id) ON DELETE CASCADE);")
             conn.execute("INSERT INTO Project (title) VALUES ('Test Project');")
 
     def test_create_todo_item(self):
@@ -54,6 +59,33 @@ class TestTodoItemService(unittest.TestCase):
         updated_todo = self.service.getTodoItemById(1)
         self.assertTrue(updated_todo.completed)
 
+    def test_create_todo_items(self):
+        """Test bulk creation validates every item and resolves project ids."""
+        items = [
+            TodoItem(todo_id=None, title="Test Project", description="Bulk one", priority=2, project_id=None),
+            TodoItem(todo_id=None, title="Test Project", description="  ", priority=2, project_id=None),
+            TodoItem(todo_id=None, title="Missing Project", description="Bulk two", priority=2, project_id=None),
+            TodoItem(todo_id=None, title="Test Project", description="Bulk three", priority=7, project_id=None),
+        ]
+        result = self.service.createTodoItems(items)
+        self.assertEqual(sorted(result.errors), [1, 2, 3])
+        self.assertIsNotNone(result.ids[0])
+        self.assertEqual(result.affected, 1)
+
+    def test_batch_validation_leaves_items_alone(self):
+        """Test that bulk writes do not change the caller's items and reject a project_id contradicting the title."""
+        item = TodoItem(todo_id=None, title=" Test Project ", description=" Kept as given ", priority=2, project_id=None)
+        wrong = TodoItem(todo_id=None, title="Test Project", description="Wrong project", priority=2, project_id=99)
+        result = self.service.createTodoItems([item, wrong])
+        self.assertEqual(list(result.errors), [1])
+        self.assertEqual((item.project_id, item.title, item.description), (None, " Test Project ", " Kept as given "))
+        item.todo_id = result.ids[0]
+        item.description = "  Updated  "
+        update = self.service.updateTodoItems([item])
+        self.assertEqual(update.affected, 1)
+        self.assertEqual((item.project_id, item.description), (None, "  Updated  "))
+        self.assertEqual(self.service.getTodoItemById(result.ids[0]).description, "Updated")
+
     def test_delete_todo_item(self):
         """Test deleting a todo item by ID."""
         result = self.service.deleteTodoItem(1)
@@ -61,5 +93,86 @@ class TestTodoItemService(unittest.TestCase):
         deleted_todo = self.service.getTodoItemById(1)
         self.assertIsNone(deleted_todo)
 
+class TestTodoItemServiceSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build the full schema, including the search index, and seed a few todos."""
+        cls.service = TodoItemService()
+        cls.service.project_service.dao.cache.clear()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Errands');")
+        cls.service.createTodoItem("Errands", "Post the parcel", 2, None)
+        cls.service.createTodoItem("Errands", "Collect the dry cleaning", 3, None)
+
+    def test_search(self):
+        """Test searching todos through the service."""
+        results = self.service.searchTodoItems("  parcel ")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].item.description, "Post the parcel")
+        self.assertEqual(results[0].item.title, "Errands")
+
+    def test_blank_query_returns_nothing(self):
+        """Test that blank queries and non-positive limits return no results."""
+        self.assertEqual(self.service.searchTodoItems("   "), [])
+        self.assertEqual(self.service.searchTodoItems("parcel", limit=0), [])
+
+class TestTodoItemServicePartialUpdates(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema with two projects and three todos."""
+        self.service = TodoItemService()
+        self.service.project_service.dao.cache.clear()
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Home'), ('Work');")
+        for n in range(3):
+            self.service.createTodoItem("Home", f"Chore {n}", 3, None)
+
+    def tearDown(self):
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM Todo_Item;")
+
+    def test_complete_and_set_priority(self):
+        """Test completing and reprioritising several todos at once."""
+        self.assertEqual(self.service.completeTodoItems([1, 3]), 2)
+        self.assertEqual(self.service.setPriority([1, 2], 5), 2)
+        self.assertIsNone(self.service.setPriority([1], 9))
+        todos = {t.todo_id: t for t in self.service.getAllTodoItems()}
+        self.assertEqual([(todos[i].completed, todos[i].priority) for i in (1, 2, 3)], [(True, 5), (False, 5), (True, 3)])
+
+    def test_next_todos(self):
+        """Test the next-up queue skips completed todos unless asked and ignores k < 1."""
+        self.service.setPriority([3], 1)
+        self.service.completeTodoItems([1])
+        self.assertEqual([t.todo_id for t in self.service.nextTodos(5)], [3, 2])
+        self.assertEqual([t.todo_id for t in self.service.nextTodos(5, include_completed=True)], [3, 1, 2])
+        self.assertEqual(self.service.nextTodos(0), [])
+
+    def test_move_to_project(self):
+        """Test moving todos to an existing project and rejecting unknown ones."""
+        work = self.service.project_service.getProjectByTitle("Work")
+        self.assertEqual(self.service.moveToProject([2, 3], work.project_id), 2)
+        self.assertIsNone(self.service.moveToProject([1], 999))
+        self.assertEqual([t.todo_id for t in self.service.getAllTodoItemsByProjectTitle("Work")], [2, 3])
+        self.assertEqual(self.service.searchTodoItems("Work chore")[0].item.title, "Work")
+
+    def test_create_project_with_todos(self):
+        """Test a project and its todos are created together, or not at all."""
+        todo = lambda description, priority=2: TodoItem(None, description, priority, "")
+        project, result = self.service.createProjectWithTodos("Garden", [todo("Mow"), todo("Weed", 1)])
+        self.assertEqual(len(result.ids), 2)
+        self.assertEqual([t.description for t in self.service.getAllTodoItemsByProjectId(project.project_id)], ["Weed", "Mow"])
+        self.assertIsNone(self.service.createProjectWithTodos("Garden", [todo("Rake")]))
+        self.assertIsNone(self.service.createProjectWithTodos("Shed", [todo("Paint"), todo("Fix", 9)]))
+        self.assertIsNone(self.service.project_service.getProjectByTitle("Shed"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
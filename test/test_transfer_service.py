@@ -0,0 +1,143 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import io
+import json
+import tempfile
+import threading
+import unittest
+from src.Service.TransferService import TransferService, format_for_path
+from src.Utils.db_connection import _get_conn
+from src.Utils.migrations import migrate
+from Utils.db_connection import get_pool
+
+class TestTransferService(unittest.TestCase):
+
+    def setUp(self):
+        """Build the full schema with two projects and three todos."""
+        with _get_conn() as conn:
+            conn.execute("DROP TABLE IF EXISTS Todo_Item;")
+            conn.execute("DROP TABLE IF EXISTS Project;")
+            conn.execute("PRAGMA user_version = 0;")
+            migrate(conn)
+            conn.execute("INSERT INTO Project (title) VALUES ('Home'), ('Work');")
+            conn.executemany(
+                "INSERT INTO Todo_Item (description, priority, completed, project_id) VALUES (?, ?, ?, ?);",
+                [("Paint, then dry", 2, 0, 1), ("File report", 1, 1, 2), ("Call \"Bob\"", 3, 0, 2)],
+            )
+        self.service = TransferService()
+        self.service.project_service.dao.cache.clear()
+
+    def tearDown(self):
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM Todo_Item;")
+
+    def count_todos(self):
+        with _get_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM Todo_Item").fetchone()[0]
+
+    def test_csv_round_trip(self):
+        """Test that exported todos import back with the same fields."""
+        out = io.StringIO()
+        result = self.service.exportTodoItems(out, "csv")
+        self.assertEqual(result.rows, 3)
+        with _get_conn() as conn:
+            conn.execute("DELETE FROM Todo_Item;")
+        result = self.service.importTodoItems(io.StringIO(out.getvalue()), "csv")
+        self.assertEqual((result.rows, result.written, result.errors), (3, 3, {}))
+        todos = sorted((t.description, t.priority, t.completed, t.title) for t in self.service.todo_service.getAllTodoItems())
+        self.assertEqual(todos, [("Call \"Bob\"", 3, False, "Work"), ("File report", 1, True, "Work"),
+                                 ("Paint, then dry", 2, False, "Home")])
+
+    def test_jsonl_import_reports_bad_rows_by_line(self):
+        """Test that rejected rows are reported with their line numbers and the rest imported."""
+        lines = [
+            json.dumps({"title": "Home", "description": "ok", "priority": 1}),
+            "not json",
+            json.dumps({"title": "Nowhere", "description": "lost", "priority": 1}),
+            json.dumps({"project_id": 2, "description": "by id", "priority": 9}),
+            json.dumps({"project_id": 2, "description": "by id", "priority": 4, "completed": "yes"}),
+        ]
+        result = self.service.importTodoItems(io.StringIO("\n".join(lines)), "jsonl", chunk_size=2)
+        self.assertEqual(result.written, 2)
+        self.assertEqual(sorted(result.errors), [2, 3, 4])
+        self.assertEqual(result.errors[3], "project not found")
+        self.assertEqual(self.count_todos(), 5)
+
+    def test_import_can_create_missing_projects(self):
+        """Test that create_projects adds projects named by the records."""
+        data = "title,description,priority\nGarden,Plant bulbs,2\nGarden,Rake leaves,3\n"
+        result = self.service.importTodoItems(io.StringIO(data), "csv", create_projects=True)
+        self.assertEqual((result.written, result.errors), (2, {}))
+        garden = self.service.project_service.getProjectByTitle("Garden")
+        self.assertEqual(len(self.service.todo_service.getAllTodoItemsByProjectId(garden.project_id)), 2)
+
+    def test_import_projects_skips_existing_titles(self):
+        """Test that re-importing exported projects only adds new titles."""
+        out = io.StringIO()
+        self.service.exportProjects(out, "jsonl")
+        data = out.getvalue() + json.dumps({"title": "Errands"}) + "\n" + json.dumps({"title": " "}) + "\n"
+        result = self.service.importProjects(io.StringIO(data), "jsonl")
+        self.assertEqual((result.rows, result.written, result.skipped), (4, 1, 2))
+        self.assertEqual(list(result.errors.values()), ["invalid title"])
+
+    def test_export_is_a_snapshot(self):
+        """Test that rows written by another connection during an export are not included."""
+        if get_pool().in_memory:
+            self.skipTest("needs WAL, which in-memory databases do not support")
+        service = self.service
+
+        class Stream(io.StringIO):
+            wrote = False
+
+            def write(self, s):
+                if not self.wrote:
+                    self.wrote = True
+                    # a different thread gets its own pooled connection
+                    t = threading.Thread(target=service.todo_service.createTodoItem, args=("Home", "late", 1, None))
+                    t.start()
+                    t.join()
+                return super().write(s)
+
+        out = Stream()
+        result = self.service.exportTodoItems(out, "jsonl")
+        self.assertEqual(result.rows, 3)
+        self.assertEqual(self.count_todos(), 4)
+
+    def test_format_for_path(self):
+        """Test that the format is picked from the file extension."""
+        self.assertEqual(format_for_path("todos.CSV"), "csv")
+        self.assertEqual(format_for_path("todos.jsonl"), "jsonl")
+        with self.assertRaises(ValueError):
+            format_for_path("todos.txt")
+
+    def test_chunk_size_is_checked_before_importing(self):
+        """Test that a chunk size below 1 is rejected before any row is read or project created."""
+        stream = io.StringIO('{"title": "Brand New", "description": "x", "priority": 1}\n')
+        with self.assertRaises(ValueError):
+            self.service.importTodoItems(stream, "jsonl", chunk_size=0, create_projects=True)
+        self.assertEqual(stream.tell(), 0)
+        self.assertIsNone(self.service.project_service.getProjectByTitle("Brand New"))
+
+    def test_unknown_export_kind_leaves_file_alone(self):
+        """Test that an unknown kind is rejected before the target file is opened."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "todos.csv")
+            with open(path, "w") as f:
+                f.write("keep me")
+            with self.assertRaises(ValueError):
+                self.service.exportToFile("tasks", path)
+            with open(path) as f:
+                self.assertEqual(f.read(), "keep me")
+
+if __name__ == "__main__":
+    unittest.main()
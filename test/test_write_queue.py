@@ -0,0 +1,120 @@
+import sys
+import os
+
+# ensure `src` is on the import path so Controller/Service packages resolve
+ROOT = os.path.dirname(__file__)
+SRC = os.path.join(ROOT, "src")
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+# run against an in-memory database instead of rewriting Databases/TodoList.db
+os.environ.setdefault("TODOLIST_DB", ":memory:")
+
+import tempfile
+import threading
+import unittest
+from Utils import db_connection
+from Utils.write_queue import WriteQueue
+
+def insert(x):
+    with db_connection._get_conn() as conn:
+        return conn.execute("INSERT INTO t (x) VALUES (?)", (x,)).lastrowid
+
+def fail(x):
+    insert(x)
+    raise ValueError("rejected")
+
+class TestWriteQueue(unittest.TestCase):
+
+    def setUp(self):
+        """Point the process-wide pool at a throwaway database file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_connection.configure_pool(os.path.join(self.tmpdir.name, "queue.db"), max_size=2)
+        with db_connection._get_conn() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        self.queue = WriteQueue(max_batch=50, max_delay=0.05)
+
+    def tearDown(self):
+        self.queue.close()
+        db_connection.close_pool()
+        self.tmpdir.cleanup()
+
+    def count(self):
+        with db_connection._get_conn() as conn:
+            return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+    def test_concurrent_writes_share_commits(self):
+        """Test that writes from many threads are committed in groups and each future gets its row id."""
+        futures = []
+        lock = threading.Lock()
+
+        def produce(n):
+            for i in range(25):
+                f = self.queue.submit(insert, n * 100 + i)
+                with lock:
+                    futures.append(f)
+
+        threads = [threading.Thread(target=produce, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(self.queue.flush(5))
+        self.assertEqual(sorted(f.result() for f in futures), list(range(1, 201)))
+        self.assertEqual(self.count(), 200)
+        stats = self.queue.stats()
+        self.assertEqual((stats["depth"], stats["completed"], stats["failed"]), (0, 200, 0))
+        self.assertLess(stats["batches"], 200)
+        self.assertLessEqual(stats["max_batch"], 50)
+        self.assertEqual(stats["commit"]["count"], stats["batches"])
+
+    def test_failed_write_fails_only_its_future(self):
+        """Test that a call that raises is rolled back alone and the rest of its group commits."""
+        first, bad, last = self.queue.submit(insert, 1), self.queue.submit(fail, 2), self.queue.submit(insert, 3)
+        self.assertEqual(last.result(5), 2)
+        self.assertEqual(first.result(), 1)
+        with self.assertRaises(ValueError):
+            bad.result()
+        self.assertEqual(self.count(), 2)
+        self.assertEqual(self.queue.stats()["failed"], 1)
+
+    def test_base_exception_fails_only_its_future(self):
+        """Test that a call raising a BaseException fails its future and the writer keeps running."""
+        def interrupt():
+            raise KeyboardInterrupt
+
+        bad = self.queue.submit(interrupt)
+        with self.assertRaises(KeyboardInterrupt):
+            bad.result(5)
+        self.assertEqual(self.queue.call(insert, 1, timeout=5), 1)
+
+    def test_submit_races_close(self):
+        """Test that every write submitted while the queue closes is either committed or rejected."""
+        futures, rejected = [], []
+
+        def produce():
+            for i in range(200):
+                try:
+                    futures.append(self.queue.submit(insert, i))
+                except RuntimeError:
+                    rejected.append(i)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        self.queue.close()
+        producer.join()
+        self.assertEqual(len(futures) + len(rejected), 200)
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(self.count(), len(futures))
+
+    def test_close_commits_queued_writes(self):
+        """Test that closing drains the queue and then rejects new writes."""
+        futures = [self.queue.submit(insert, i) for i in range(10)]
+        self.queue.close()
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(self.count(), 10)
+        with self.assertRaises(RuntimeError):
+            self.queue.submit(insert, 11)
+
+if __name__ == "__main__":
+    unittest.main()